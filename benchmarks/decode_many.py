@@ -0,0 +1,49 @@
+import argparse
+import time
+
+from saic_ismart_client.frame_decoder import decode_many
+from saic_ismart_client.ota_v3_0.Message import MessageBodyV30, MessageCoderV30, MessageV30
+from saic_ismart_client.ota_v3_0.data_model import OtaChrgMangDataResp
+
+CHRG_MGMT_DATA_RSP_HEX = '100CF30750000000000000000000000000000000000F0F983060C183060C183060C183060C18306' \
+    + '0C183060C183060C183060C183060C1CB060C183060C183972E5CB97361CB972E5CB95AC2C39B0B' \
+    + '5CB073616B972E5CAD72E6C5872E6C39B0E6C5872E5CB96AC5B58B162C3972C1CB9B16183972E5C' \
+    + 'B906C67BC48000009C3C011C03004000000800000000000000070122000203FF0103FF4E2006420' \
+    + '349000000F30000CFCE0026204BF00633D509CC67AFD5C9C400C8400F0002A00000000000000000' \
+    + '9DC0B5400025BC0000'
+
+
+def process_arguments():
+    parser = argparse.ArgumentParser(description='Measure the decoding throughput of archived frames')
+    parser.add_argument('-n', '--frames', help='Number of frames', dest='frames', type=int, default=10000)
+    return parser.parse_args()
+
+
+def decode_one_by_one(frames: list) -> None:
+    message_coder = MessageCoderV30()
+    for frame in frames:
+        message_coder.decode_response(frame, MessageV30(MessageBodyV30(), OtaChrgMangDataResp()))
+
+
+def decode_batch(frames: list) -> None:
+    for result in decode_many(frames):
+        if not result.is_successful():
+            raise result.error
+
+
+def measure(name: str, func, frames: list) -> None:
+    start = time.perf_counter()
+    func(frames)
+    duration = time.perf_counter() - start
+    print(f'{name:<16} {len(frames) / duration:10.0f} frames/s')
+
+
+def main():
+    args = process_arguments()
+    frames = [CHRG_MGMT_DATA_RSP_HEX] * args.frames
+    measure('decode_response', decode_one_by_one, frames)
+    measure('decode_many', decode_batch, frames)
+
+
+if __name__ == '__main__':
+    main()
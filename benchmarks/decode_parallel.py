@@ -0,0 +1,43 @@
+import argparse
+import os
+import time
+
+from saic_ismart_client.frame_decoder import ParallelFrameDecoder, decode_many
+
+CHRG_MGMT_DATA_RSP_HEX = '100CF30750000000000000000000000000000000000F0F983060C183060C183060C183060C18306' \
+    + '0C183060C183060C183060C183060C1CB060C183060C183972E5CB97361CB972E5CB95AC2C39B0B' \
+    + '5CB073616B972E5CAD72E6C5872E6C39B0E6C5872E5CB96AC5B58B162C3972C1CB9B16183972E5C' \
+    + 'B906C67BC48000009C3C011C03004000000800000000000000070122000203FF0103FF4E2006420' \
+    + '349000000F30000CFCE0026204BF00633D509CC67AFD5C9C400C8400F0002A00000000000000000' \
+    + '9DC0B5400025BC0000'
+
+
+def process_arguments():
+    parser = argparse.ArgumentParser(description='Measure the parallel decoding throughput of archived frames')
+    parser.add_argument('-n', '--frames', help='Number of frames', dest='frames', type=int, default=20000)
+    parser.add_argument('-c', '--chunk-size', help='Frames per chunk', dest='chunk_size', type=int, default=256)
+    return parser.parse_args()
+
+
+def measure(name: str, func, frames: list) -> None:
+    start = time.perf_counter()
+    for result in func(frames):
+        if not result.is_successful():
+            raise result.error
+    duration = time.perf_counter() - start
+    print(f'{name:<16} {len(frames) / duration:10.0f} frames/s')
+
+
+def main():
+    args = process_arguments()
+    frames = [CHRG_MGMT_DATA_RSP_HEX] * args.frames
+    measure('sequential', decode_many, frames)
+    for workers in sorted({1, 2, 4, os.cpu_count() or 1}):
+        with ParallelFrameDecoder(workers, args.chunk_size) as parallel_frame_decoder:
+            # start the workers before measuring
+            list(parallel_frame_decoder.decode(frames[:workers]))
+            measure(f'{workers} worker(s)', parallel_frame_decoder.decode, frames)
+
+
+if __name__ == '__main__':
+    main()
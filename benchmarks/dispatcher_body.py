@@ -0,0 +1,49 @@
+import argparse
+import time
+
+from saic_ismart_client.common_model import AbstractMessageCoder
+from saic_ismart_client.ota_v3_0.Message import MessageCoderV30
+
+CHRG_MGMT_DATA_RSP_HEX = '100CF30750000000000000000000000000000000000F0F983060C183060C183060C183060C18306' \
+    + '0C183060C183060C183060C183060C1CB060C183060C183972E5CB97361CB972E5CB95AC2C39B0B' \
+    + '5CB073616B972E5CAD72E6C5872E6C39B0E6C5872E5CB96AC5B58B162C3972C1CB9B16183972E5C' \
+    + 'B906C67BC48000009C3C011C03004000000800000000000000070122000203FF0103FF4E2006420' \
+    + '349000000F30000CFCE0026204BF00633D509CC67AFD5C9C400C8400F0002A00000000000000000' \
+    + '9DC0B5400025BC0000'
+
+
+def process_arguments():
+    parser = argparse.ArgumentParser(description='Compare the dispatcher body codec with asn1tools')
+    parser.add_argument('-n', '--iterations', help='Number of iterations', dest='iterations', type=int,
+                        default=10000)
+    return parser.parse_args()
+
+
+def measure(name: str, func, iterations: int) -> None:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    duration = time.perf_counter() - start
+    print(f'{name:<24} {iterations / duration:10.0f} ops/s')
+
+
+def main():
+    args = process_arguments()
+    message_coder = MessageCoderV30()
+    message_bytes = AbstractMessageCoder.from_hex_frame(CHRG_MGMT_DATA_RSP_HEX)
+    body_offset = message_coder.header_length + message_coder.reserved_size
+    body_bytes = message_bytes[body_offset:body_offset + message_bytes[1] - message_coder.header_length]
+    body = message_coder.asn1_tool_uper.decode('MPDispatcherBody', body_bytes)
+
+    measure('asn1tools decode', lambda: message_coder.asn1_tool_uper.decode('MPDispatcherBody', body_bytes),
+            args.iterations)
+    measure('dispatcher codec decode',
+            lambda: message_coder.dispatcher_body_codec.decode('MPDispatcherBody', body_bytes), args.iterations)
+    measure('asn1tools encode', lambda: message_coder.asn1_tool_uper.encode('MPDispatcherBody', body),
+            args.iterations)
+    measure('dispatcher codec encode', lambda: message_coder.dispatcher_body_codec.encode('MPDispatcherBody', body),
+            args.iterations)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,47 @@
+import argparse
+import time
+
+from saic_ismart_client.ota_v3_0.Message import MessageBodyV30, MessageCoderV30, MessageV30
+from saic_ismart_client.ota_v3_0.data_model import OtaChrgMangDataResp
+from saic_ismart_client.saic_api import SaicApi
+
+CHRG_MGMT_DATA_RSP_HEX = '100CF30750000000000000000000000000000000000F0F983060C183060C183060C183060C18306' \
+    + '0C183060C183060C183060C183060C1CB060C183060C183972E5CB97361CB972E5CB95AC2C39B0B' \
+    + '5CB073616B972E5CAD72E6C5872E6C39B0E6C5872E5CB96AC5B58B162C3972C1CB9B16183972E5C' \
+    + 'B906C67BC48000009C3C011C03004000000800000000000000070122000203FF0103FF4E2006420' \
+    + '349000000F30000CFCE0026204BF00633D509CC67AFD5C9C400C8400F0002A00000000000000000' \
+    + '9DC0B5400025BC0000'
+
+
+def process_arguments():
+    parser = argparse.ArgumentParser(description='Measure the cost of publishing a decoded response as JSON')
+    parser.add_argument('-n', '--iterations', help='Number of iterations', dest='iterations', type=int,
+                        default=10000)
+    return parser.parse_args()
+
+
+def measure(name: str, func, iterations: int) -> None:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    duration = time.perf_counter() - start
+    print(f'{name:<32} {duration / iterations * 1000000:8.2f} us/call')
+
+
+def main():
+    args = process_arguments()
+    saic_api = SaicApi('https://tap-eu.soimt.com', 'https://gateway-eu.soimt.com', 'user', 'secret')
+    chrg_mgmt_data_rsp_msg = MessageV30(MessageBodyV30(), OtaChrgMangDataResp())
+    MessageCoderV30().decode_response(CHRG_MGMT_DATA_RSP_HEX, chrg_mgmt_data_rsp_msg)
+
+    measure('eager payload, no subscriber',
+            lambda: saic_api.publish_json_response('516', 768, chrg_mgmt_data_rsp_msg.get_data()), args.iterations)
+    measure('lazy payload, no subscriber',
+            lambda: saic_api.publish_json_response('516', 768, chrg_mgmt_data_rsp_msg.get_data), args.iterations)
+    saic_api.on_publish_json_value = lambda key, data: None
+    measure('lazy payload, subscriber',
+            lambda: saic_api.publish_json_response('516', 768, chrg_mgmt_data_rsp_msg.get_data), args.iterations)
+
+
+if __name__ == '__main__':
+    main()
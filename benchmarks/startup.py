@@ -0,0 +1,43 @@
+import argparse
+import pathlib
+import tempfile
+import time
+
+from saic_ismart_client.ota_v1_1.Message import MessageCoderV11
+from saic_ismart_client.ota_v2_1.Message import MessageCoderV21
+from saic_ismart_client.ota_v3_0.Message import MessageCoderV30
+from saic_ismart_client.specification_registry import SpecificationDiskCache, SpecificationRegistry
+
+
+def process_arguments():
+    parser = argparse.ArgumentParser(description='Compare cold and warm start of the SAIC message coders')
+    parser.add_argument('-r', '--rounds', help='Number of rounds', dest='rounds', type=int, default=5)
+    return parser.parse_args()
+
+
+def load_all(registry: SpecificationRegistry) -> float:
+    start = time.perf_counter()
+    for coder in [MessageCoderV11(), MessageCoderV21(), MessageCoderV30()]:
+        registry.get_specification(coder.asn_files_dir, coder.asn_files, 'uper')
+    return time.perf_counter() - start
+
+
+def main():
+    args = process_arguments()
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cold = []
+        warm = []
+        for _ in range(args.rounds):
+            for f in pathlib.Path(cache_dir).glob('*.pickle'):
+                f.unlink()
+            cold.append(load_all(SpecificationRegistry(SpecificationDiskCache(cache_dir))))
+            warm.append(load_all(SpecificationRegistry(SpecificationDiskCache(cache_dir))))
+        uncached = [load_all(SpecificationRegistry()) for _ in range(args.rounds)]
+
+    print(f'compile without disk cache: {min(uncached) * 1000:8.1f} ms')
+    print(f'cold start (compile+store): {min(cold) * 1000:8.1f} ms')
+    print(f'warm start (load):          {min(warm) * 1000:8.1f} ms')
+
+
+if __name__ == '__main__':
+    main()
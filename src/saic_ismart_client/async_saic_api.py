@@ -0,0 +1,417 @@
+import asyncio
+import datetime
+import functools
+import time
+import urllib.parse
+from typing import cast
+
+from saic_ismart_client.circuit_breaker import CircuitBreakerRegistry
+from saic_ismart_client.common_model import AbstractMessage, AbstractMessageBody, ChargeCurrentLimitCode, MessageV2, \
+    ScheduledChargingMode, TargetBatteryCode
+from saic_ismart_client.deadline import Deadline, get_current_deadline
+from saic_ismart_client.exceptions import SaicApiException
+from saic_ismart_client.http_session import HttpSessionConfig
+from saic_ismart_client.ota_v1_1.data_model import MessageV11, MpAlarmSettingType, VinInfo
+from saic_ismart_client.ota_v2_1.rvc_command import RvcCommand
+from saic_ismart_client.ota_v3_0.Message import MessageV30
+from saic_ismart_client.rate_limiter import RateLimiter, get_endpoint_family
+from saic_ismart_client.retry_policy import AdaptiveRetryPolicy
+from saic_ismart_client.saic_api import AVG_SMS_DELIVERY_TIME, LOG, TAP_HEADERS, AbstractSaicApi, SaicApiRequest, \
+    convert_message_list, create_alarm_switch
+from saic_ismart_client.single_flight import AsyncSingleFlight
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+
+class AsyncSaicApi(AbstractSaicApi):
+    def __init__(
+            self,
+            saic_uri: str,
+            saic_user: str,
+            saic_password: str,
+            relogin_delay: int = None,
+            http_session_config: HttpSessionConfig = None,
+            retry_policy: AdaptiveRetryPolicy = None,
+            circuit_breakers: CircuitBreakerRegistry = None,
+            rate_limiter: RateLimiter = None
+    ):
+        super().__init__(saic_uri, saic_user, saic_password, relogin_delay, retry_policy, circuit_breakers,
+                         rate_limiter)
+        if http_session_config is None:
+            http_session_config = HttpSessionConfig()
+        self.http_session_config = http_session_config
+        self.__session = None
+        self.__login_lock = asyncio.Lock()
+        self.single_flight = AsyncSingleFlight()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    async def close(self) -> None:
+        if self.__session is not None:
+            await self.__session.close()
+            self.__session = None
+
+    def __get_session(self):
+        if self.__session is None:
+            if aiohttp is None:
+                raise ImportError('AsyncSaicApi requires aiohttp, install saic_ismart_client[async]')
+            # aiohttp always waits for a free connection once the limits are reached
+            config = self.http_session_config
+            connector = aiohttp.TCPConnector(limit=config.pool_connections * config.pool_maxsize,
+                                             limit_per_host=config.pool_maxsize, force_close=not config.keep_alive)
+            timeout = aiohttp.ClientTimeout(connect=config.connect_timeout, sock_read=config.read_timeout)
+            # like requests, keep the cookies of servers addressed by their IP address
+            self.__session = aiohttp.ClientSession(connector=connector, timeout=timeout, headers=TAP_HEADERS,
+                                                   cookie_jar=aiohttp.CookieJar(unsafe=True))
+        return self.__session
+
+    async def send_request(self, hex_message: str, endpoint) -> str:
+        session = self.__get_session()
+        kwargs = {}
+        deadline = get_current_deadline()
+        if deadline is not None:
+            deadline.check()
+            config = self.http_session_config
+            kwargs['timeout'] = aiohttp.ClientTimeout(total=deadline.remaining(),
+                                                      connect=deadline.get_timeout(config.connect_timeout),
+                                                      sock_read=deadline.get_timeout(config.read_timeout))
+        try:
+            async with session.post(endpoint, data=hex_message, **kwargs) as response:
+                return (await response.read()).decode()
+        except asyncio.TimeoutError as et:
+            if deadline is not None:
+                deadline.check()
+            raise SaicApiException(f'Timeout error: {et}')
+        except aiohttp.ClientConnectionError as ece:
+            raise SaicApiException(f'Connection error: {ece}')
+        except aiohttp.ClientResponseError as ehttp:
+            raise SaicApiException(f'HTTP error. HTTP status: {ehttp.status}, {ehttp}')
+        except aiohttp.ClientError as e:
+            raise SaicApiException(f'{e}')
+
+    async def send_api_request(self, api_request: SaicApiRequest) -> AbstractMessage:
+        await self.wait(self.get_rate_limit_delay(get_endpoint_family(api_request.endpoint), api_request.vin))
+        circuit_breaker = self.acquire_circuit_breaker(api_request)
+        try:
+            self.publish_raw_request(api_request.application_id, api_request.application_data_protocol_version,
+                                     api_request.request_hex)
+            response_hex = await self.send_request(api_request.request_hex,
+                                                   urllib.parse.urljoin(self.saic_uri, api_request.endpoint))
+            response_message = self.handle_api_response(api_request, response_hex)
+        except BaseException as e:
+            self.record_circuit_breaker_result(circuit_breaker, None, e)
+            raise
+        self.record_circuit_breaker_result(circuit_breaker, response_message)
+        return response_message
+
+    async def login(self) -> MessageV11:
+        login_response_message = cast(MessageV11, await self.send_api_request(self.create_login_request()))
+        self.handle_login_response(login_response_message)
+        return login_response_message
+
+    async def get_token(self) -> str:
+        if self.is_token_expired():
+            # vehicles polled concurrently share a single new login
+            async with self.__login_lock:
+                if self.is_token_expired():
+                    await self.login()
+        return self.token
+
+    async def set_geofence_alarm_switch(self) -> None:
+        return await self.set_alarm_switches(
+            [create_alarm_switch(MpAlarmSettingType.REGION)],
+            pin='22222222222222222222222222222222'
+        )
+
+    async def set_alarm_switches(self, alarm_switches: list, pin: str = None) -> None:
+        alarm_switch_response_message = await self.send_api_request(
+            self.create_alarm_switch_request(await self.get_token(), alarm_switches, pin))
+
+        if alarm_switch_response_message.body.error_message is not None:
+            raise SaicApiException(alarm_switch_response_message.body.error_message,
+                                   alarm_switch_response_message.body.result)
+
+    async def get_vehicle_status(self, vin_info: VinInfo, event_id: str = None) -> MessageV2:
+        return cast(MessageV2, await self.send_api_request(
+            self.create_vehicle_status_request(await self.get_token(), vin_info, event_id)))
+
+    async def get_vehicle_status_with_retry(self, vin_info: VinInfo, deadline: Deadline = None) -> MessageV2:
+        # concurrent callers for the same vehicle share one request and its retries
+        return await self.single_flight.do((vin_info.vin, '511', 25857),
+                                           lambda: self.handle_retry(self.get_vehicle_status, vin_info,
+                                                                     deadline=deadline),
+                                           deadline)
+
+    async def unknown_engine_control(self, vin_info: VinInfo) -> MessageV2:
+        return await self.send_rvc_command_with_retry(vin_info, self.rvc_command_catalog.unknown_engine_control())
+
+    async def lock_vehicle(self, vin_info: VinInfo) -> MessageV2:
+        return await self.send_rvc_command_with_retry(vin_info, self.rvc_command_catalog.lock_vehicle())
+
+    async def unlock_vehicle(self, vin_info: VinInfo) -> MessageV2:
+        return await self.send_rvc_command_with_retry(vin_info, self.rvc_command_catalog.unlock_vehicle())
+
+    async def start_rear_window_heat(self, vin_info: VinInfo) -> MessageV2:
+        return await self.send_rvc_command_with_retry(vin_info,
+                                                      self.rvc_command_catalog.control_rear_window_heat(True))
+
+    async def stop_rear_window_heat(self, vin_info: VinInfo) -> MessageV2:
+        return await self.send_rvc_command_with_retry(vin_info,
+                                                      self.rvc_command_catalog.control_rear_window_heat(False))
+
+    async def control_heated_seats(self, vin_info: VinInfo, driver_side=True, passenger_side=True) -> MessageV2:
+        return await self.send_rvc_command_with_retry(vin_info,
+                                                      self.rvc_command_catalog.control_heated_seats(driver_side,
+                                                                                                    passenger_side))
+
+    async def start_ac(self, vin_info: VinInfo, temperature_idx=8) -> MessageV2:
+        return await self.control_climate(vin_info, fan_speed=2, ac_on=None, temperature_idx=temperature_idx)
+
+    async def stop_ac(self, vin_info: VinInfo) -> MessageV2:
+        return await self.control_climate(vin_info, fan_speed=0, ac_on=False, temperature_idx=0)
+
+    async def start_ac_blowing(self, vin_info: VinInfo) -> MessageV2:
+        return await self.control_climate(vin_info, fan_speed=1, ac_on=False, temperature_idx=0)
+
+    async def start_front_defrost(self, vin_info: VinInfo) -> MessageV2:
+        return await self.control_climate(vin_info, fan_speed=5, ac_on=True, temperature_idx=8)
+
+    async def stop_front_defrost(self, vin_info: VinInfo) -> MessageV2:
+        return await self.send_rvc_command_with_retry(vin_info, self.rvc_command_catalog.stop_front_defrost())
+
+    async def control_climate(
+            self,
+            vin_info: VinInfo,
+            fan_speed: int = 5,
+            ac_on: bool | None = True,
+            temperature_idx: int = 8
+    ) -> MessageV2:
+        return await self.send_rvc_command_with_retry(vin_info,
+                                                      self.rvc_command_catalog.control_climate(fan_speed, ac_on,
+                                                                                               temperature_idx))
+
+    async def close_driver_window(self, vin_info: VinInfo) -> MessageV2:
+        return await self.send_rvc_command_with_retry(vin_info, self.rvc_command_catalog.close_driver_window())
+
+    async def control_sunroof(self, should_open: bool, vin_info: VinInfo) -> MessageV2:
+        return await self.send_rvc_command_with_retry(vin_info,
+                                                      self.rvc_command_catalog.control_sunroof(should_open))
+
+    async def open_door_locks(self, vin_info: VinInfo) -> MessageV2:
+        return await self.send_rvc_command_with_retry(vin_info, self.rvc_command_catalog.open_vehicle_lock(3))
+
+    async def open_tailgate(self, vin_info: VinInfo) -> MessageV2:
+        return await self.send_rvc_command_with_retry(vin_info, self.rvc_command_catalog.open_vehicle_lock(2))
+
+    async def find_my_car(self, vin_info: VinInfo, with_horn: bool = True, with_lights: bool = True) -> MessageV2:
+        return await self.send_rvc_command_with_retry(vin_info,
+                                                      self.rvc_command_catalog.find_my_car(with_horn, with_lights))
+
+    async def send_vehicle_ctrl_cmd_with_retry(self, vin_info: VinInfo, rvc_req_type: bytes, rvc_params: list,
+                                               has_app_data: bool, max_retries=3,
+                                               deadline: Deadline = None) -> MessageV2:
+        rvc_command = self.create_rvc_command(rvc_req_type, rvc_params, has_app_data)
+        return await self.send_rvc_command_with_retry(vin_info, rvc_command, max_retries, deadline)
+
+    async def send_rvc_command_with_retry(self, vin_info: VinInfo, rvc_command: RvcCommand,
+                                          max_retries=3, deadline: Deadline = None) -> MessageV2:
+        return await self.handle_retry(
+            functools.partial(self.__send_vehicle_control_command, rvc_command),
+            vin_info=vin_info,
+            has_app_data=rvc_command.has_app_data,
+            max_retries=max_retries,
+            deadline=deadline
+        )
+
+    async def __send_vehicle_control_command(self, rvc_command: RvcCommand, vin_info: VinInfo,
+                                             event_id: str = None) -> MessageV2:
+        return cast(MessageV2, await self.send_api_request(
+            self.create_vehicle_control_request(await self.get_token(), rvc_command, vin_info, event_id)))
+
+    # CHARGING MANAGEMENT
+
+    async def get_charging_status(self, vin_info: VinInfo, event_id: str = None) -> MessageV30:
+        return cast(MessageV30, await self.send_api_request(
+            self.create_charging_status_request(await self.get_token(), vin_info, event_id)))
+
+    async def get_charging_status_with_retry(self, vin_info: VinInfo, deadline: Deadline = None) -> MessageV30:
+        return await self.single_flight.do((vin_info.vin, '516', 768),
+                                           lambda: self.handle_retry(self.get_charging_status, vin_info,
+                                                                     deadline=deadline),
+                                           deadline)
+
+    async def control_battery_heating(self, enable: bool, vin_info: VinInfo, event_id: str = None) -> MessageV30:
+        return cast(MessageV30, await self.send_api_request(
+            self.create_battery_heating_request(await self.get_token(), enable, vin_info, event_id)))
+
+    async def control_charging_port_lock(self, unlock: bool, vin_info: VinInfo, event_id: str = None) -> MessageV30:
+        return cast(MessageV30, await self.send_api_request(
+            self.create_charging_port_lock_request(await self.get_token(), unlock, vin_info, event_id)))
+
+    async def control_charging(self, stop_charging: bool, vin_info: VinInfo, event_id: str = None) -> MessageV30:
+        return cast(MessageV30, await self.send_api_request(
+            self.create_charging_control_request(await self.get_token(), stop_charging, vin_info, event_id)))
+
+    async def start_charging(self, vin_info: VinInfo, event_id: str = None) -> MessageV30:
+        return await self.control_charging(False, vin_info, event_id)
+
+    async def start_charging_with_retry(self, vin_info: VinInfo, deadline: Deadline = None) -> MessageV30:
+        return await self.handle_retry(self.start_charging, vin_info, deadline=deadline)
+
+    async def set_target_battery_soc(
+            self,
+            target_soc: TargetBatteryCode,
+            vin_info: VinInfo,
+            charge_current_limit: ChargeCurrentLimitCode = ChargeCurrentLimitCode.C_IGNORE,
+            event_id: str = None
+    ) -> MessageV30:
+        return cast(MessageV30, await self.send_api_request(
+            self.create_target_battery_soc_request(await self.get_token(), target_soc, vin_info,
+                                                   charge_current_limit, event_id)))
+
+    async def set_schedule_charging(self, start_time: datetime.time, end_time: datetime.time,
+                                    mode: ScheduledChargingMode, vin_info: VinInfo,
+                                    event_id: str = None) -> MessageV30:
+        return cast(MessageV30, await self.send_api_request(
+            self.create_schedule_charging_request(await self.get_token(), start_time, end_time, mode, vin_info,
+                                                  event_id)))
+
+    # Messages
+
+    async def get_message_list(self, event_id: str = None) -> MessageV11:
+        return await self.get_alarm_list(1, 5, event_id)
+
+    async def get_alarm_list(self, start: int, end: int, event_id: str = None) -> MessageV11:
+        return await self.__get_message_list_of_group(start, end, 'ALARM', event_id)
+
+    async def get_command_list(self, start: int, end: int, event_id: str = None) -> MessageV11:
+        return await self.__get_message_list_of_group(start, end, 'COMMAND', event_id)
+
+    async def get_news_list(self, start: int, end: int, event_id: str = None) -> MessageV11:
+        return await self.__get_message_list_of_group(start, end, 'NEWS', event_id)
+
+    async def __get_message_list_of_group(self, start: int, end: int, message_group: str,
+                                          event_id: str = None) -> MessageV11:
+        return cast(MessageV11, await self.send_api_request(
+            self.create_message_list_request(await self.get_token(), start, end, message_group, event_id)))
+
+    async def get_message_list_with_retry(self, deadline: Deadline = None) -> list:
+        message_list_rsp_msg = await self.handle_retry(self.get_message_list, deadline=deadline)
+        return convert_message_list(message_list_rsp_msg)
+
+    async def delete_all_alarms(self, event_id: str = None) -> None:
+        await self.__change_message_status(None, 'DELETE_ALARM', event_id)
+
+    async def delete_all_commands(self, event_id: str = None) -> None:
+        await self.__change_message_status(None, 'DELETE_COMMAND', event_id)
+
+    async def delete_all_news(self, event_id: str = None) -> None:
+        await self.__change_message_status(None, 'DELETE_NEWS', event_id)
+
+    async def read_message(self, message_id: int, event_id: str = None) -> None:
+        await self.__change_message_status(message_id, 'READ', event_id)
+
+    async def delete_message(self, message_id: int, event_id: str = None) -> None:
+        await self.__change_message_status(message_id, 'DELETE', event_id)
+
+    async def __change_message_status(self, message_id: int | None, action_type: str, event_id: str = None) -> None:
+        message_delete_rsp_msg = await self.send_api_request(
+            self.create_message_status_request(await self.get_token(), message_id, action_type, event_id))
+        if message_delete_rsp_msg.body.error_message is not None:
+            raise SaicApiException(message_delete_rsp_msg.body.error_message,
+                                   message_delete_rsp_msg.body.result)
+
+    async def handle_retry(self, func, vin_info: VinInfo = None, has_app_data: bool = True, max_retries: int = 3,
+                           deadline: Deadline = None):
+        if deadline is not None:
+            with deadline:
+                return await self.handle_retry(func, vin_info, has_app_data, max_retries)
+        if has_app_data:
+            return await self.__handle_retry_with_app_data(func, vin_info=vin_info, max_retries=max_retries)
+        else:
+            return await self.__handle_retry_without_app_data(func, vin_info=vin_info, max_retries=max_retries)
+
+    async def __handle_retry_without_app_data(self, func, vin_info: VinInfo, max_retries: int):
+        if vin_info:
+            rsp_msg = cast(AbstractMessage, await func(vin_info))
+        else:
+            rsp_msg = cast(AbstractMessage, await func())
+
+        retry = 1
+        while (
+                rsp_msg.body.error_message is not None
+                and retry <= max_retries
+        ):
+            await self.handle_error(rsp_msg.body, retry)
+
+            if vin_info:
+                rsp_msg = await func(vin_info, rsp_msg.body.event_id)
+            else:
+                rsp_msg = await func(rsp_msg.body.event_id)
+
+            retry += 1
+        if rsp_msg.body.error_message is not None:
+            raise SaicApiException(rsp_msg.body.error_message,
+                                   rsp_msg.body.result)
+        return rsp_msg
+
+    async def __handle_retry_with_app_data(self, func, vin_info: VinInfo, max_retries: int):
+        start = time.monotonic()
+        if vin_info:
+            rsp_msg = cast(AbstractMessage, await func(vin_info))
+        else:
+            rsp_msg = cast(AbstractMessage, await func())
+        iteration = 1
+        while not rsp_msg.has_application_data():
+            error_message = rsp_msg.body.error_message
+            if iteration > max_retries:
+                additional_info = '.'
+                if error_message is not None:
+                    additional_info = f', error message: {error_message}'
+                raise SaicApiException(f'API request failed after {iteration} retries{additional_info}')
+            elif error_message is not None:
+                await self.handle_error(rsp_msg.body, iteration, time.monotonic() - start)
+            else:
+                LOG.debug('API request returned no application data and no error message.')
+                await self.sleep(self.get_retry_delay(rsp_msg.body, time.monotonic() - start,
+                                                      float(AVG_SMS_DELIVERY_TIME)))
+
+            iteration += 1
+
+            if vin_info:
+                rsp_msg = await func(vin_info, rsp_msg.body.event_id)
+            else:
+                rsp_msg = await func(rsp_msg.body.event_id)
+        if iteration > 1:
+            self.record_app_data_latency(rsp_msg.body, time.monotonic() - start)
+        return rsp_msg
+
+    async def handle_error(self, message_body: AbstractMessageBody, iteration: int, elapsed: float = None) -> None:
+        waiting_time, relogin = self.get_error_handling(message_body, iteration, elapsed)
+        if waiting_time > 0:
+            await self.sleep(waiting_time)
+        if relogin:
+            await self.login()
+
+    async def sleep(self, waiting_time: float) -> None:
+        deadline = get_current_deadline()
+        if deadline is None:
+            await asyncio.sleep(waiting_time)
+        else:
+            await deadline.async_sleep(waiting_time)
+
+    async def wait(self, waiting_time: float) -> None:
+        if waiting_time <= 0:
+            return
+        deadline = get_current_deadline()
+        if deadline is None:
+            await asyncio.sleep(waiting_time)
+        else:
+            await deadline.async_wait(waiting_time)
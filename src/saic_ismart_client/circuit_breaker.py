@@ -0,0 +1,155 @@
+import logging
+import os
+import threading
+import time
+from collections import deque
+from enum import Enum
+from typing import Callable
+
+from saic_ismart_client.exceptions import SaicApiCircuitOpen
+
+logging.basicConfig(format='%(asctime)s %(message)s')
+LOG = logging.getLogger(__name__)
+LOG.setLevel(level=os.getenv('LOG_LEVEL', 'INFO').upper())
+
+
+class CircuitState(Enum):
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+
+class CircuitBreaker:
+    def __init__(
+            self,
+            name: str = '',
+            failure_rate_threshold: float = 0.5,
+            minimum_calls: int = 5,
+            window_size: int = 20,
+            open_duration: float = 60.0,
+            half_open_calls: int = 1,
+            clock: Callable[[], float] = time.monotonic
+    ):
+        if not 0 < failure_rate_threshold <= 1:
+            raise ValueError('failure_rate_threshold must be in (0, 1]')
+        if minimum_calls < 1 or window_size < minimum_calls:
+            raise ValueError('minimum_calls must be at least 1 and not larger than window_size')
+        if half_open_calls < 1:
+            raise ValueError('half_open_calls must be at least 1')
+        self.name = name
+        self.failure_rate_threshold = failure_rate_threshold
+        self.minimum_calls = minimum_calls
+        self.open_duration = open_duration
+        self.half_open_calls = half_open_calls
+        self.clock = clock
+        self.__lock = threading.Lock()
+        # True for successful calls
+        self.__outcomes = deque(maxlen=window_size)
+        self.__state = CircuitState.CLOSED
+        self.__opened_at = 0.0
+        self.__probes = 0
+
+    @property
+    def state(self) -> CircuitState:
+        with self.__lock:
+            return self.__get_state()
+
+    def failure_rate(self) -> float:
+        with self.__lock:
+            return self.__get_failure_rate()
+
+    def acquire(self) -> None:
+        with self.__lock:
+            state = self.__get_state()
+            if state == CircuitState.OPEN:
+                retry_after = self.__opened_at + self.open_duration - self.clock()
+                raise SaicApiCircuitOpen(f'Circuit {self.name} is open, retry in {retry_after:.0f} seconds',
+                                         retry_after)
+            if state == CircuitState.HALF_OPEN:
+                if self.__probes >= self.half_open_calls:
+                    raise SaicApiCircuitOpen(f'Circuit {self.name} is half open and waits for its probes', 0.0)
+                self.__probes += 1
+
+    def release(self) -> None:
+        # the call ended without a result, e.g. it was cancelled or ran out of time
+        with self.__lock:
+            if self.__state == CircuitState.HALF_OPEN and self.__probes > 0:
+                self.__probes -= 1
+
+    def record_success(self) -> None:
+        with self.__lock:
+            if self.__state == CircuitState.HALF_OPEN:
+                self.__set_state(CircuitState.CLOSED)
+                self.__outcomes.clear()
+            else:
+                self.__outcomes.append(True)
+
+    def record_failure(self) -> None:
+        with self.__lock:
+            if self.__state == CircuitState.HALF_OPEN:
+                self.__open()
+                return
+            self.__outcomes.append(False)
+            if (
+                    self.__state == CircuitState.CLOSED
+                    and len(self.__outcomes) >= self.minimum_calls
+                    and self.__get_failure_rate() >= self.failure_rate_threshold
+            ):
+                self.__open()
+
+    def __get_state(self) -> CircuitState:
+        if self.__state == CircuitState.OPEN and self.clock() >= self.__opened_at + self.open_duration:
+            self.__set_state(CircuitState.HALF_OPEN)
+            self.__probes = 0
+        return self.__state
+
+    def __get_failure_rate(self) -> float:
+        if not self.__outcomes:
+            return 0.0
+        return self.__outcomes.count(False) / len(self.__outcomes)
+
+    def __open(self) -> None:
+        self.__opened_at = self.clock()
+        self.__outcomes.clear()
+        self.__set_state(CircuitState.OPEN)
+
+    def __set_state(self, state: CircuitState) -> None:
+        if state != self.__state:
+            LOG.warning(f'Circuit {self.name} changed from {self.__state.value} to {state.value}')
+            self.__state = state
+
+
+class CircuitBreakerRegistry:
+    # one circuit breaker per account and endpoint, share the registry between SaicApi instances
+    def __init__(
+            self,
+            failure_rate_threshold: float = 0.5,
+            minimum_calls: int = 5,
+            window_size: int = 20,
+            open_duration: float = 60.0,
+            half_open_calls: int = 1,
+            clock: Callable[[], float] = time.monotonic
+    ):
+        self.failure_rate_threshold = failure_rate_threshold
+        self.minimum_calls = minimum_calls
+        self.window_size = window_size
+        self.open_duration = open_duration
+        self.half_open_calls = half_open_calls
+        self.clock = clock
+        self.__lock = threading.Lock()
+        self.__circuit_breakers = {}
+
+    def get(self, account: str, endpoint: str) -> CircuitBreaker:
+        with self.__lock:
+            circuit_breaker = self.__circuit_breakers.get((account, endpoint))
+            if circuit_breaker is None:
+                circuit_breaker = CircuitBreaker(f'{account} {endpoint}', self.failure_rate_threshold,
+                                                 self.minimum_calls, self.window_size, self.open_duration,
+                                                 self.half_open_calls, self.clock)
+                self.__circuit_breakers[(account, endpoint)] = circuit_breaker
+            return circuit_breaker
+
+    def get_states(self) -> dict[tuple[str, str], CircuitState]:
+        with self.__lock:
+            circuit_breakers = dict(self.__circuit_breakers)
+        return {key: circuit_breaker.state for key, circuit_breaker in circuit_breakers.items()}
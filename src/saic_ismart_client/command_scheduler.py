@@ -0,0 +1,177 @@
+import asyncio
+import heapq
+import itertools
+import threading
+import time
+from concurrent.futures import Future, InvalidStateError, ThreadPoolExecutor
+from typing import Callable
+
+from saic_ismart_client.common_model import AbstractMessage
+from saic_ismart_client.exceptions import SaicApiException
+from saic_ismart_client.ota_v1_1.data_model import VinInfo
+
+
+class PendingResult:
+    # the result of a submitted request, the follow-up requests with its event ID are sent by the scheduler
+    def __init__(self, saic_api, scheduler, func: Callable, vin_info: VinInfo | None, has_app_data: bool,
+                 max_retries: int):
+        self.saic_api = saic_api
+        self.scheduler = scheduler
+        self.func = func
+        self.vin_info = vin_info
+        self.has_app_data = has_app_data
+        self.max_retries = max_retries
+        self.event_id = None
+        self.iteration = 1
+        self.start = time.monotonic()
+        self.future = Future()
+        self.__relogin = False
+        self.__rejected_token = None
+
+    def __await__(self):
+        return asyncio.wrap_future(self.future).__await__()
+
+    def done(self) -> bool:
+        return self.future.done()
+
+    def result(self, timeout: float = None) -> AbstractMessage:
+        return self.future.result(timeout)
+
+    def exception(self, timeout: float = None) -> BaseException | None:
+        return self.future.exception(timeout)
+
+    def add_done_callback(self, callback: Callable[['PendingResult'], None]) -> None:
+        self.future.add_done_callback(lambda _: callback(self))
+
+    def cancel(self) -> bool:
+        return self.future.cancel()
+
+    def poll(self) -> None:
+        if self.future.done():
+            return
+        try:
+            if self.__relogin:
+                self.__relogin = False
+                self.saic_api.relogin_if_needed(self.__rejected_token)
+            if self.vin_info:
+                rsp_msg = self.func(self.vin_info, self.event_id)
+            else:
+                rsp_msg = self.func(self.event_id)
+            self.handle_response(rsp_msg)
+        except Exception as e:
+            self.__set_exception(e)
+
+    def handle_response(self, rsp_msg: AbstractMessage) -> None:
+        self.event_id = rsp_msg.body.event_id
+        error_message = rsp_msg.body.error_message
+        if self.has_app_data and rsp_msg.has_application_data():
+            if self.iteration > 1:
+                self.saic_api.record_app_data_latency(rsp_msg.body, time.monotonic() - self.start)
+            self.__set_result(rsp_msg)
+            return
+        if not self.has_app_data and error_message is None:
+            self.__set_result(rsp_msg)
+            return
+        if self.iteration > self.max_retries:
+            if self.has_app_data:
+                additional_info = '.'
+                if error_message is not None:
+                    additional_info = f', error message: {error_message}'
+                raise SaicApiException(f'API request failed after {self.iteration} retries{additional_info}')
+            raise SaicApiException(error_message, rsp_msg.body.result)
+
+        elapsed = time.monotonic() - self.start
+        if error_message is not None:
+            waiting_time, self.__relogin = self.saic_api.get_error_handling(rsp_msg.body, self.iteration, elapsed)
+            self.__rejected_token = self.saic_api.token
+        else:
+            waiting_time = self.saic_api.get_retry_delay(rsp_msg.body, elapsed)
+        self.iteration += 1
+        self.scheduler.schedule(self, waiting_time)
+
+    def __set_result(self, rsp_msg: AbstractMessage) -> None:
+        try:
+            self.future.set_result(rsp_msg)
+        except InvalidStateError:
+            # cancelled meanwhile
+            pass
+
+    def __set_exception(self, e: Exception) -> None:
+        try:
+            self.future.set_exception(e)
+        except InvalidStateError:
+            pass
+
+
+class CommandScheduler:
+    # a single timer thread schedules the follow-up requests of all pending results, a small pool sends them
+    def __init__(self, max_workers: int = 4):
+        if max_workers < 1:
+            raise ValueError('max_workers must be at least 1')
+        self.max_workers = max_workers
+        self.__condition = threading.Condition()
+        self.__queue = []
+        # all unresolved pending results, queued or already handed to the pool
+        self.__pending_results = set()
+        self.__sequence = itertools.count()
+        self.__thread = None
+        self.__executor = None
+        self.__closed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def __len__(self) -> int:
+        with self.__condition:
+            return len(self.__queue)
+
+    def schedule(self, pending_result: PendingResult, delay: float) -> None:
+        with self.__condition:
+            if self.__closed:
+                raise SaicApiException('The command scheduler has been closed')
+            if self.__thread is None:
+                self.__executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                     thread_name_prefix='command-scheduler')
+                self.__thread = threading.Thread(target=self.__run, name='command-scheduler-timer', daemon=True)
+                self.__thread.start()
+            if pending_result not in self.__pending_results:
+                self.__pending_results.add(pending_result)
+                pending_result.add_done_callback(self.__discard)
+            heapq.heappush(self.__queue, (time.monotonic() + delay, next(self.__sequence), pending_result))
+            self.__condition.notify()
+
+    def close(self) -> None:
+        with self.__condition:
+            self.__closed = True
+            pending_results = list(self.__pending_results)
+            self.__queue.clear()
+            self.__condition.notify()
+        for pending_result in pending_results:
+            pending_result.cancel()
+        if self.__thread is not None:
+            self.__thread.join()
+            self.__executor.shutdown(wait=False, cancel_futures=True)
+
+    def __discard(self, pending_result: PendingResult) -> None:
+        with self.__condition:
+            self.__pending_results.discard(pending_result)
+
+    def __run(self) -> None:
+        while True:
+            with self.__condition:
+                while not self.__closed:
+                    if self.__queue:
+                        timeout = self.__queue[0][0] - time.monotonic()
+                        if timeout <= 0:
+                            break
+                    else:
+                        timeout = None
+                    self.__condition.wait(timeout)
+                if self.__closed:
+                    return
+                _, _, pending_result = heapq.heappop(self.__queue)
+            if not pending_result.done():
+                self.__executor.submit(pending_result.poll)
@@ -1,13 +1,17 @@
-import io
 import logging
 import os
 import pathlib
+import threading
 import time
+import warnings
 from enum import Enum
+from typing import Iterable, Iterator
 
-import asn1tools
 from asn1tools.compiler import Specification
 
+from saic_ismart_client.specification_registry import SPECIFICATION_REGISTRY
+from saic_ismart_client.uper_codec import UPER_CODEC, UnsupportedSchemaError, UperCodec, compile_uper_codec
+
 logging.basicConfig(format='%(asctime)s %(message)s')
 LOG = logging.getLogger(__name__)
 LOG.setLevel(level=os.getenv('LOG_LEVEL', 'INFO').upper())
@@ -89,7 +93,34 @@ class ChargeCurrentLimitCode(Enum):
                 raise ValueError(f'Unknown charge current limit code: {self}')
 
 
+class ProtocolVersion(Enum):
+    V1_1 = '1.1'
+    V2_1 = '2.1'
+    V3_0 = '3.0'
+
+    @staticmethod
+    def from_header(protocol_version: int):
+        # the upper nibble of the header protocol version is the major version, e.g. 0x11 and 0x12 are both V1.x
+        match protocol_version >> 4:
+            case 1:
+                return ProtocolVersion.V1_1
+            case 2:
+                return ProtocolVersion.V2_1
+            case 3:
+                return ProtocolVersion.V3_0
+            case _:
+                raise ValueError(f'Unknown protocol version: {protocol_version}')
+
+
+class MessageDirection(Enum):
+    REQUEST = 'request'
+    RESPONSE = 'response'
+
+
 class Header:
+    __slots__ = ('protocol_version', 'security_context', 'dispatcher_message_length', 'dispatcher_body_encoding',
+                 '__dict__')
+
     def __init__(self):
         self.protocol_version = None
         self.security_context = None
@@ -119,8 +150,16 @@ class Header:
 
 
 class Asn1Type:
-    def __init__(self, asn_type: str):
-        self.asn_type = asn_type
+    # the ASN.1 type name is the same for all instances, so it is kept on the class instead of on every instance.
+    # __dict__ is only created for attributes that are not declared as slots.
+    __slots__ = ('__dict__',)
+    asn_type: str | None = None
+
+    def __init__(self, asn_type: str = None):
+        if asn_type is not None:
+            warnings.warn('The asn_type argument is deprecated, set the asn_type class attribute instead',
+                          DeprecationWarning, stacklevel=2)
+            self.asn_type = asn_type
 
     def get_data(self) -> dict:
         pass
@@ -139,7 +178,13 @@ class Asn1Type:
 
 
 class AbstractMessageBody(Asn1Type):
-    def __init__(self, asn_type: str):
+    __slots__ = (
+        'message_id', 'event_creation_time', 'application_id', 'application_data_protocol_version', 'test_flag', 'uid',
+        'token', 'event_id', 'application_data_encoding', 'application_data_length', 'vin', 'ack_required', 'result',
+        'error_message'
+    )
+
+    def __init__(self, asn_type: str = None):
         super().__init__(asn_type)
         self.message_id = None
         self.event_creation_time = None
@@ -205,7 +250,12 @@ class AbstractMessageBody(Asn1Type):
 
 
 class MessageBodyV1(AbstractMessageBody):
-    def __init__(self, asn_type: str):
+    __slots__ = (
+        'message_counter', 'icc_id', 'sim_info', 'stateless_dispatcher_message', 'crqm_request', 'basic_position',
+        'network_info', 'hmi_language'
+    )
+
+    def __init__(self, asn_type: str = None):
         super().__init__(asn_type)
         self.message_counter = None
         self.icc_id = None
@@ -252,8 +302,11 @@ class MessageBodyV1(AbstractMessageBody):
 
 
 class MessageBodyV2(AbstractMessageBody):
+    __slots__ = ('ul_message_counter', 'dl_message_counter', 'ack_message_counter')
+    asn_type = 'MPDispatcherBody'
+
     def __init__(self):
-        super().__init__('MPDispatcherBody')
+        super().__init__()
         self.ul_message_counter = None
         self.dl_message_counter = None
         self.ack_message_counter = None
@@ -273,26 +326,56 @@ class MessageBodyV2(AbstractMessageBody):
 
 
 class ApplicationData(Asn1Type):
-    def __init__(self, asn_type: str):
+    __slots__ = ()
+
+    def __init__(self, asn_type: str = None):
         super().__init__(asn_type)
 
 
 class AbstractMessage:
+    __slots__ = ('header', 'body', '__pending_application_data', '__application_data', '__dict__')
+
     def __init__(self, header: Header, body: AbstractMessageBody, application_data: ApplicationData):
         self.header = header
         self.body = body
         self.application_data = application_data
 
+    @property
+    def application_data(self) -> ApplicationData | None:
+        pending_application_data = self.__pending_application_data
+        if pending_application_data is not None:
+            asn1_tool, application_data_bytes, decode_lock = pending_application_data
+            # a message shared between threads must only be decoded once
+            with decode_lock:
+                if self.__pending_application_data is pending_application_data:
+                    self.__application_data.init_from_dict(asn1_tool.decode(self.__application_data.asn_type,
+                                                                            application_data_bytes))
+                    self.__pending_application_data = None
+        return self.__application_data
+
+    @application_data.setter
+    def application_data(self, application_data: ApplicationData | None) -> None:
+        self.__pending_application_data = None
+        self.__application_data = application_data
+
+    def set_pending_application_data(self, asn1_tool: Specification, application_data_bytes: bytes) -> None:
+        # the application data is decoded on first access, so decoding errors are raised there and not by the request
+        # that received the message. They are neither retried nor counted by the circuit breaker.
+        self.__pending_application_data = (asn1_tool, application_data_bytes, threading.Lock())
+
+    def has_application_data(self) -> bool:
+        return self.__application_data is not None
+
+    def is_application_data_decoded(self) -> bool:
+        return self.__pending_application_data is None
+
     def get_version(self) -> str:
         pass
 
     def get_data(self) -> dict:
         app_data = None
-        if (
-                self.application_data is not None
-                and self.application_data.get_data()
-        ):
-            app_data = self.application_data.get_data()
+        if self.application_data is not None:
+            app_data = self.application_data.get_data() or None
         return {
             'applicationData': app_data,
             'body': self.body.get_data(),
@@ -301,34 +384,248 @@ class AbstractMessage:
 
 
 class MessageV1(AbstractMessage):
+    __slots__ = ()
+
     def __init__(self, header: Header, body: MessageBodyV1, application_data: ApplicationData = None):
         super().__init__(header, body, application_data)
 
 
 class MessageV2(AbstractMessage):
+    __slots__ = ('reserved',)
+
     def __init__(self, body: MessageBodyV2, application_data: ApplicationData = None,
                  reserved: bytes = None):
         super().__init__(Header(), body, application_data)
         self.reserved = reserved
 
 
+class ApplicationDataRegistry:
+    def __init__(self):
+        self.__application_data_types = {}
+
+    def register(self, protocol_version: ProtocolVersion, application_id: str, application_data_protocol_version: int,
+                 request_type: type | None, response_type: type | None, message_id: int = None) -> None:
+        self.register_type(protocol_version, application_id, application_data_protocol_version,
+                           MessageDirection.REQUEST, request_type, message_id)
+        self.register_type(protocol_version, application_id, application_data_protocol_version,
+                           MessageDirection.RESPONSE, response_type, message_id)
+
+    def register_type(self, protocol_version: ProtocolVersion, application_id: str,
+                      application_data_protocol_version: int, direction: MessageDirection,
+                      application_data_type: type | None, message_id: int = None) -> None:
+        key = (protocol_version, application_id, application_data_protocol_version, direction, message_id)
+        self.__application_data_types[key] = application_data_type
+
+    def is_registered(self, protocol_version: ProtocolVersion, application_id: str,
+                      application_data_protocol_version: int, direction: MessageDirection,
+                      message_id: int = None) -> bool:
+        key = (protocol_version, application_id, application_data_protocol_version, direction)
+        return (
+                key + (message_id,) in self.__application_data_types
+                or key + (None,) in self.__application_data_types
+        )
+
+    def get_application_data_type(self, protocol_version: ProtocolVersion, application_id: str,
+                                  application_data_protocol_version: int, direction: MessageDirection,
+                                  message_id: int = None) -> type | None:
+        key = (protocol_version, application_id, application_data_protocol_version, direction)
+        # some applications (e.g. charging management) use the message ID to tell their messages apart
+        if key + (message_id,) in self.__application_data_types:
+            return self.__application_data_types[key + (message_id,)]
+        return self.__application_data_types.get(key + (None,))
+
+    def create_application_data(self, protocol_version: ProtocolVersion, application_id: str,
+                                application_data_protocol_version: int, direction: MessageDirection,
+                                message_id: int = None) -> ApplicationData | None:
+        application_data_type = self.get_application_data_type(protocol_version, application_id,
+                                                               application_data_protocol_version, direction,
+                                                               message_id)
+        if application_data_type is None:
+            return None
+        return application_data_type()
+
+
+APPLICATION_DATA_REGISTRY = ApplicationDataRegistry()
+
+
+class MessagePeek:
+    def __init__(self, protocol_version: int):
+        self.protocol_version = protocol_version
+        self.message_id = None
+        self.application_id = None
+        self.application_data_protocol_version = None
+        self.result = None
+        self.application_data_length = None
+
+    def init_from_dict(self, data: dict):
+        self.message_id = data.get(FIELD_MESSAGE_ID)
+        self.application_id = data.get(FIELD_APPLICATION_ID)
+        self.application_data_protocol_version = data.get(FIELD_APPLICATION_DATA_PROTOCOL_VERSION)
+        self.result = data.get(FIELD_RESULT)
+        self.application_data_length = data.get(FIELD_APPLICATION_DATA_LENGTH)
+
+    def has_application_data(self) -> bool:
+        return self.application_data_length is not None and self.application_data_length > 0
+
+
+class Projection:
+    def __init__(self, asn_type: str, fields: dict):
+        # maps the record keys to dotted paths of ASN.1 field names, e.g. 'gpsPosition.wayPoint.position.latitude'
+        self.asn_type = asn_type
+        self.fields = {name: tuple(path.split('.')) for name, path in fields.items()}
+
+    def apply(self, data: dict) -> dict:
+        record = {}
+        for name, path in self.fields.items():
+            value = data
+            for field in path:
+                value = value.get(field)
+                if value is None:
+                    break
+            record[name] = value
+        return record
+
+
+class DecodeResult:
+    def __init__(self, index: int, message: AbstractMessage | None = None, error: Exception | None = None):
+        self.index = index
+        self.message = message
+        self.error = error
+
+    def is_successful(self) -> bool:
+        return self.error is None
+
+
 class AbstractMessageCoder:
     def __init__(self, asn_files_dir: str):
         self.asn_files = []
         self.asn_files_dir = pathlib.Path(__file__).parent / asn_files_dir
         self.load_asn_files()
+        self.asn1_tool_uper = self.get_specification('uper')
+        self.dispatcher_body_codec = self.get_dispatcher_body_codec()
 
     def load_asn_files(self):
         for f in os.listdir(self.asn_files_dir):
             if f.endswith('.asn1'):
                 self.asn_files.append(str(self.asn_files_dir) + '/' + f)
 
-    def encode_request(self, message: AbstractMessage) -> str:
+    def get_specification(self, codec: str) -> Specification:
+        return SPECIFICATION_REGISTRY.get_specification(self.asn_files_dir, self.asn_files, codec)
+
+    def get_dispatcher_body_codec(self) -> UperCodec | Specification:
+        # the dispatcher body is part of every message, so it is handled by a specialized codec
+        dispatcher_body_files = [f for f in self.asn_files if f.endswith('MP_DispatcherBody.asn1')]
+        try:
+            return SPECIFICATION_REGISTRY.get_specification(self.asn_files_dir, dispatcher_body_files, UPER_CODEC,
+                                                            compile_uper_codec)
+        except UnsupportedSchemaError as e:
+            LOG.debug(f'Using asn1tools for the dispatcher body: {e}')
+            return self.asn1_tool_uper
+
+    def encode_request(self, message: AbstractMessage, application_data_bytes: bytes = None) -> str:
+        return self.to_hex_frame(self.encode_request_bytes(message, application_data_bytes))
+
+    def encode_request_bytes(self, message: AbstractMessage, application_data_bytes: bytes = None) -> bytearray:
+        # pre-encoded application data bytes take precedence over the application data of the message
         pass
 
-    def decode_response(self, message: str, decoded_message: AbstractMessage) -> None:
+    def assemble_request_bytes(self, message: AbstractMessage, message_body_bytes: bytes,
+                               application_data_bytes: bytes) -> bytearray:
         pass
 
+    def decode_response(self, message: str, decoded_message: AbstractMessage, lazy: bool = False) -> None:
+        self.decode_response_bytes(self.from_hex_frame(message), decoded_message, lazy)
+
+    def decode_response_bytes(self, message: bytes | memoryview, decoded_message: AbstractMessage,
+                              lazy: bool = False) -> None:
+        message_bytes = memoryview(message)
+        application_data_offset = self.decode_header_and_body(message_bytes, decoded_message)
+        self.decode_application_data(message_bytes, application_data_offset, decoded_message, lazy)
+
+    def decode_header_and_body(self, message_bytes: memoryview, decoded_message: AbstractMessage) -> int:
+        # returns the offset of the application data
+        pass
+
+    def decode_application_data(self, message_bytes: memoryview, application_data_offset: int,
+                                decoded_message: AbstractMessage, lazy: bool = False) -> None:
+        message_body = decoded_message.body
+        if (
+            message_body.application_data_length > 0
+            and decoded_message.has_application_data()
+        ):
+            application_data_bytes = message_bytes[application_data_offset:
+                                                   application_data_offset + message_body.application_data_length]
+            if lazy:
+                decoded_message.set_pending_application_data(self.asn1_tool_uper, bytes(application_data_bytes))
+                return
+            application_data_dict = self.asn1_tool_uper.decode(decoded_message.application_data.asn_type,
+                                                               application_data_bytes)
+            decoded_message.application_data.init_from_dict(application_data_dict)
+        else:
+            decoded_message.application_data = None
+
+    def get_protocol(self) -> ProtocolVersion:
+        pass
+
+    def create_message(self, application_data: ApplicationData | None = None) -> AbstractMessage:
+        pass
+
+    def decode_any_response(self, message: str, direction: MessageDirection = MessageDirection.RESPONSE,
+                            lazy: bool = False) -> AbstractMessage:
+        return self.decode_any_response_bytes(self.from_hex_frame(message), direction, lazy)
+
+    def decode_any_response_bytes(self, message: bytes | memoryview,
+                                  direction: MessageDirection = MessageDirection.RESPONSE,
+                                  lazy: bool = False) -> AbstractMessage:
+        message_bytes = memoryview(message)
+        decoded_message = self.create_message()
+        application_data_offset = self.decode_header_and_body(message_bytes, decoded_message)
+        message_body = decoded_message.body
+        decoded_message.application_data = APPLICATION_DATA_REGISTRY.create_application_data(
+            self.get_protocol(), message_body.application_id, message_body.application_data_protocol_version,
+            direction, message_body.message_id)
+        self.decode_application_data(message_bytes, application_data_offset, decoded_message, lazy)
+        return decoded_message
+
+    def decode_many(self, frames: Iterable[str | bytes],
+                    direction: MessageDirection = MessageDirection.RESPONSE) -> Iterator[DecodeResult]:
+        for index, frame in enumerate(frames):
+            try:
+                message_bytes = self.from_hex_frame(frame) if isinstance(frame, str) else frame
+                result = DecodeResult(index, self.decode_any_response_bytes(message_bytes, direction))
+            except Exception as e:
+                result = DecodeResult(index, error=e)
+            yield result
+
+    def decode_projection(self, message: str, projection: Projection) -> dict | None:
+        return self.decode_projection_bytes(self.from_hex_frame(message), projection)
+
+    def decode_projection_bytes(self, message: bytes | memoryview, projection: Projection) -> dict | None:
+        message_bytes = memoryview(message)
+        decoded_message = self.create_message()
+        application_data_offset = self.decode_header_and_body(message_bytes, decoded_message)
+        application_data_length = decoded_message.body.application_data_length
+        if application_data_length is None or application_data_length == 0:
+            return None
+        application_data_dict = self.asn1_tool_uper.decode(projection.asn_type, message_bytes[
+                                                           application_data_offset:
+                                                           application_data_offset + application_data_length])
+        return projection.apply(application_data_dict)
+
+    def peek_response(self, message: str) -> MessagePeek:
+        return self.peek_response_bytes(self.from_hex_frame(message))
+
+    def peek_response_bytes(self, message: bytes | memoryview) -> MessagePeek:
+        pass
+
+    def to_hex_frame(self, message_bytes: bytes | bytearray) -> str:
+        pass
+
+    @staticmethod
+    def from_hex_frame(message: str) -> bytes:
+        # the first 5 characters contain the frame length and are not byte aligned
+        return bytes.fromhex(message[5:])
+
     def initialize_message(self, uid: str, token: str, vin: str, application_id: str,
                            application_data_protocol_version: int, message_id: int, message: AbstractMessage) -> None:
         pass
@@ -361,18 +658,24 @@ class AbstractMessageCoder:
 class MessageCoderV1(AbstractMessageCoder):
     def __init__(self, asn_files_dir: str):
         super().__init__(asn_files_dir)
-        self.asn1_tool_uper = asn1tools.compile_files(self.asn_files, 'uper')
         self.header_length = 4
 
-    def encode_request(self, message: MessageV1) -> str:
-        application_data_bytes = self.get_application_data_bytes(message.application_data, self.asn1_tool_uper)
+    def encode_request(self, message: MessageV1, application_data_bytes: bytes = None) -> str:
+        return super().encode_request(message, application_data_bytes)
+
+    def encode_request_bytes(self, message: MessageV1, application_data_bytes: bytes = None) -> bytearray:
+        if application_data_bytes is None:
+            application_data_bytes = self.get_application_data_bytes(message.application_data, self.asn1_tool_uper)
 
         message_body = message.body
         message_body.application_data_encoding = DataEncodingType.PER_UNALIGNED.value
         message_body.application_data_length = len(application_data_bytes)
 
-        message_body_bytes = self.asn1_tool_uper.encode(message_body.asn_type, message_body.get_data())
+        message_body_bytes = self.dispatcher_body_codec.encode(message_body.asn_type, message_body.get_data())
+        return self.assemble_request_bytes(message, message_body_bytes, application_data_bytes)
 
+    def assemble_request_bytes(self, message: MessageV1, message_body_bytes: bytes,
+                               application_data_bytes: bytes) -> bytearray:
         message_header = message.header
         if message_header.protocol_version is None:
             raise ValueError('Protocol version in header missing')
@@ -380,36 +683,39 @@ class MessageCoderV1(AbstractMessageCoder):
         message_header.dispatcher_message_length = len(message_body_bytes) + self.header_length
         message_header.dispatcher_body_encoding = DataEncodingType.PER_UNALIGNED
 
-        buffered_message_bytes = io.BytesIO()
-        buffered_message_bytes.write(message_header.protocol_version.to_bytes(1, "little"))
-        buffered_message_bytes.write(message_header.security_context.to_bytes(1, "little"))
-        buffered_message_bytes.write(message_header.dispatcher_message_length.to_bytes(1, "little"))
-        buffered_message_bytes.write(message_header.get_body_encoding_int_value().to_bytes(1, "little"))
-
-        buffered_message_bytes.write(message_body_bytes)
+        body_offset = self.header_length
+        application_data_offset = body_offset + len(message_body_bytes)
+        message_bytes = bytearray(application_data_offset + len(application_data_bytes))
+        message_bytes[0] = message_header.protocol_version
+        message_bytes[1] = message_header.security_context
+        message_bytes[2] = message_header.dispatcher_message_length
+        message_bytes[3] = message_header.get_body_encoding_int_value()
+        message_bytes[body_offset:application_data_offset] = message_body_bytes
+        message_bytes[application_data_offset:] = application_data_bytes
+        return message_bytes
 
-        buffered_message_bytes.write(application_data_bytes)
+    def to_hex_frame(self, message_bytes: bytes | bytearray) -> str:
+        return f'{len(message_bytes) * 2 + 5:04X}1' + message_bytes.hex().upper()
 
-        message_bytes = buffered_message_bytes.getvalue()
+    def decode_response(self, message: str, decoded_message: MessageV1, lazy: bool = False) -> None:
+        super().decode_response(message, decoded_message, lazy)
 
-        length_hex = "{:04x}".format(len(message_bytes) * 2 + 5)
-        result = length_hex + "1" + message_bytes.hex()
-        return result.upper()
+    def decode_response_bytes(self, message: bytes | memoryview, decoded_message: MessageV1,
+                              lazy: bool = False) -> None:
+        super().decode_response_bytes(message, decoded_message, lazy)
 
-    def decode_response(self, message: str, decoded_message: MessageV1) -> None:
-        LOG.debug(f'Message length in bytes: {len(message[5:]) / 2}')
-        buffered_message_bytes = io.BytesIO(bytes.fromhex(message[5:]))
+    def decode_header_and_body(self, message_bytes: memoryview, decoded_message: MessageV1) -> int:
+        LOG.debug(f'Message length in bytes: {len(message_bytes)}')
 
         header = decoded_message.header
-        header_bytes = buffered_message_bytes.read(self.header_length)
-        header.protocol_version = int(header_bytes[0])
+        header.protocol_version = message_bytes[0]
         LOG.debug(f'Protocol version: {header.protocol_version}')
-        header.security_context = int(header_bytes[1])
-        header.dispatcher_message_length = int(header_bytes[2])
+        header.security_context = message_bytes[1]
+        header.dispatcher_message_length = message_bytes[2]
         LOG.debug(f'Dispatcher message length: {header.dispatcher_message_length}')
-        header.dispatcher_body_encoding = int(header_bytes[3])
+        header.dispatcher_body_encoding = message_bytes[3]
 
-        netto_message_size = len(message[5:]) / 2 - self.header_length
+        netto_message_size = len(message_bytes) - self.header_length
         LOG.debug(f'Message size without header: {netto_message_size}')
 
         dispatcher_message_size = header.dispatcher_message_length - self.header_length
@@ -418,18 +724,24 @@ class MessageCoderV1(AbstractMessageCoder):
         dispatcher_message_bytes_to_read = AbstractMessageCoder.validate_dispatcher_message_size(
             dispatcher_message_size, netto_message_size)
 
-        dispatcher_message_bytes = buffered_message_bytes.read(dispatcher_message_bytes_to_read)
+        body_offset = self.header_length
+        application_data_offset = body_offset + dispatcher_message_bytes_to_read
         message_body = decoded_message.body
-        message_body_dict = self.asn1_tool_uper.decode(message_body.asn_type, dispatcher_message_bytes)
+        message_body_dict = self.dispatcher_body_codec.decode(message_body.asn_type,
+                                                              message_bytes[body_offset:application_data_offset])
         message_body.init_from_dict(message_body_dict)
+        return application_data_offset
 
-        if decoded_message.body.application_data_length > 0:
-            application_data_bytes = buffered_message_bytes.read(decoded_message.body.application_data_length)
-            application_data_dict = self.asn1_tool_uper.decode(decoded_message.application_data.asn_type,
-                                                               application_data_bytes)
-            decoded_message.application_data.init_from_dict(application_data_dict)
-        else:
-            decoded_message.application_data = None
+    def peek_response_bytes(self, message: bytes | memoryview) -> MessagePeek:
+        message_bytes = memoryview(message)
+        body_offset = self.header_length
+        dispatcher_message_bytes_to_read = AbstractMessageCoder.validate_dispatcher_message_size(
+            message_bytes[2] - self.header_length, len(message_bytes) - body_offset)
+        message_body_dict = self.dispatcher_body_codec.decode(
+            'MPDispatcherBody', message_bytes[body_offset:body_offset + dispatcher_message_bytes_to_read])
+        message_peek = MessagePeek(message_bytes[0])
+        message_peek.init_from_dict(message_body_dict)
+        return message_peek
 
     def initialize_message(self, uid: str, token: str, vin: str, application_id: str,
                            application_data_protocol_version: int, message_id: int, message: MessageV1):
@@ -455,55 +767,69 @@ class MessageCoderV1(AbstractMessageCoder):
 class MessageCoderV2(AbstractMessageCoder):
     def __init__(self, asn_files_dir: str):
         super().__init__(asn_files_dir)
-        self.asn1_tool_uper = asn1tools.compile_files(self.asn_files, 'uper')
         self.header_length = 3
         self.reserved_size = 16
 
-    def encode_request(self, message: MessageV2) -> str:
-        application_data_bytes = self.get_application_data_bytes(message.application_data, self.asn1_tool_uper)
+    def encode_request(self, message: MessageV2, application_data_bytes: bytes = None) -> str:
+        return super().encode_request(message, application_data_bytes)
+
+    def encode_request_bytes(self, message: MessageV2, application_data_bytes: bytes = None) -> bytearray:
+        if application_data_bytes is None:
+            application_data_bytes = self.get_application_data_bytes(message.application_data, self.asn1_tool_uper)
 
         message_body = message.body
         message_body.application_data_encoding = DataEncodingType.PER_UNALIGNED.value
         message_body.application_data_length = len(application_data_bytes)
 
-        message_body_bytes = self.asn1_tool_uper.encode(message_body.asn_type, message_body.get_data())
+        message_body_bytes = self.dispatcher_body_codec.encode(message_body.asn_type, message_body.get_data())
+        return self.assemble_request_bytes(message, message_body_bytes, application_data_bytes)
 
+    def assemble_request_bytes(self, message: MessageV2, message_body_bytes: bytes,
+                               application_data_bytes: bytes) -> bytearray:
         message_header = message.header
         message_header.protocol_version = self.get_protocol_version()
         message_header.dispatcher_message_length = len(message_body_bytes) + self.header_length
         message_header.dispatcher_body_encoding = DataEncodingType.PER_UNALIGNED
 
-        buffered_message_bytes = io.BytesIO()
-        buffered_message_bytes.write(message_header.protocol_version.to_bytes(1, 'little'))
-        buffered_message_bytes.write(message_header.dispatcher_message_length.to_bytes(1, 'little'))
-        buffered_message_bytes.write(message_header.get_body_encoding_int_value().to_bytes(1, 'little'))
+        reserved_offset = self.header_length
+        body_offset = reserved_offset + len(message.reserved)
+        application_data_offset = body_offset + len(message_body_bytes)
+        message_bytes = bytearray(application_data_offset + len(application_data_bytes))
+        message_bytes[0] = message_header.protocol_version
+        message_bytes[1] = message_header.dispatcher_message_length
+        message_bytes[2] = message_header.get_body_encoding_int_value()
+        message_bytes[reserved_offset:body_offset] = message.reserved
+        message_bytes[body_offset:application_data_offset] = message_body_bytes
+        message_bytes[application_data_offset:] = application_data_bytes
+        return message_bytes
 
-        buffered_message_bytes.write(message.reserved)
+    def to_hex_frame(self, message_bytes: bytes | bytearray) -> str:
+        return f'1{len(message_bytes) + self.header_length:04X}' + message_bytes.hex().upper()
 
-        buffered_message_bytes.write(message_body_bytes)
+    def create_message(self, application_data: ApplicationData | None = None) -> MessageV2:
+        return MessageV2(MessageBodyV2(), application_data)
 
-        buffered_message_bytes.write(application_data_bytes)
+    def decode_response(self, message: str, decoded_message: MessageV2, lazy: bool = False) -> None:
+        super().decode_response(message, decoded_message, lazy)
 
-        message_bytes = buffered_message_bytes.getvalue()
+    def decode_response_bytes(self, message: bytes | memoryview, decoded_message: MessageV2,
+                              lazy: bool = False) -> None:
+        super().decode_response_bytes(message, decoded_message, lazy)
 
-        length_hex = "{:04x}".format(len(message_bytes) + self.header_length)
-        result = "1" + length_hex + message_bytes.hex()
-        return result.upper()
-
-    def decode_response(self, message: str, decoded_message: MessageV2) -> None:
-        LOG.debug(f'Message length in bytes: {len(message[5:])/2}')
-        buffered_message_bytes = io.BytesIO(bytes.fromhex(message[5:]))
+    def decode_header_and_body(self, message_bytes: memoryview, decoded_message: MessageV2) -> int:
+        LOG.debug(f'Message length in bytes: {len(message_bytes)}')
 
         header = decoded_message.header
-        header_bytes = buffered_message_bytes.read(self.header_length)
-        header.protocol_version = int(header_bytes[0])
+        header.protocol_version = message_bytes[0]
         LOG.debug(f'Protocol version: {header.protocol_version}')
-        header.dispatcher_message_length = int(header_bytes[1])
+        header.dispatcher_message_length = message_bytes[1]
         LOG.debug(f'Dispatcher message length: {header.dispatcher_message_length}')
-        header.dispatcher_body_encoding = int(header_bytes[2])
+        header.dispatcher_body_encoding = message_bytes[2]
 
-        decoded_message.reserved = buffered_message_bytes.read(self.reserved_size)
-        netto_message_size = len(message[5:])/2 - self.header_length - self.reserved_size
+        reserved_offset = self.header_length
+        body_offset = reserved_offset + self.reserved_size
+        decoded_message.reserved = bytes(message_bytes[reserved_offset:body_offset])
+        netto_message_size = len(message_bytes) - self.header_length - self.reserved_size
         LOG.debug(f'Message size without header and reserved bytes: {netto_message_size}')
         dispatcher_message_size = header.dispatcher_message_length - self.header_length
         LOG.debug(f'Dispatcher message bytes: {dispatcher_message_size}')
@@ -511,20 +837,23 @@ class MessageCoderV2(AbstractMessageCoder):
         dispatcher_message_bytes_to_read = AbstractMessageCoder.validate_dispatcher_message_size(
             dispatcher_message_size, netto_message_size)
 
-        dispatcher_message_bytes = buffered_message_bytes.read(dispatcher_message_bytes_to_read)
-        message_body_dict = self.asn1_tool_uper.decode('MPDispatcherBody', dispatcher_message_bytes)
+        application_data_offset = body_offset + dispatcher_message_bytes_to_read
+        message_body_dict = self.dispatcher_body_codec.decode('MPDispatcherBody',
+                                                              message_bytes[body_offset:application_data_offset])
         message_body = decoded_message.body
         message_body.init_from_dict(message_body_dict)
-        if (
-            message_body.application_data_length > 0
-            and decoded_message.application_data is not None
-        ):
-            application_data_bytes = buffered_message_bytes.read(message_body.application_data_length)
-            application_data_dict = self.asn1_tool_uper.decode(decoded_message.application_data.asn_type,
-                                                               application_data_bytes)
-            decoded_message.application_data.init_from_dict(application_data_dict)
-        else:
-            decoded_message.application_data = None
+        return application_data_offset
+
+    def peek_response_bytes(self, message: bytes | memoryview) -> MessagePeek:
+        message_bytes = memoryview(message)
+        body_offset = self.header_length + self.reserved_size
+        dispatcher_message_bytes_to_read = AbstractMessageCoder.validate_dispatcher_message_size(
+            message_bytes[1] - self.header_length, len(message_bytes) - body_offset)
+        message_body_dict = self.dispatcher_body_codec.decode(
+            'MPDispatcherBody', message_bytes[body_offset:body_offset + dispatcher_message_bytes_to_read])
+        message_peek = MessagePeek(message_bytes[0])
+        message_peek.init_from_dict(message_body_dict)
+        return message_peek
 
     def initialize_message(self, uid: str, token: str, vin: str, application_id: str,
                            application_data_protocol_version: int, message_id: int, message: MessageV2) -> None:
@@ -555,8 +884,11 @@ class DataEncodingType(Enum):
 
 
 class MessageCounter(Asn1Type):
+    __slots__ = ('downlink_counter', 'uplink_counter')
+    asn_type = 'MessageCounter'
+
     def __init__(self):
-        super().__init__('MessageCounter')
+        super().__init__()
         self.downlink_counter = None
         self.uplink_counter = None
 
@@ -572,8 +904,11 @@ class MessageCounter(Asn1Type):
 
 
 class BasicPosition(Asn1Type):
+    __slots__ = ('latitude', 'longitude')
+    asn_type = 'BasicPosition'
+
     def __init__(self):
-        super().__init__('BasicPosition')
+        super().__init__()
         self.latitude = None
         self.longitude = None
 
@@ -589,8 +924,11 @@ class BasicPosition(Asn1Type):
 
 
 class NetworkInfo(Asn1Type):
+    __slots__ = ('mcc_network', 'mnc_network', 'mcc_sim', 'mnc_sim', 'signal_strength')
+    asn_type = 'NetworkInfo'
+
     def __init__(self):
-        super().__init__('NetworkInfo')
+        super().__init__()
         self.mcc_network = None
         self.mnc_network = None
         self.mcc_sim = None
@@ -0,0 +1,109 @@
+import asyncio
+import contextvars
+import threading
+import time
+from typing import Callable
+
+from saic_ismart_client.exceptions import SaicApiCancelled, SaicApiDeadlineExceeded
+
+CURRENT_DEADLINE = contextvars.ContextVar('saic_api_deadline', default=None)
+# the tokens to reset CURRENT_DEADLINE belong to the context that entered the deadline, not to the shared deadline
+CONTEXT_TOKENS = contextvars.ContextVar('saic_api_deadline_tokens', default=())
+
+
+def get_current_deadline():
+    return CURRENT_DEADLINE.get()
+
+
+class CancellationToken:
+    def __init__(self):
+        self.__event = threading.Event()
+
+    def cancel(self) -> None:
+        self.__event.set()
+
+    def is_cancelled(self) -> bool:
+        return self.__event.is_set()
+
+    def wait(self, timeout: float) -> bool:
+        # returns True if the token has been cancelled while waiting
+        return self.__event.wait(timeout)
+
+
+class Deadline:
+    # entering a deadline applies it to all API calls of the current thread or task until it is left again
+    def __init__(self, timeout: float = None, cancellation_token: CancellationToken = None,
+                 clock: Callable[[], float] = time.monotonic):
+        if timeout is not None and timeout < 0:
+            raise ValueError('timeout must not be negative')
+        self.timeout = timeout
+        self.cancellation_token = cancellation_token
+        self.clock = clock
+        self.expires_at = clock() + timeout if timeout is not None else None
+
+    def __enter__(self):
+        CONTEXT_TOKENS.set(CONTEXT_TOKENS.get() + (CURRENT_DEADLINE.set(self),))
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        context_tokens = CONTEXT_TOKENS.get()
+        CONTEXT_TOKENS.set(context_tokens[:-1])
+        CURRENT_DEADLINE.reset(context_tokens[-1])
+
+    def remaining(self) -> float | None:
+        if self.expires_at is None:
+            return None
+        return max(self.expires_at - self.clock(), 0.0)
+
+    def is_expired(self) -> bool:
+        return self.expires_at is not None and self.clock() >= self.expires_at
+
+    def check(self) -> None:
+        if self.cancellation_token is not None and self.cancellation_token.is_cancelled():
+            raise SaicApiCancelled('API call cancelled')
+        if self.is_expired():
+            raise SaicApiDeadlineExceeded(f'API call exceeded its deadline of {self.timeout} seconds')
+
+    def get_timeout(self, timeout: float | None) -> float | None:
+        remaining = self.remaining()
+        if remaining is None:
+            return timeout
+        if timeout is None:
+            return remaining
+        return min(timeout, remaining)
+
+    def compress(self, waiting_time: float) -> float:
+        # leaves half of the remaining budget for the next attempt
+        remaining = self.remaining()
+        if remaining is None:
+            return waiting_time
+        return min(waiting_time, remaining / 2)
+
+    def sleep(self, waiting_time: float) -> None:
+        self.check()
+        self.wait(self.compress(waiting_time))
+
+    def wait(self, waiting_time: float) -> None:
+        # waits for the full time, fails right away if the deadline would pass meanwhile
+        self.__check_wait(waiting_time)
+        if self.cancellation_token is not None:
+            self.cancellation_token.wait(waiting_time)
+        else:
+            time.sleep(waiting_time)
+        self.check()
+
+    async def async_sleep(self, waiting_time: float) -> None:
+        self.check()
+        await self.async_wait(self.compress(waiting_time))
+
+    async def async_wait(self, waiting_time: float) -> None:
+        # asyncio callers can also cancel the task, the token is checked before and after the sleep
+        self.__check_wait(waiting_time)
+        await asyncio.sleep(waiting_time)
+        self.check()
+
+    def __check_wait(self, waiting_time: float) -> None:
+        self.check()
+        remaining = self.remaining()
+        if remaining is not None and waiting_time > remaining:
+            raise SaicApiDeadlineExceeded(f'API call would exceed its deadline of {self.timeout} seconds')
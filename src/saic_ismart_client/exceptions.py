@@ -1,5 +1,6 @@
 class SaicApiException(Exception):
     def __init__(self, msg: str, return_code: int = None):
+        super().__init__(msg, return_code)
         if return_code is not None:
             self.message = f'return code: {return_code}, message: {msg}'
         else:
@@ -7,3 +8,17 @@ class SaicApiException(Exception):
 
     def __str__(self):
         return self.message
+
+
+class SaicApiDeadlineExceeded(SaicApiException):
+    pass
+
+
+class SaicApiCancelled(SaicApiException):
+    pass
+
+
+class SaicApiCircuitOpen(SaicApiException):
+    def __init__(self, msg: str, retry_after: float):
+        super().__init__(msg)
+        self.retry_after = retry_after
@@ -0,0 +1,85 @@
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Iterator, cast
+
+from saic_ismart_client.common_model import MessageV2
+from saic_ismart_client.ota_v1_1.data_model import MpUserLoggingInRsp, VinInfo
+from saic_ismart_client.ota_v3_0.Message import MessageV30
+from saic_ismart_client.saic_api import SaicApi
+
+
+class FleetPollResult:
+    def __init__(self, saic_api: SaicApi, vin_info: VinInfo):
+        self.saic_api = saic_api
+        self.vin_info = vin_info
+        self.vehicle_status: MessageV2 | None = None
+        self.charging_status: MessageV30 | None = None
+        self.error: Exception | None = None
+        # durations in seconds
+        self.vehicle_status_duration: float | None = None
+        self.charging_status_duration: float | None = None
+        self.duration: float | None = None
+
+    @property
+    def vin(self) -> str:
+        return self.vin_info.vin
+
+    def is_successful(self) -> bool:
+        return self.error is None
+
+
+class FleetPoller:
+    def __init__(self, max_workers: int = 8, poll_charging_status: bool = True):
+        if max_workers < 1:
+            raise ValueError('max_workers must be at least 1')
+        self.max_workers = max_workers
+        self.poll_charging_status = poll_charging_status
+        self.vehicles = []
+        self.__executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self) -> None:
+        if self.__executor is not None:
+            self.__executor.shutdown()
+            self.__executor = None
+
+    def add_account(self, saic_api: SaicApi, vin_infos: list = None) -> None:
+        # without a list of vehicles, all vehicles of the account are polled
+        if vin_infos is None:
+            login_response_message = saic_api.login()
+            vin_infos = cast(MpUserLoggingInRsp, login_response_message.application_data).vin_list
+        for vin_info in vin_infos:
+            self.vehicles.append((saic_api, vin_info))
+
+    def poll(self) -> Iterator[FleetPollResult]:
+        # results are yielded in the order in which the vehicles finish
+        if self.__executor is None:
+            self.__executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='fleet-poller')
+        futures = [self.__executor.submit(self.poll_vehicle, saic_api, vin_info)
+                   for saic_api, vin_info in self.vehicles]
+        try:
+            for future in as_completed(futures):
+                yield future.result()
+        finally:
+            for future in futures:
+                future.cancel()
+
+    def poll_vehicle(self, saic_api: SaicApi, vin_info: VinInfo) -> FleetPollResult:
+        result = FleetPollResult(saic_api, vin_info)
+        start = time.perf_counter()
+        try:
+            result.vehicle_status = saic_api.get_vehicle_status_with_retry(vin_info)
+            result.vehicle_status_duration = time.perf_counter() - start
+            if self.poll_charging_status:
+                charging_status_start = time.perf_counter()
+                result.charging_status = saic_api.get_charging_status_with_retry(vin_info)
+                result.charging_status_duration = time.perf_counter() - charging_status_start
+        except Exception as e:
+            result.error = e
+        result.duration = time.perf_counter() - start
+        return result
@@ -0,0 +1,113 @@
+import collections
+import functools
+import itertools
+import os
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, Iterator
+
+from saic_ismart_client.common_model import AbstractMessage, AbstractMessageCoder, DecodeResult, MessageDirection, \
+    ProtocolVersion
+from saic_ismart_client.exceptions import SaicApiException
+from saic_ismart_client.ota_v1_1.Message import MessageCoderV11
+from saic_ismart_client.ota_v2_1.Message import MessageCoderV21
+from saic_ismart_client.ota_v3_0.Message import MessageCoderV30
+
+
+@functools.cache
+def get_message_coder(protocol_version: ProtocolVersion) -> AbstractMessageCoder:
+    match protocol_version:
+        case ProtocolVersion.V1_1:
+            return MessageCoderV11()
+        case ProtocolVersion.V2_1:
+            return MessageCoderV21()
+        case ProtocolVersion.V3_0:
+            return MessageCoderV30()
+        case _:
+            raise ValueError(f'Unsupported protocol version: {protocol_version}')
+
+
+def get_frame_protocol_version(frame: str) -> ProtocolVersion:
+    # the protocol version is the first byte after the 5 characters of the frame length
+    return ProtocolVersion.from_header(int(frame[5:7], 16))
+
+
+def decode_any(frame: str, direction: MessageDirection = MessageDirection.RESPONSE) -> AbstractMessage:
+    message_coder = get_message_coder(get_frame_protocol_version(frame))
+    return message_coder.decode_any_response(frame, direction)
+
+
+def decode_many(frames: Iterable[str],
+                direction: MessageDirection = MessageDirection.RESPONSE) -> Iterator[DecodeResult]:
+    for index, frame in enumerate(frames):
+        try:
+            result = DecodeResult(index, decode_any(frame, direction))
+        except Exception as e:
+            result = DecodeResult(index, error=e)
+        yield result
+
+
+def _initialize_worker() -> None:
+    # compile all coders once per worker process instead of once per chunk
+    for protocol_version in ProtocolVersion:
+        get_message_coder(protocol_version)
+
+
+def _decode_chunk(offset: int, frames: list, direction: MessageDirection) -> list:
+    results = []
+    for result in decode_many(frames, direction):
+        result.index += offset
+        if result.error is not None:
+            try:
+                pickle.dumps(result.error)
+            except Exception:
+                result.error = SaicApiException(f'{type(result.error).__name__}: {result.error}')
+        results.append(result)
+    return results
+
+
+class ParallelFrameDecoder:
+    def __init__(self, workers: int = None, chunk_size: int = 256):
+        if chunk_size < 1:
+            raise ValueError('chunk_size must be at least 1')
+        self.workers = workers if workers is not None else os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.__executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self) -> None:
+        if self.__executor is not None:
+            self.__executor.shutdown()
+            self.__executor = None
+
+    def decode(self, frames: Iterable[str],
+               direction: MessageDirection = MessageDirection.RESPONSE) -> Iterator[DecodeResult]:
+        if self.__executor is None:
+            self.__executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_initialize_worker)
+
+        # only a few chunks per worker are in flight, so that arbitrarily long inputs can be streamed
+        max_pending_chunks = self.workers * 2
+        pending_chunks = collections.deque()
+        frame_iterator = iter(frames)
+        offset = 0
+        while True:
+            while len(pending_chunks) < max_pending_chunks:
+                chunk = list(itertools.islice(frame_iterator, self.chunk_size))
+                if not chunk:
+                    break
+                pending_chunks.append(self.__executor.submit(_decode_chunk, offset, chunk, direction))
+                offset += len(chunk)
+            if not pending_chunks:
+                return
+            yield from pending_chunks.popleft().result()
+
+
+def decode_parallel(frames: Iterable[str], direction: MessageDirection = MessageDirection.RESPONSE,
+                    workers: int = None, chunk_size: int = 256) -> Iterator[DecodeResult]:
+    with ParallelFrameDecoder(workers, chunk_size) as parallel_frame_decoder:
+        yield from parallel_frame_decoder.decode(frames, direction)
@@ -0,0 +1,39 @@
+import requests
+from requests.adapters import HTTPAdapter
+
+
+class HttpSessionConfig:
+    def __init__(
+            self,
+            pool_connections: int = 4,
+            pool_maxsize: int = 10,
+            pool_block: bool = False,
+            keep_alive: bool = True,
+            connect_timeout: float | None = 10.0,
+            read_timeout: float | None = None
+    ):
+        # pool_connections is the number of hosts with a connection pool, pool_maxsize the connections per host
+        if pool_connections < 1 or pool_maxsize < 1:
+            raise ValueError('pool_connections and pool_maxsize must be at least 1')
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.pool_block = pool_block
+        self.keep_alive = keep_alive
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+
+    @property
+    def timeout(self) -> tuple[float | None, float | None]:
+        return self.connect_timeout, self.read_timeout
+
+    def create_session(self, headers: dict = None) -> requests.Session:
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=self.pool_connections, pool_maxsize=self.pool_maxsize,
+                              pool_block=self.pool_block)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        if headers is not None:
+            session.headers.update(headers)
+        if not self.keep_alive:
+            session.headers['Connection'] = 'close'
+        return session
@@ -1,19 +1,40 @@
-from saic_ismart_client.common_model import MessageCoderV1
-from saic_ismart_client.ota_v1_1.data_model import MessageV11
+from saic_ismart_client.common_model import APPLICATION_DATA_REGISTRY, ApplicationData, Header, MessageCoderV1, \
+    ProtocolVersion
+from saic_ismart_client.ota_v1_1.data_model import AbortSendMessageReq, AlarmSwitchReq, MessageBodyV11, \
+    MessageListReq, MessageListResp, MessageV11, MpUserLoggingInReq, MpUserLoggingInRsp
 
 
 class MessageCoderV11(MessageCoderV1):
     def __init__(self):
         super().__init__('ASN.1_schema/v1_1/')
 
-    def encode_request(self, message: MessageV11) -> str:
-        return super().encode_request(message)
+    def encode_request(self, message: MessageV11, application_data_bytes: bytes = None) -> str:
+        return super().encode_request(message, application_data_bytes)
 
-    def decode_response(self, message: str, decoded_message: MessageV11) -> None:
-        super().decode_response(message, decoded_message)
+    def encode_request_bytes(self, message: MessageV11, application_data_bytes: bytes = None) -> bytearray:
+        return super().encode_request_bytes(message, application_data_bytes)
+
+    def decode_response(self, message: str, decoded_message: MessageV11, lazy: bool = False) -> None:
+        super().decode_response(message, decoded_message, lazy)
+
+    def decode_response_bytes(self, message: bytes | memoryview, decoded_message: MessageV11,
+                              lazy: bool = False) -> None:
+        super().decode_response_bytes(message, decoded_message, lazy)
 
     def initialize_message(self, uid: str, token: str, application_id: str,
                            application_data_protocol_version: int, message_id: int, message: MessageV11,
                            vin: str = None):
         super().initialize_message(uid, token, vin, application_id, application_data_protocol_version, message_id,
                                    message)
+
+    def get_protocol(self) -> ProtocolVersion:
+        return ProtocolVersion.V1_1
+
+    def create_message(self, application_data: ApplicationData | None = None) -> MessageV11:
+        return MessageV11(Header(), MessageBodyV11(), application_data)
+
+
+APPLICATION_DATA_REGISTRY.register(ProtocolVersion.V1_1, '501', 513, MpUserLoggingInReq, MpUserLoggingInRsp)
+APPLICATION_DATA_REGISTRY.register(ProtocolVersion.V1_1, '521', 513, AlarmSwitchReq, None)
+APPLICATION_DATA_REGISTRY.register(ProtocolVersion.V1_1, '531', 513, MessageListReq, MessageListResp)
+APPLICATION_DATA_REGISTRY.register(ProtocolVersion.V1_1, '615', 513, AbortSendMessageReq, None)
@@ -51,8 +51,11 @@ FIELD_START_END_NUMBER = 'startEndNumber'
 
 
 class MessageBodyV11(MessageBodyV1):
+    __slots__ = ()
+    asn_type = 'MPDispatcherBody'
+
     def __init__(self):
-        super().__init__('MPDispatcherBody')
+        super().__init__()
 
     def get_data(self) -> dict:
         return super().get_data()
@@ -62,8 +65,11 @@ class MessageBodyV11(MessageBodyV1):
 
 
 class AlarmSwitchReq(ApplicationData):
+    __slots__ = ('pin', 'alarm_switch_list', 'description')
+    asn_type = 'AlarmSwitchReq'
+
     def __init__(self):
-        super().__init__('AlarmSwitchReq')
+        super().__init__()
         self.pin: str | None = None  # IA5String(SIZE(32))
         self.alarm_switch_list: [AlarmSwitch] = []
         self.description: bytes | None = None  # OCTET STRING(SIZE(0..500)) OPTIONAL
@@ -90,8 +96,11 @@ class AlarmSwitchReq(ApplicationData):
 
 
 class AlarmSwitch(Asn1Type):
+    __slots__ = ('alarm_setting_type', 'alarm_switch', 'function_switch')
+    asn_type = 'AlarmSwitch'
+
     def __init__(self):
-        super().__init__('AlarmSwitch')
+        super().__init__()
         self.alarm_setting_type: MpAlarmSettingType | None = None
         self.alarm_switch: bool | None = None
         self.function_switch: bool | None = None
@@ -110,8 +119,15 @@ class AlarmSwitch(Asn1Type):
 
 
 class MpUserInfoRsp(Asn1Type):
+    __slots__ = (
+        'nick_name', 'address', 'mobile_phone', 'emergency_name', 'emergency_mobile', 'user_photo', 'gender',
+        'birthday', 'language_type', 'real_name', 'the_second_level_country_code', 'the_third_level_country_code',
+        'the_second_level_country_name', 'the_third_level_country_name', 'email'
+    )
+    asn_type = 'MPUserInfoResp'
+
     def __init__(self):
-        super().__init__('MPUserInfoResp')
+        super().__init__()
         self.nick_name: str | None = None  # OCTET STRING(SIZE(1..50)) OPTIONAL
         self.address: str | None = None  # OCTET STRING(SIZE(1..50)) OPTIONAL
         self.mobile_phone: str | None = None  # IA5String(SIZE(1..19)) OPTIONAL
@@ -130,8 +146,11 @@ class MpUserInfoRsp(Asn1Type):
 
 
 class MpUserLoggingInReq(ApplicationData):
+    __slots__ = ('password', 'device_id')
+    asn_type = 'MPUserLoggingInReq'
+
     def __init__(self):
-        super().__init__('MPUserLoggingInReq')
+        super().__init__()
         self.password: str | None = None  # IA5String(SIZE(6..30))
         self.device_id: str | None = None  # IA5String(SIZE(1..200)) OPTIONAL
 
@@ -147,8 +166,11 @@ class MpUserLoggingInReq(ApplicationData):
 
 
 class MpUserLoggingInRsp(ApplicationData):
+    __slots__ = ('token', 'refresh_token', 'token_expiration', 'vin_list', 'user_photo', 'user_name', 'language_type')
+    asn_type = 'MPUserLoggingInResp'
+
     def __init__(self):
-        super().__init__('MPUserLoggingInResp')
+        super().__init__()
         self.token: str | None = None  # IA5String(SIZE(40)) OPTIONAL
         self.refresh_token: str | None = None  # IA5String(SIZE(40)) OPTIONAL
         self.token_expiration: Timestamp | None = None
@@ -193,8 +215,11 @@ class MpUserLoggingInRsp(ApplicationData):
 
 
 class Timestamp(Asn1Type):
+    __slots__ = ('seconds',)
+    asn_type = 'Timestamp'
+
     def __init__(self):
-        super().__init__('Timestamp')
+        super().__init__()
         self.seconds: int = -1  # INTEGER(0..4294967295)
 
     def get_data(self) -> dict:
@@ -210,15 +235,21 @@ class Timestamp(Asn1Type):
 
 
 class AppUpgradeInfoReq(Asn1Type):
+    __slots__ = ('app_type', 'app_version')
+    asn_type = 'APPUpgradeInfoReq'
+
     def __init__(self):
-        super().__init__('APPUpgradeInfoReq')
+        super().__init__()
         self.app_type = None  # APPType
         self.app_version: str | None = None  # IA5String(SIZE(1..50))
 
 
 class AppUpgradeInfoRsp(Asn1Type):
+    __slots__ = ('has_new_version', 'app_version', 'force_update', 'update_url', 'update_info_en', 'update_info_th')
+    asn_type = 'APPUpgradeInfoResp'
+
     def __init__(self):
-        super().__init__('APPUpgradeInfoResp')
+        super().__init__()
         self.has_new_version: bool | None = None  # BOOLEAN
         self.app_version: str | None = None  # IA5String(SIZE(1..50)) OPTIONAL
         self.force_update: bool | None = None  # BOOLEAN OPTIONAL
@@ -228,21 +259,33 @@ class AppUpgradeInfoRsp(Asn1Type):
 
 
 class MpAppAttributeRsp(Asn1Type):
+    __slots__ = ('data_app_attribute',)
+    asn_type = 'MPAppAttributeResp'
+
     def __init__(self):
-        super().__init__('MPAppAttributeResp')
+        super().__init__()
         self.data_app_attribute: str | None = None  # IA5String(SIZE(1..65535)) OPTIONAL
 
 
 class AdvertiseRsp(Asn1Type):
+    __slots__ = ('advertise_version', 'advertises')
+    asn_type = 'AdvertiseResp'
+
     def __init__(self):
-        super().__init__('AdvertiseResp')
+        super().__init__()
         self.advertise_version: int | None = None  # INTEGER(0..281474976710655) OPTIONAL
         self.advertises = []  # SEQUENCE SIZE(0..255) OF Advertise OPTIONAL
 
 
 class VinInfo(Asn1Type):
+    __slots__ = (
+        'vin', 'name', 'series', 'brand_name', 'model_name', 'vehicle_photo', 'active', 'current_vehicle',
+        'model_year', 'color_name', 'model_configuration_json_str', 'bind_time', 'tbox_sim_no'
+    )
+    asn_type = 'VinInfo'
+
     def __init__(self):
-        super().__init__('VinInfo')
+        super().__init__()
         self.vin: str | None = None  # IA5String(SIZE(17))
         self.name: bytes | None = None  # OCTET STRING(SIZE(1..128)) OPTIONAL
         self.series: str | None = None  # IA5String(SIZE(1..10))
@@ -308,8 +351,11 @@ class MpAlarmSettingType(Enum):
 
 
 class MessageListReq(ApplicationData):
+    __slots__ = ('start_end_number', 'message_group')
+    asn_type = 'MessageListReq'
+
     def __init__(self):
-        super().__init__('MessageListReq')
+        super().__init__()
         self.start_end_number: StartEndNumber | None = None
         self.message_group: str | None = None
 
@@ -326,8 +372,11 @@ class MessageListReq(ApplicationData):
 
 
 class AbortSendMessageReq(ApplicationData):
+    __slots__ = ('messages', 'message_id', 'action_type')
+    asn_type = 'AbortSendMessageReq'
+
     def __init__(self):
-        super().__init__('AbortSendMessageReq')
+        super().__init__()
         self.messages: [Message] = []  # SEQUENCE SIZE(1..256) OF Message OPTIONAL
         self.message_id: int = -1  # INTEGER(0..281474976710655) OPTIONAL
         self.action_type: str | None = None  # IA5String(SIZE(1..20)) OPTIONAL
@@ -358,8 +407,14 @@ class AbortSendMessageReq(ApplicationData):
 
 
 class Message(Asn1Type):
+    __slots__ = (
+        'message_id', 'message_type', 'title', 'message_time', 'sender', 'content_id_list', 'content', 'read_status',
+        'vin'
+    )
+    asn_type = 'Message'
+
     def __init__(self):
-        super().__init__('Message')
+        super().__init__()
         self.message_id: int | None = None  # INTEGER(0..281474976710655)
         self.message_type: str | None = None  # IA5String(SIZE(3))
         self.title: str | None = None  # OCTET STRING(SIZE(1..128))
@@ -407,8 +462,11 @@ class Message(Asn1Type):
 
 
 class MessageListResp(ApplicationData):
+    __slots__ = ('records_number', 'messages')
+    asn_type = 'MessageListResp'
+
     def __init__(self):
-        super().__init__('MessageListResp')
+        super().__init__()
         self.records_number: int = 0  # INTEGER(0..281474976710655)
         self.messages: [Message] = []
 
@@ -436,8 +494,11 @@ class MessageListResp(ApplicationData):
 
 
 class StartEndNumber(Asn1Type):
+    __slots__ = ('start_number', 'end_number')
+    asn_type = 'StartEndNumber'
+
     def __init__(self):
-        super().__init__('StartEndNumber')
+        super().__init__()
         self.start_number: int = -1  # INTEGER(0..281474976710655)
         self.end_number: int = -1  # INTEGER(0..281474976710655)
 
@@ -453,8 +514,11 @@ class StartEndNumber(Asn1Type):
 
 
 class ContentId(Asn1Type):
+    __slots__ = ('content_id', 'description')
+    asn_type = 'ContentId'
+
     def __init__(self):
-        super().__init__('ContentId')
+        super().__init__()
         self.content_id = None  # INTEGER(0..281474976710655)
         self.description: str | None = None  # OCTET STRING(SIZE(1..255)) OPTIONAL
 
@@ -472,5 +536,7 @@ class ContentId(Asn1Type):
 
 
 class MessageV11(MessageV1):
+    __slots__ = ()
+
     def __init__(self, header: Header, body: MessageBodyV11, application_data: ApplicationData = None):
         super().__init__(header, body, application_data)
@@ -1,15 +1,24 @@
-from saic_ismart_client.common_model import MessageCoderV2, MessageV2
+from saic_ismart_client.common_model import APPLICATION_DATA_REGISTRY, MessageCoderV2, MessageV2, ProtocolVersion
+from saic_ismart_client.ota_v2_1.data_model import OtaRvcReq, OtaRvcStatus25857, OtaRvmVehicleStatusReq, \
+    OtaRvmVehicleStatusResp25857
 
 
 class MessageCoderV21(MessageCoderV2):
     def __init__(self):
         super().__init__('ASN.1_schema/v2_1/')
 
-    def encode_request(self, message: MessageV2) -> str:
-        return super().encode_request(message)
+    def encode_request(self, message: MessageV2, application_data_bytes: bytes = None) -> str:
+        return super().encode_request(message, application_data_bytes)
 
-    def decode_response(self, message: str, decoded_message: MessageV2) -> None:
-        return super().decode_response(message, decoded_message)
+    def encode_request_bytes(self, message: MessageV2, application_data_bytes: bytes = None) -> bytearray:
+        return super().encode_request_bytes(message, application_data_bytes)
+
+    def decode_response(self, message: str, decoded_message: MessageV2, lazy: bool = False) -> None:
+        return super().decode_response(message, decoded_message, lazy)
+
+    def decode_response_bytes(self, message: bytes | memoryview, decoded_message: MessageV2,
+                              lazy: bool = False) -> None:
+        super().decode_response_bytes(message, decoded_message, lazy)
 
     def initialize_message(self, uid: str, token: str, vin: str, application_id: str,
                            application_data_protocol_version: int, message_id: int, message: MessageV2) -> None:
@@ -18,3 +27,11 @@ class MessageCoderV21(MessageCoderV2):
 
     def get_protocol_version(self) -> int:
         return 33
+
+    def get_protocol(self) -> ProtocolVersion:
+        return ProtocolVersion.V2_1
+
+
+APPLICATION_DATA_REGISTRY.register(ProtocolVersion.V2_1, '510', 25857, OtaRvcReq, OtaRvcStatus25857)
+APPLICATION_DATA_REGISTRY.register(ProtocolVersion.V2_1, '511', 25857, OtaRvmVehicleStatusReq,
+                                   OtaRvmVehicleStatusResp25857)
@@ -1,6 +1,6 @@
 from typing import cast
 
-from saic_ismart_client.common_model import Asn1Type, ApplicationData
+from saic_ismart_client.common_model import Asn1Type, ApplicationData, Projection
 
 FIELD_FAILURE_TYPE = 'failureType'
 FIELD_RVC_REQ_STS = 'rvcReqSts'
@@ -31,8 +31,11 @@ FIELD_VEH_STATUS_REQ_TYPE = 'vehStatusReqType'
 
 
 class OtaRvmVehicleStatusReq(ApplicationData):
+    __slots__ = ('veh_status_req_type',)
+    asn_type = 'OTARVMVehicleStatusReq'
+
     def __init__(self):
-        super().__init__('OTARVMVehicleStatusReq')
+        super().__init__()
         self.veh_status_req_type: OtaRvmVehicleStatusReq | None = None
 
     def get_data(self) -> dict:
@@ -43,8 +46,11 @@ class OtaRvmVehicleStatusReq(ApplicationData):
 
 
 class RvsWgs84Point(Asn1Type):
+    __slots__ = ('latitude', 'longitude', 'altitude')
+    asn_type = 'RvsWGS84Point'
+
     def __init__(self):
-        super().__init__('RvsWGS84Point')
+        super().__init__()
         self.latitude: int | None = None
         self.longitude: int | None = None
         self.altitude: int | None = None
@@ -63,8 +69,11 @@ class RvsWgs84Point(Asn1Type):
 
 
 class RvsWayPoint(Asn1Type):
+    __slots__ = ('position', 'heading', 'speed', 'hdop', 'satellites')
+    asn_type = 'RvsWayPoint'
+
     def __init__(self):
-        super().__init__('RvsWayPoint')
+        super().__init__()
         self.position: RvsWgs84Point | None = None
         self.heading: int | None = None
         self.speed: int | None = None
@@ -93,8 +102,11 @@ class RvsWayPoint(Asn1Type):
 
 
 class RvsPosition(Asn1Type):
+    __slots__ = ('way_point', 'timestamp_4_short', 'gps_status')
+    asn_type = 'RvsPosition'
+
     def __init__(self):
-        super().__init__('RvsPosition')
+        super().__init__()
         self.way_point: RvsWayPoint | None = None
         self.timestamp_4_short: Timestamp4Short | None = None
         self.gps_status:  int | None = None
@@ -118,8 +130,11 @@ class RvsPosition(Asn1Type):
 
 
 class Timestamp4Short(Asn1Type):
+    __slots__ = ('seconds',)
+    asn_type = 'Timestamp4Short'
+
     def __init__(self):
-        super().__init__('Timestamp4Short')
+        super().__init__()
         self.seconds: int | None = None
         
     def get_data(self) -> dict:
@@ -132,8 +147,21 @@ class Timestamp4Short(Asn1Type):
         
 
 class RvsBasicStatus25857(Asn1Type):
+    __slots__ = (
+        'driver_door', 'passenger_door', 'rear_left_door', 'rear_right_door', 'boot_status', 'bonnet_status',
+        'lock_status', 'driver_window', 'passenger_window', 'rear_left_window', 'rear_right_window', 'sun_roof_status',
+        'front_right_tyre_pressure', 'front_left_tyre_pressure', 'rear_right_tyre_pressure', 'rear_left_tyre_pressure',
+        'wheel_tyre_monitor_status', 'side_light_status', 'dipped_beam_status', 'main_beam_status',
+        'vehicle_alarm_status', 'engine_status', 'power_mode', 'last_key_seen', 'current_journey_distance',
+        'current_journey_id', 'interior_temperature', 'exterior_temperature', 'fuel_level_prc', 'fuel_range',
+        'remote_climate_status', 'front_left_seat_heat_level', 'front_right_seat_heat_level', 'can_bus_active',
+        'time_of_last_canbus_activity', 'clstr_dspd_fuel_lvl_sgmt', 'mileage', 'battery_voltage', 'hand_brake',
+        'veh_elec_rng_dsp', 'fuel_range_elec', 'rmt_htd_rr_wnd_st', 'extended_data1', 'extended_data2'
+    )
+    asn_type = 'RvsBasicStatus25857'
+
     def __init__(self):
-        super().__init__('RvsBasicStatus25857')
+        super().__init__()
         self.driver_door: bool | None = None  # BOOLEAN
         self.passenger_door: bool | None = None  # BOOLEAN
         self.rear_left_door: bool | None = None  # BOOLEAN
@@ -279,8 +307,11 @@ class RvsBasicStatus25857(Asn1Type):
 
 
 class RvsExtStatus(Asn1Type):
+    __slots__ = ('vehicle_alerts',)
+    asn_type = 'RvsExtStatus'
+
     def __init__(self):
-        super().__init__('RvsExtStatus')
+        super().__init__()
         self.vehicle_alerts: [VehicleAlertInfo] = []
 
     def get_data(self) -> dict:
@@ -300,8 +331,11 @@ class RvsExtStatus(Asn1Type):
 
 
 class VehicleAlertInfo(Asn1Type):
+    __slots__ = ('id', 'value')
+    asn_type = 'VehicleAlertInfo'
+
     def __init__(self):
-        super().__init__('VehicleAlertInfo')
+        super().__init__()
         self.id: int | None = None
         self.value: int | None = None
 
@@ -317,8 +351,11 @@ class VehicleAlertInfo(Asn1Type):
 
 
 class OtaRvcReq(ApplicationData):
+    __slots__ = ('rvc_req_type', 'rvc_params')
+    asn_type = 'OTARVCReq'
+
     def __init__(self):
-        super().__init__('OTARVCReq')
+        super().__init__()
         self.rvc_req_type: str | None = None
         self.rvc_params: [RvcReqParam] = []
 
@@ -344,8 +381,11 @@ class OtaRvcReq(ApplicationData):
 
 
 class RvcReqParam(Asn1Type):
+    __slots__ = ('param_id', 'param_value')
+    asn_type = 'RvcReqParam'
+
     def __init__(self):
-        super().__init__('RvcReqParam')
+        super().__init__()
         self.param_id: int | None = None
         self.param_value: str | None = None
 
@@ -361,8 +401,11 @@ class RvcReqParam(Asn1Type):
 
 
 class OtaRvmVehicleStatusResp25857(ApplicationData):
+    __slots__ = ('status_time', 'gps_position', 'basic_vehicle_status', 'extended_vehicle_status')
+    asn_type = 'OTARVMVehicleStatusResp25857'
+
     def __init__(self):
-        super().__init__('OTARVMVehicleStatusResp25857')
+        super().__init__()
         self.status_time: int | None = None
         self.gps_position: RvsPosition | None = None
         self.basic_vehicle_status: RvsBasicStatus25857 | None = None
@@ -418,8 +461,11 @@ class OtaRvmVehicleStatusResp25857(ApplicationData):
 
 
 class OtaRvcStatus25857(ApplicationData):
+    __slots__ = ('rvcReqType', 'rvcReqSts', 'failureType', 'gpsPosition', 'basicVehicleStatus')
+    asn_type = 'OTARVCStatus25857'
+
     def __init__(self):
-        super().__init__('OTARVCStatus25857')
+        super().__init__()
         self.rvcReqType: bytes | None = None  # OCTET STRING(SIZE(1)),
         self.rvcReqSts: bytes | None = None  # OCTET STRING(SIZE(1)),
         self.failureType: int | None = None  # INTEGER(0..255) OPTIONAL,
@@ -445,3 +491,14 @@ class OtaRvcStatus25857(ApplicationData):
         self.basicVehicleStatus.init_from_dict(data.get(FIELD_BASIC_VEHICLE_STATUS))
         if FIELD_FAILURE_TYPE in data:
             self.failureType = data.get(FIELD_FAILURE_TYPE)
+
+
+VEHICLE_STATUS_SUMMARY_PROJECTION = Projection('OTARVMVehicleStatusResp25857', {
+    'status_time': FIELD_STATUS_TIME,
+    'soc': 'basicVehicleStatus.extendedData1',
+    'electric_range': 'basicVehicleStatus.fuelRangeElec',
+    'mileage': 'basicVehicleStatus.mileage',
+    'latitude': 'gpsPosition.wayPoint.position.latitude',
+    'longitude': 'gpsPosition.wayPoint.position.longitude',
+    'charging': 'basicVehicleStatus.extendedData2'
+})
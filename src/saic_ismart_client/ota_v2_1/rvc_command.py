@@ -0,0 +1,110 @@
+import threading
+from typing import NamedTuple
+
+from saic_ismart_client.ota_v2_1.Message import MessageCoderV21
+from saic_ismart_client.ota_v2_1.data_model import FIELD_PARAM_ID, FIELD_PARAM_VALUE, FIELD_RVC_PARAMS, \
+    FIELD_RVC_REQ_TYPE, OtaRvcReq
+
+NO_PARAMS_END = (255, b'\x00')
+
+
+class RvcCommand(NamedTuple):
+    rvc_req_type: bytes
+    # tuple of (param_id, param_value)
+    rvc_params: tuple
+    has_app_data: bool
+    application_data_bytes: bytes
+
+    def get_data(self) -> dict:
+        return {
+            FIELD_RVC_REQ_TYPE: self.rvc_req_type,
+            FIELD_RVC_PARAMS: [{FIELD_PARAM_ID: param_id, FIELD_PARAM_VALUE: param_value}
+                               for param_id, param_value in self.rvc_params]
+        }
+
+
+def to_param_value(value: bool | int) -> bytes:
+    return int(value).to_bytes(1, 'big')
+
+
+class RvcCommandCatalog:
+    def __init__(self, message_coder: MessageCoderV21):
+        self.message_coder = message_coder
+        self.__lock = threading.Lock()
+        self.__commands = {}
+
+    def create_command(self, rvc_req_type: bytes, rvc_params: tuple, has_app_data: bool) -> RvcCommand:
+        data = {
+            FIELD_RVC_REQ_TYPE: rvc_req_type,
+            FIELD_RVC_PARAMS: [{FIELD_PARAM_ID: param_id, FIELD_PARAM_VALUE: param_value}
+                               for param_id, param_value in rvc_params]
+        }
+        application_data_bytes = self.message_coder.asn1_tool_uper.encode(OtaRvcReq.asn_type, data)
+        return RvcCommand(rvc_req_type, rvc_params, has_app_data, application_data_bytes)
+
+    def get_command(self, rvc_req_type: bytes, rvc_params: tuple, has_app_data: bool) -> RvcCommand:
+        # every distinct command is encoded only once
+        key = (rvc_req_type, rvc_params, has_app_data)
+        command = self.__commands.get(key)
+        if command is None:
+            command = self.create_command(rvc_req_type, rvc_params, has_app_data)
+            with self.__lock:
+                command = self.__commands.setdefault(key, command)
+        return command
+
+    def __len__(self) -> int:
+        return len(self.__commands)
+
+    def unknown_engine_control(self) -> RvcCommand:
+        return self.get_command(b'\x11', ((16, b'\x01'),), True)
+
+    def lock_vehicle(self) -> RvcCommand:
+        return self.get_command(b'\x01', (), False)
+
+    def unlock_vehicle(self) -> RvcCommand:
+        return self.get_command(b'\x02', ((4, b'\x00'), (5, b'\x00'), (6, b'\x00'), (7, b'\x03'), NO_PARAMS_END), False)
+
+    def control_rear_window_heat(self, enable: bool) -> RvcCommand:
+        return self.get_command(b'\x20', ((23, to_param_value(enable)), NO_PARAMS_END), False)
+
+    def control_heated_seats(self, driver_side: bool, passenger_side: bool) -> RvcCommand:
+        return self.get_command(b'\x05', ((17, to_param_value(driver_side)), (18, to_param_value(passenger_side)),
+                                          NO_PARAMS_END), True)
+
+    def stop_front_defrost(self) -> RvcCommand:
+        return self.get_command(b'\x06', ((19, b'\x00'), (20, b'\x08'), (22, b'\x00'), NO_PARAMS_END), True)
+
+    def control_climate(self, fan_speed: int, ac_on: bool | None, temperature_idx: int) -> RvcCommand:
+        if fan_speed < 0 or fan_speed > 5:
+            raise Exception('fan_speed must be between 0 and 5')
+
+        if temperature_idx < 0 or temperature_idx > 14:
+            raise Exception('temperature_idx must be between 0 and 14')
+
+        if fan_speed == 0:
+            ac_on = False
+            temperature_idx = 8
+
+        rvc_params = [(19, to_param_value(fan_speed))]
+        if fan_speed > 0 or temperature_idx == 0:
+            rvc_params.append((20, to_param_value(temperature_idx)))
+        if ac_on is not None:
+            rvc_params.append((22, to_param_value(ac_on)))
+        rvc_params.append(NO_PARAMS_END)
+        return self.get_command(b'\x06', tuple(rvc_params), True)
+
+    def close_driver_window(self) -> RvcCommand:
+        return self.get_command(b'\x03', ((9, b'\x01'), (10, b'\x00'), (11, b'\x00'), (12, b'\x00'), (13, b'\x00'),
+                                          NO_PARAMS_END), False)
+
+    def control_sunroof(self, should_open: bool) -> RvcCommand:
+        return self.get_command(b'\x03', ((8, b'\x01'), (9, b'\x00'), (10, b'\x00'), (11, b'\x00'), (12, b'\x00'),
+                                          NO_PARAMS_END, (13, b'\x03' if should_open else b'\x00')), True)
+
+    def open_vehicle_lock(self, lock_id: int) -> RvcCommand:
+        return self.get_command(b'\x02', ((4, b'\x00'), (5, b'\x00'), (6, b'\x00'), NO_PARAMS_END,
+                                          (7, to_param_value(lock_id))), False)
+
+    def find_my_car(self, with_horn: bool, with_lights: bool) -> RvcCommand:
+        return self.get_command(b'\x00', ((1, b'\x01'), (2, to_param_value(with_horn)),
+                                          (3, to_param_value(with_lights)), NO_PARAMS_END), True)
@@ -1,7 +1,12 @@
-from saic_ismart_client.common_model import ApplicationData, MessageV2, MessageCoderV2, MessageBodyV2
+from saic_ismart_client.common_model import APPLICATION_DATA_REGISTRY, ApplicationData, MessageV2, MessageCoderV2, \
+    MessageBodyV2, MessageDirection, ProtocolVersion
+from saic_ismart_client.ota_v3_0.data_model import OtaChrgCtrlReq, OtaChrgCtrlStsResp, OtaChrgHeatReq, \
+    OtaChrgHeatResp, OtaChrgMangDataResp, OtaChrgRsvanReq, OtaChrgRsvanResp, OtaChrgSetngReq, OtaChrgSetngResp
 
 
 class MessageBodyV30(MessageBodyV2):
+    __slots__ = ()
+
     def __init__(self):
         super().__init__()
 
@@ -46,6 +51,8 @@ class MessageBodyV30(MessageBodyV2):
 
 
 class MessageV30(MessageV2):
+    __slots__ = ()
+
     def __init__(self, body: MessageBodyV30, application_data: ApplicationData = None,
                  reserved: bytes = None):
         super().__init__(body, application_data, reserved)
@@ -55,11 +62,18 @@ class MessageCoderV30(MessageCoderV2):
     def __init__(self):
         super().__init__('ASN.1_schema/v3_0/')
 
-    def encode_request(self, message: MessageV30) -> str:
-        return super().encode_request(message)
+    def encode_request(self, message: MessageV30, application_data_bytes: bytes = None) -> str:
+        return super().encode_request(message, application_data_bytes)
+
+    def encode_request_bytes(self, message: MessageV30, application_data_bytes: bytes = None) -> bytearray:
+        return super().encode_request_bytes(message, application_data_bytes)
 
-    def decode_response(self, message: str, decoded_message: MessageV30) -> None:
-        super().decode_response(message, decoded_message)
+    def decode_response(self, message: str, decoded_message: MessageV30, lazy: bool = False) -> None:
+        super().decode_response(message, decoded_message, lazy)
+
+    def decode_response_bytes(self, message: bytes | memoryview, decoded_message: MessageV30,
+                              lazy: bool = False) -> None:
+        super().decode_response_bytes(message, decoded_message, lazy)
 
     def initialize_message(self, uid: str, token: str, vin: str, application_id: str,
                            application_data_protocol_version: int, message_id: int, message: MessageV30) -> None:
@@ -68,3 +82,24 @@ class MessageCoderV30(MessageCoderV2):
 
     def get_protocol_version(self) -> int:
         return 48
+
+    def get_protocol(self) -> ProtocolVersion:
+        return ProtocolVersion.V3_0
+
+    def create_message(self, application_data: ApplicationData | None = None) -> MessageV30:
+        return MessageV30(MessageBodyV30(), application_data)
+
+
+# the charging management application tells its messages apart by the message ID,
+# a response uses either the message ID of its request or the next one
+for request_message_id, request_type, response_type in [
+    (1, OtaChrgRsvanReq, OtaChrgRsvanResp),
+    (3, OtaChrgSetngReq, OtaChrgSetngResp),
+    (5, None, OtaChrgMangDataResp),
+    (7, OtaChrgCtrlReq, OtaChrgCtrlStsResp),
+    (9, OtaChrgHeatReq, OtaChrgHeatResp),
+]:
+    APPLICATION_DATA_REGISTRY.register(ProtocolVersion.V3_0, '516', 768, request_type, response_type,
+                                       message_id=request_message_id)
+    APPLICATION_DATA_REGISTRY.register_type(ProtocolVersion.V3_0, '516', 768, MessageDirection.RESPONSE, response_type,
+                                            message_id=request_message_id + 1)
@@ -1,9 +1,23 @@
-from saic_ismart_client.common_model import ApplicationData, Asn1Type, TargetBatteryCode
+from saic_ismart_client.common_model import ApplicationData, Asn1Type, Projection, TargetBatteryCode
 
 
 class OtaChrgMangDataResp(ApplicationData):
+    __slots__ = (
+        'bmsReserCtrlDspCmd', 'bmsReserStHourDspCmd', 'bmsReserStMintueDspCmd', 'bmsReserSpHourDspCmd',
+        'bmsReserSpMintueDspCmd', 'bmsOnBdChrgTrgtSOCDspCmd', 'bms_estd_elec_rng', 'bmsAltngChrgCrntDspCmd',
+        'bmsChrgCtrlDspCmd', 'chrgngRmnngTime', 'chrgngRmnngTimeV', 'bmsChrgOtptCrntReq', 'bmsChrgOtptCrntReqV',
+        'bmsPackCrnt', 'bmsPackCrntV', 'bmsPackVol', 'bmsPackSOCDsp', 'bmsChrgSts', 'bmsChrgSpRsn',
+        'clstrElecRngToEPT', 'bmsPTCHeatReqDspCmd', 'bmsPTCHeatResp', 'ccuEleccLckCtrlDspCmd', 'bmsPTCHeatSpRsn',
+        'bmsDsChrgSpRsn', 'disChrgngRmnngTime', 'disChrgngRmnngTimeV', 'imcuVehElecRng', 'imcuVehElecRngV',
+        'imcuChrgngEstdElecRng', 'imcuChrgngEstdElecRngV', 'imcuDschrgngEstdElecRng', 'imcuDschrgngEstdElecRngV',
+        'chrgngSpdngTime', 'chrgngSpdngTimeV', 'chrgngAddedElecRng', 'chrgngAddedElecRngV',
+        'onBdChrgrAltrCrntInptCrnt', 'onBdChrgrAltrCrntInptVol', 'ccuOnbdChrgrPlugOn', 'ccuOffBdChrgrPlugOn',
+        'chrgngDoorPosSts', 'chrgngDoorOpenCnd', 'chargeStatus', 'bmsAdpPubChrgSttnDspCmd'
+    )
+    asn_type = 'OTAChrgMangDataResp'
+
     def __init__(self):
-        super().__init__('OTAChrgMangDataResp')
+        super().__init__()
         self.bmsReserCtrlDspCmd: int | None = None  # INTEGER(0..255),
         self.bmsReserStHourDspCmd: int | None = None  # INTEGER(0..255),
         self.bmsReserStMintueDspCmd: int | None = None  # INTEGER(0..255),
@@ -166,8 +180,18 @@ class OtaChrgMangDataResp(ApplicationData):
 
 
 class RvsChargingStatus(Asn1Type):
+    __slots__ = (
+        'real_time_power', 'charging_gun_state', 'fuel_Range_elec', 'charging_type', 'start_time', 'end_time',
+        'charging_pile_id', 'charging_pile_supplier', 'working_current', 'working_voltage',
+        'mileage_since_last_charge', 'power_usage_since_last_charge', 'mileage_of_day', 'power_usage_of_day',
+        'static_energy_consumption', 'charging_electricity_phase', 'charging_duration', 'last_charge_ending_power',
+        'total_battery_capacity', 'fota_lowest_voltage', 'mileage', 'extended_data1', 'extended_data2',
+        'extended_data3', 'extended_data4'
+    )
+    asn_type = 'RvsChargingStatus'
+
     def __init__(self):
-        super().__init__('RvsChargingStatus')
+        super().__init__()
         self.real_time_power: int | None = None  # INTEGER(0..65535),
         self.charging_gun_state: bool | None = None  # BOOLEAN,
         self.fuel_Range_elec: int | None = None  # INTEGER(0..65535),
@@ -253,8 +277,11 @@ class RvsChargingStatus(Asn1Type):
 
 
 class OtaChrgCtrlReq(ApplicationData):
+    __slots__ = ('chrgCtrlReq', 'tboxV2XReq', 'tboxEleccLckCtrlReq')
+    asn_type = 'OTAChrgCtrlReq'
+
     def __init__(self):
-        super().__init__('OTAChrgCtrlReq')
+        super().__init__()
         self.chrgCtrlReq: int | None = None
         self.tboxV2XReq: int | None = None
         self.tboxEleccLckCtrlReq: int | None = None
@@ -274,8 +301,14 @@ class OtaChrgCtrlReq(ApplicationData):
 
 
 class OtaChrgCtrlStsResp(ApplicationData):
+    __slots__ = (
+        'chrgCtrlDspCmd', 'chrgCtrlResp', 'bmsDsChrgCtrlDspCmd', 'bmsDsChrgCtrlResp', 'ccuEleccLckCtrlDspCmd',
+        'ccuEleccLckCtrlResp', 'rvcReqSts'
+    )
+    asn_type = 'OTAChrgCtrlStsResp'
+
     def __init__(self):
-        super().__init__('OTAChrgCtrlStsResp')
+        super().__init__()
         self.chrgCtrlDspCmd: int | None = None  # INTEGER(0..255)
         self.chrgCtrlResp: int | None = None  # INTEGER(0..255)
         self.bmsDsChrgCtrlDspCmd: int | None = None  # INTEGER(0..255) OPTIONAL
@@ -308,8 +341,13 @@ class OtaChrgCtrlStsResp(ApplicationData):
 
 
 class OtaChrgRsvanReq(ApplicationData):
+    __slots__ = (
+        'rsvanStHour', 'rsvanStMintu', 'rsvanSpHour', 'rsvanSpMintu', 'tboxReserCtrlReq', 'tboxAdpPubChrgSttnReq'
+    )
+    asn_type = 'OTAChrgRsvanReq'
+
     def __init__(self):
-        super().__init__('OTAChrgRsvanReq')
+        super().__init__()
         self.rsvanStHour: int | None = None  # INTEGER(0..255)
         self.rsvanStMintu: int | None = None  # INTEGER(0..255)
         self.rsvanSpHour: int | None = None  # INTEGER(0..255)
@@ -338,8 +376,14 @@ class OtaChrgRsvanReq(ApplicationData):
 
 
 class OtaChrgRsvanResp(ApplicationData):
+    __slots__ = (
+        'rvcReqSts', 'bmsReserCtrlDspCmd', 'bmsReserStHourDspCmd', 'bmsReserStMintueDspCmd', 'bmsReserSpHourDspCmd',
+        'bmsReserSpMintueDspCmd', 'bmsAdpPubChrgSttnDspCmd', 'bmsReserChrCtrlResp'
+    )
+    asn_type = 'OTAChrgRsvanResp'
+
     def __init__(self):
-        super().__init__('OTAChrgRsvanResp')
+        super().__init__()
         self.rvcReqSts: bytes | None = None  # OCTET STRING(SIZE(1))
         self.bmsReserCtrlDspCmd: int | None = None  # INTEGER(0..255)
         self.bmsReserStHourDspCmd: int | None = None  # INTEGER(0..255)
@@ -374,8 +418,11 @@ class OtaChrgRsvanResp(ApplicationData):
 
 
 class OtaChrgSetngReq(ApplicationData):
+    __slots__ = ('onBdChrgTrgtSOCReq', 'altngChrgCrntReq', 'tboxV2XSpSOCReq')
+    asn_type = 'OTAChrgSetngReq'
+
     def __init__(self):
-        super().__init__('OTAChrgSetngReq')
+        super().__init__()
         self.onBdChrgTrgtSOCReq: int | None = None  # INTEGER(0..255)
         self.altngChrgCrntReq: int | None = None  # INTEGER(0..255)
         self.tboxV2XSpSOCReq: int | None = None  # INTEGER(0..255)
@@ -395,8 +442,14 @@ class OtaChrgSetngReq(ApplicationData):
 
 
 class OtaChrgSetngResp(ApplicationData):
+    __slots__ = (
+        'rvcReqSts', 'bmsOnBdChrgTrgtSOCDspCmd', 'bmsChrgTrgtSOCResp', 'bmsEstdElecRng', 'bmsAltngChrgCrntDspCmd',
+        'bmsPackCrnt', 'bmsAltngChrgCrntResp', 'imcuDschrgTrgtSOCDspCmd', 'imcuDschrgTrgtSOCResp'
+    )
+    asn_type = 'OTAChrgSetngResp'
+
     def __init__(self):
-        super().__init__('OTAChrgSetngResp')
+        super().__init__()
         self.rvcReqSts: bytes | None = None  # OCTET STRING(SIZE(1))
         self.bmsOnBdChrgTrgtSOCDspCmd: int | None = None  # INTEGER(0..255)
         self.bmsChrgTrgtSOCResp: int | None = None  # INTEGER(0..255)
@@ -434,8 +487,11 @@ class OtaChrgSetngResp(ApplicationData):
 
 
 class OtaChrgHeatReq(ApplicationData):
+    __slots__ = ('ptcHeatReq',)
+    asn_type = 'OTAChrgHeatReq'
+
     def __init__(self):
-        super().__init__('OTAChrgHeatReq')
+        super().__init__()
         self.ptcHeatReq: int | None = None  # INTEGER(0..255)
 
     def get_data(self) -> dict:
@@ -449,8 +505,11 @@ class OtaChrgHeatReq(ApplicationData):
 
 
 class OtaChrgHeatResp(ApplicationData):
+    __slots__ = ('ptcHeatReqDspCmd', 'ptcHeatResp', 'rvcReqSts')
+    asn_type = 'OTAChrgHeatResp'
+
     def __init__(self):
-        super().__init__('OTAChrgHeatResp')
+        super().__init__()
         self.ptcHeatReqDspCmd: int | None = None  # INTEGER(0..255)
         self.ptcHeatResp: int | None = None  # INTEGER(0..255)
         self.rvcReqSts: bytes | None = None  # OCTET STRING(SIZE(1))
@@ -467,3 +526,12 @@ class OtaChrgHeatResp(ApplicationData):
         self.ptcHeatReqDspCmd = data.get('ptcHeatReqDspCmd')
         self.ptcHeatResp = data.get('ptcHeatResp')
         self.rvcReqSts = data.get('rvcReqSts')
+
+
+CHARGING_STATUS_SUMMARY_PROJECTION = Projection('OTAChrgMangDataResp', {
+    'soc': 'bmsPackSOCDsp',
+    'electric_range': 'bmsEstdElecRng',
+    'mileage': 'chargeStatus.mileage',
+    'charging_status': 'bmsChrgSts',
+    'charging_gun_state': 'chargeStatus.chargingGunState'
+})
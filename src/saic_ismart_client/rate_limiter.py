@@ -0,0 +1,89 @@
+import threading
+import time
+from typing import Callable
+
+ENDPOINT_FAMILY_OTA_MP = 'ota.mp'
+ENDPOINT_FAMILY_OTA_MPV21 = 'ota.mpv21'
+ENDPOINT_FAMILY_OTA_MPV30 = 'ota.mpv30'
+ENDPOINT_FAMILY_REST_V2 = 'rest_v2'
+PRUNE_INTERVAL = 60.0
+
+
+def get_endpoint_family(endpoint: str) -> str:
+    # '/TAP.Web/ota.mpv21' -> 'ota.mpv21'
+    return endpoint.rsplit('/', 1)[-1]
+
+
+class RateLimit:
+    def __init__(self, rate: float, burst: int = 1):
+        # rate in requests per second, burst requests may be sent at once after a pause
+        if rate <= 0:
+            raise ValueError('rate must be positive')
+        if burst < 1:
+            raise ValueError('burst must be at least 1')
+        self.rate = rate
+        self.burst = burst
+
+    @property
+    def interval(self) -> float:
+        return 1 / self.rate
+
+    @property
+    def burst_tolerance(self) -> float:
+        return (self.burst - 1) * self.interval
+
+
+class RateLimiter:
+    # token buckets per account, per VIN and per endpoint family of an account, share it between API instances
+    def __init__(
+            self,
+            per_account: RateLimit = None,
+            per_vin: RateLimit = None,
+            per_endpoint_family: dict[str, RateLimit] = None,
+            clock: Callable[[], float] = time.monotonic
+    ):
+        self.per_account = per_account
+        self.per_vin = per_vin
+        self.per_endpoint_family = per_endpoint_family if per_endpoint_family is not None else {}
+        self.clock = clock
+        self.__lock = threading.Lock()
+        # theoretical arrival time of the next request per bucket
+        self.__arrival_times = {}
+        self.__next_prune = clock() + PRUNE_INTERVAL
+
+    def __len__(self) -> int:
+        with self.__lock:
+            return len(self.__arrival_times)
+
+    def reserve(self, account: str, vin: str | None, endpoint_family: str, max_wait: float = None) -> float | None:
+        # reserves a token in every matching bucket and returns the time to wait before sending. Calls are served in
+        # the order of their reservations, so waiting calls are queued fairly and never dropped. Nothing is reserved
+        # and None is returned if the wait would be longer than max_wait.
+        buckets = []
+        if self.per_account is not None:
+            buckets.append((('account', account), self.per_account))
+        if self.per_vin is not None and vin:
+            buckets.append((('vin', account, vin), self.per_vin))
+        endpoint_family_limit = self.per_endpoint_family.get(endpoint_family)
+        if endpoint_family_limit is not None:
+            buckets.append((('endpoint_family', account, endpoint_family), endpoint_family_limit))
+        if not buckets:
+            return 0.0
+        with self.__lock:
+            now = self.clock()
+            start = now
+            for key, rate_limit in buckets:
+                start = max(start, self.__arrival_times.get(key, now) - rate_limit.burst_tolerance)
+            if max_wait is not None and start - now > max_wait:
+                return None
+            for key, rate_limit in buckets:
+                self.__arrival_times[key] = max(self.__arrival_times.get(key, now), start) + rate_limit.interval
+            if now >= self.__next_prune:
+                self.__prune(now)
+        return start - now
+
+    def __prune(self, now: float) -> None:
+        # buckets whose arrival time has passed are full again, just like buckets that have never been used
+        self.__arrival_times = {key: arrival_time for key, arrival_time in self.__arrival_times.items()
+                                if arrival_time > now}
+        self.__next_prune = now + PRUNE_INTERVAL
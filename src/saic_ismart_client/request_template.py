@@ -0,0 +1,66 @@
+import threading
+from typing import Callable
+
+from saic_ismart_client.common_model import AbstractMessage, AbstractMessageCoder, DataEncodingType, \
+    FIELD_EVENT_CREATION_TIME, FIELD_EVENT_ID, FIELD_TOKEN
+
+
+class RequestTemplate:
+    def __init__(self, message_coder: AbstractMessageCoder, message: AbstractMessage):
+        self.message_coder = message_coder
+        self.message = message
+        self.application_data_bytes = message_coder.get_application_data_bytes(message.application_data,
+                                                                               message_coder.asn1_tool_uper)
+        message.body.application_data_encoding = DataEncodingType.PER_UNALIGNED.value
+        message.body.application_data_length = len(self.application_data_bytes)
+        self.body_data = message.body.get_data()
+        if message.application_data is not None:
+            self.application_data = message.application_data.get_data()
+        else:
+            self.application_data = None
+
+    def create_request(self, token: str, event_id: str = None) -> tuple[dict, str]:
+        # only the volatile fields of the body are encoded again, the application data bytes are reused
+        body_data = dict(self.body_data)
+        body_data[FIELD_TOKEN] = token
+        body_data[FIELD_EVENT_CREATION_TIME] = self.message_coder.get_current_time()
+        body_data[FIELD_EVENT_ID] = event_id if event_id is not None else 0
+        message_body_bytes = self.message_coder.dispatcher_body_codec.encode(self.message.body.asn_type, body_data)
+        message_bytes = self.message_coder.assemble_request_bytes(self.message, message_body_bytes,
+                                                                  self.application_data_bytes)
+        request_data = {
+            'applicationData': self.application_data,
+            'body': body_data,
+            'header': self.message.header.get_data()
+        }
+        return request_data, self.message_coder.to_hex_frame(message_bytes)
+
+
+class RequestTemplateCache:
+    def __init__(self):
+        self.__lock = threading.Lock()
+        self.__templates = {}
+        self.__generation = 0
+
+    def get_template(self, vin: str, application_id: str, message_id: int,
+                     create_template: Callable[[], RequestTemplate]) -> RequestTemplate:
+        key = (vin, application_id, message_id)
+        with self.__lock:
+            template = self.__templates.get(key)
+            generation = self.__generation
+        if template is None:
+            template = create_template()
+            with self.__lock:
+                # a template created before an invalidation is used once but not stored
+                if generation == self.__generation:
+                    template = self.__templates.setdefault(key, template)
+        return template
+
+    def invalidate(self) -> None:
+        with self.__lock:
+            self.__templates.clear()
+            self.__generation += 1
+
+    def __len__(self) -> int:
+        with self.__lock:
+            return len(self.__templates)
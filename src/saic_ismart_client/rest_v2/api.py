@@ -3,13 +3,27 @@ from datetime import datetime, timezone
 import requests
 
 from saic_ismart_client.exceptions import SaicApiException
+from saic_ismart_client.http_session import HttpSessionConfig
 from saic_ismart_client.rest_v2.model import TimeZoneResponse
 
 
 class SaicRestV2Api():
 
-    def __init__(self, base_uri: str):
+    def __init__(self, base_uri: str, http_session_config: HttpSessionConfig = None):
         self.__base_uri = base_uri
+        if http_session_config is None:
+            http_session_config = HttpSessionConfig()
+        self.__http_session_config = http_session_config
+        self.__session = http_session_config.create_session()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self) -> None:
+        self.__session.close()
 
     def get_user_timezone(self, token: str, uid: str):
         response = TimeZoneResponse()
@@ -19,7 +33,8 @@ class SaicRestV2Api():
     def __execute_get(self, endpoint: str, token: str, uid=None, response_holder=None):
         headers = self.__get_headers(token, uid)
         try:
-            response = requests.get(url=f'{self.__base_uri}/{endpoint}', headers=headers)
+            response = self.__session.get(url=f'{self.__base_uri}/{endpoint}', headers=headers,
+                                          timeout=self.__http_session_config.timeout)
             if response_holder is None:
                 return response.content.decode()
             else:
@@ -0,0 +1,84 @@
+import math
+import threading
+
+
+class LatencyHistogram:
+    def __init__(self, bucket_width: float = 0.5, max_latency: float = 180.0):
+        if bucket_width <= 0 or max_latency <= 0:
+            raise ValueError('bucket_width and max_latency must be positive')
+        self.bucket_width = bucket_width
+        self.max_latency = max_latency
+        # the last bucket collects all latencies above max_latency
+        self.buckets = [0] * (math.ceil(max_latency / bucket_width) + 1)
+        self.count = 0
+        self.max_observed = 0.0
+
+    def add(self, latency: float) -> None:
+        index = min(int(max(latency, 0.0) / self.bucket_width), len(self.buckets) - 1)
+        self.buckets[index] += 1
+        self.count += 1
+        self.max_observed = max(self.max_observed, latency)
+
+    def percentile(self, percentile: float) -> float | None:
+        # upper bound of the bucket that contains the percentile
+        if self.count == 0:
+            return None
+        rank = max(math.ceil(percentile * self.count), 1)
+        seen = 0
+        for index, bucket in enumerate(self.buckets):
+            seen += bucket
+            if seen >= rank:
+                if index == len(self.buckets) - 1:
+                    return self.max_observed
+                return min((index + 1) * self.bucket_width, self.max_observed)
+        return self.max_observed
+
+
+class AdaptiveRetryPolicy:
+    def __init__(
+            self,
+            percentile: float = 0.9,
+            min_samples: int = 3,
+            min_delay: float = 1.0,
+            probe_ratio: float = 0.8,
+            bucket_width: float = 0.5,
+            max_latency: float = 180.0
+    ):
+        if not 0 < percentile <= 1 or not 0 < probe_ratio <= 1:
+            raise ValueError('percentile and probe_ratio must be in (0, 1]')
+        if min_samples < 1:
+            raise ValueError('min_samples must be at least 1')
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.min_delay = min_delay
+        # the first retry is sent a bit before the learned latency, so that faster wake-ups are learned as well
+        self.probe_ratio = probe_ratio
+        self.bucket_width = bucket_width
+        self.max_latency = max_latency
+        self.__lock = threading.Lock()
+        self.__histograms = {}
+
+    def record(self, vin: str | None, application_id: str, latency: float) -> None:
+        with self.__lock:
+            # the histogram of all vehicles is used for vehicles without enough samples of their own
+            for key in {(vin, application_id), (None, application_id)}:
+                histogram = self.__histograms.get(key)
+                if histogram is None:
+                    histogram = LatencyHistogram(self.bucket_width, self.max_latency)
+                    self.__histograms[key] = histogram
+                histogram.add(latency)
+
+    def get_delay(self, vin: str | None, application_id: str, elapsed: float) -> float | None:
+        # returns None if nothing has been learned yet, the caller falls back to its fixed delay
+        with self.__lock:
+            histogram = self.__histograms.get((vin, application_id))
+            if histogram is None or histogram.count < self.min_samples:
+                histogram = self.__histograms.get((None, application_id))
+            if histogram is None or histogram.count < self.min_samples:
+                return None
+            target = histogram.percentile(self.percentile)
+            deadlines = (target * self.probe_ratio, target, histogram.max_observed)
+        for deadline in deadlines:
+            if deadline - elapsed >= self.min_delay:
+                return deadline - elapsed
+        return None
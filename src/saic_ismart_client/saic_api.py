@@ -3,28 +3,46 @@ import functools
 import hashlib
 import logging
 import os
+import threading
 import time
 import urllib.parse
-from typing import cast
+from typing import Callable, cast
 
 import requests as requests
 
-from saic_ismart_client.common_model import AbstractMessage, AbstractMessageBody, Header, MessageBodyV2, MessageV2, \
-    ScheduledChargingMode, TargetBatteryCode, ChargeCurrentLimitCode
-from saic_ismart_client.exceptions import SaicApiException
+from saic_ismart_client.circuit_breaker import CircuitBreaker, CircuitBreakerRegistry
+from saic_ismart_client.command_scheduler import CommandScheduler, PendingResult
+from saic_ismart_client.common_model import AbstractMessage, AbstractMessageBody, AbstractMessageCoder, \
+    ApplicationData, Header, MessageBodyV2, MessageV2, ScheduledChargingMode, TargetBatteryCode, ChargeCurrentLimitCode
+from saic_ismart_client.deadline import Deadline, get_current_deadline
+from saic_ismart_client.exceptions import SaicApiCancelled, SaicApiDeadlineExceeded, SaicApiException
+from saic_ismart_client.http_session import HttpSessionConfig
 from saic_ismart_client.ota_v1_1.Message import MessageCoderV11
 from saic_ismart_client.ota_v1_1.data_model import AbortSendMessageReq, AlarmSwitch, AlarmSwitchReq, Message, \
     MessageBodyV11, MessageListReq, MessageListResp, MessageV11, MpAlarmSettingType, MpUserLoggingInReq, \
     MpUserLoggingInRsp, StartEndNumber, Timestamp, VinInfo
 from saic_ismart_client.ota_v2_1.Message import MessageCoderV21
-from saic_ismart_client.ota_v2_1.data_model import OtaRvcReq, OtaRvcStatus25857, OtaRvmVehicleStatusReq, \
+from saic_ismart_client.ota_v2_1.data_model import OtaRvcStatus25857, OtaRvmVehicleStatusReq, \
     OtaRvmVehicleStatusResp25857, RvcReqParam
+from saic_ismart_client.ota_v2_1.rvc_command import RvcCommand, RvcCommandCatalog
 from saic_ismart_client.ota_v3_0.Message import MessageBodyV30, MessageCoderV30, MessageV30
 from saic_ismart_client.ota_v3_0.data_model import OtaChrgCtrlReq, OtaChrgCtrlStsResp, OtaChrgHeatReq, \
     OtaChrgHeatResp, OtaChrgMangDataResp, OtaChrgRsvanReq, OtaChrgSetngReq, OtaChrgSetngResp, OtaChrgRsvanResp
+from saic_ismart_client.request_template import RequestTemplate, RequestTemplateCache
 from saic_ismart_client.rest_v2.api import SaicRestV2Api
+from saic_ismart_client.rate_limiter import ENDPOINT_FAMILY_REST_V2, RateLimiter, get_endpoint_family
+from saic_ismart_client.retry_policy import AdaptiveRetryPolicy
+from saic_ismart_client.single_flight import SingleFlight
+from saic_ismart_client.status_cache import StatusCache
 
 UID_INIT = '0000000000000000000000000000000000000000000000000#'
+TAP_HEADERS = {
+    'Accept': '*/*',
+    'Content-Type': 'text/html',
+    'Accept-Encoding': 'gzip, deflate, br',
+    'User-Agent': 'MG iSMART/1.1.1 (iPhone; iOS 16.3; Scale/3.00)',
+    'Accept-Language': 'de-DE;q=1, en-DE;q=0.9, lu-DE;q=0.8, fr-DE;q=0.7'
+}
 AVG_SMS_DELIVERY_TIME = 15
 logging.basicConfig(format='%(asctime)s %(message)s')
 LOG = logging.getLogger(__name__)
@@ -66,14 +84,31 @@ def convert(message: Message) -> SaicMessage:
                        message.vin)
 
 
-class SaicApi:
+class SaicApiRequest:
+    def __init__(self, message_coder: AbstractMessageCoder, application_id: str, application_data_protocol_version: int,
+                 endpoint: str, request_hex: str, response_message: AbstractMessage, lazy: bool = False,
+                 vin: str = None):
+        self.message_coder = message_coder
+        self.application_id = application_id
+        self.application_data_protocol_version = application_data_protocol_version
+        self.endpoint = endpoint
+        self.request_hex = request_hex
+        self.response_message = response_message
+        self.lazy = lazy
+        self.vin = vin
+
+
+class AbstractSaicApi:
+    # builds the requests and handles the responses, sending them is left to the blocking and the asyncio client
     def __init__(
             self,
             saic_uri: str,
-            saic_rest_uri: str,
             saic_user: str,
             saic_password: str,
-            relogin_delay: int = None
+            relogin_delay: int = None,
+            retry_policy: AdaptiveRetryPolicy = None,
+            circuit_breakers: CircuitBreakerRegistry = None,
+            rate_limiter: RateLimiter = None
     ):
         self.saic_uri = saic_uri
         self.saic_user = saic_user
@@ -82,59 +117,157 @@ class SaicApi:
             self.relogin_delay = 0
         else:
             self.relogin_delay = relogin_delay
-        self.message_v1_1_coder = MessageCoderV11()
-        self.message_V2_1_coder = MessageCoderV21()
-        self.message_V3_0_coder = MessageCoderV30()
-        self.rest_v2_api = SaicRestV2Api(saic_rest_uri)
-        self.cookies = None
+        self.__coder_lock = threading.Lock()
+        self.__message_v1_1_coder = None
+        self.__message_v2_1_coder = None
+        self.__message_v3_0_coder = None
+        self.__rvc_command_catalog = None
+        self.request_template_cache = RequestTemplateCache()
         self.uid = ''
         self.token = ''
         self.token_expiration = None
         self.on_publish_raw_value = None
         self.on_publish_json_value = None
-
-    def login(self) -> MessageV11:
+        # without a retry policy the retries wait for the average SMS delivery time
+        self.retry_policy = retry_policy
+        self.circuit_breakers = circuit_breakers
+        self.rate_limiter = rate_limiter
+
+    @property
+    def message_v1_1_coder(self) -> MessageCoderV11:
+        if self.__message_v1_1_coder is None:
+            with self.__coder_lock:
+                if self.__message_v1_1_coder is None:
+                    self.__message_v1_1_coder = MessageCoderV11()
+        return self.__message_v1_1_coder
+
+    @property
+    def message_V2_1_coder(self) -> MessageCoderV21:
+        if self.__message_v2_1_coder is None:
+            with self.__coder_lock:
+                if self.__message_v2_1_coder is None:
+                    self.__message_v2_1_coder = MessageCoderV21()
+        return self.__message_v2_1_coder
+
+    @property
+    def message_V3_0_coder(self) -> MessageCoderV30:
+        if self.__message_v3_0_coder is None:
+            with self.__coder_lock:
+                if self.__message_v3_0_coder is None:
+                    self.__message_v3_0_coder = MessageCoderV30()
+        return self.__message_v3_0_coder
+
+    @property
+    def rvc_command_catalog(self) -> RvcCommandCatalog:
+        if self.__rvc_command_catalog is None:
+            message_coder = self.message_V2_1_coder
+            with self.__coder_lock:
+                if self.__rvc_command_catalog is None:
+                    self.__rvc_command_catalog = RvcCommandCatalog(message_coder)
+        return self.__rvc_command_catalog
+
+    def warm_up(self) -> None:
+        # compile all message coders now instead of on first use
+        _ = self.message_v1_1_coder
+        _ = self.message_V2_1_coder
+        _ = self.message_V3_0_coder
+
+    def is_token_expired(self) -> bool:
+        if self.token_expiration is not None:
+            token_expiration = cast(Timestamp, self.token_expiration)
+            return token_expiration.get_timestamp() < datetime.datetime.now()
+        return False
+
+    def create_api_request(self, message_coder: AbstractMessageCoder, request_message: AbstractMessage,
+                           response_message: AbstractMessage, endpoint: str, lazy: bool = False,
+                           application_data_bytes: bytes = None,
+                           request_data: dict | Callable[[], dict] = None) -> SaicApiRequest:
+        application_id = request_message.body.application_id
+        application_data_protocol_version = request_message.body.application_data_protocol_version
+        if request_data is None:
+            request_data = request_message.get_data
+        self.publish_json_request(application_id, application_data_protocol_version, request_data)
+        request_hex = message_coder.encode_request(request_message, application_data_bytes)
+        return SaicApiRequest(message_coder, application_id, application_data_protocol_version, endpoint,
+                              request_hex, response_message, lazy, request_message.body.vin)
+
+    def get_rate_limit_delay(self, endpoint_family: str, vin: str = None) -> float:
+        if self.rate_limiter is None:
+            return 0.0
+        deadline = get_current_deadline()
+        if deadline is None:
+            return self.rate_limiter.reserve(self.saic_user, vin, endpoint_family)
+        # a call that cannot be sent before its deadline must not hold back the calls queued after it
+        deadline.check()
+        delay = self.rate_limiter.reserve(self.saic_user, vin, endpoint_family, deadline.remaining())
+        if delay is None:
+            raise SaicApiDeadlineExceeded(f'API call would exceed its deadline of {deadline.timeout} seconds '
+                                          f'waiting for the rate limit')
+        return delay
+
+    def acquire_circuit_breaker(self, api_request: SaicApiRequest) -> CircuitBreaker | None:
+        # raises SaicApiCircuitOpen while the backend of the endpoint is considered unavailable
+        if self.circuit_breakers is None:
+            return None
+        circuit_breaker = self.circuit_breakers.get(self.saic_user, api_request.endpoint)
+        circuit_breaker.acquire()
+        return circuit_breaker
+
+    @staticmethod
+    def record_circuit_breaker_result(circuit_breaker: CircuitBreaker | None, response_message: AbstractMessage | None,
+                                      error: BaseException = None):
+        if circuit_breaker is None:
+            return
+        if error is not None:
+            # connection errors, timeouts and undecodable responses count, giving up on the call does not
+            if isinstance(error, Exception) and not isinstance(error, (SaicApiDeadlineExceeded, SaicApiCancelled)):
+                circuit_breaker.record_failure()
+            else:
+                circuit_breaker.release()
+        elif response_message.body.result in (4, 6):
+            circuit_breaker.record_failure()
+        else:
+            circuit_breaker.record_success()
+
+    def handle_api_response(self, api_request: SaicApiRequest, response_hex: str) -> AbstractMessage:
+        self.publish_raw_response(api_request.application_id, api_request.application_data_protocol_version,
+                                  response_hex)
+        response_message = api_request.response_message
+        api_request.message_coder.decode_response(response_hex, response_message, api_request.lazy)
+        self.publish_json_response(api_request.application_id, api_request.application_data_protocol_version,
+                                   response_message.get_data)
+        return response_message
+
+    def create_login_request(self) -> SaicApiRequest:
         application_data = MpUserLoggingInReq()
         application_data.password = self.saic_password
         header = Header()
         header.protocol_version = 17
         login_request_message = MessageV11(header, MessageBodyV11(), application_data)
-        application_id = '501'
-        application_data_protocol_version = 513
         self.message_v1_1_coder.initialize_message(
             UID_INIT[len(self.saic_user):] + self.saic_user,
             cast(str, None),
-            application_id,
-            application_data_protocol_version,
+            '501',
+            513,
             1,
             login_request_message)
-        self.publish_json_request(application_id, application_data_protocol_version, login_request_message.get_data())
-        login_request_hex = self.message_v1_1_coder.encode_request(login_request_message)
-        self.publish_raw_request(application_id, application_data_protocol_version, login_request_hex)
-        login_response_hex = self.send_request(login_request_hex,
-                                               urllib.parse.urljoin(self.saic_uri, '/TAP.Web/ota.mp'))
-        self.publish_raw_response(application_id, application_data_protocol_version, login_response_hex)
-        logging_in_rsp = MpUserLoggingInRsp()
-        login_response_message = MessageV11(header, MessageBodyV11(), logging_in_rsp)
-        self.message_v1_1_coder.decode_response(login_response_hex, login_response_message)
-        self.publish_json_response(application_id, application_data_protocol_version, login_response_message.get_data())
+        login_response_message = MessageV11(header, MessageBodyV11(), MpUserLoggingInRsp())
+        return self.create_api_request(self.message_v1_1_coder, login_request_message, login_response_message,
+                                       '/TAP.Web/ota.mp')
+
+    def handle_login_response(self, login_response_message: MessageV11) -> None:
         if login_response_message.body.error_message is not None:
             raise SaicApiException(login_response_message.body.error_message,
                                    login_response_message.body.result)
         else:
+            logging_in_rsp = cast(MpUserLoggingInRsp, login_response_message.application_data)
             self.uid = login_response_message.body.uid
             self.token = logging_in_rsp.token
+            self.request_template_cache.invalidate()
             if logging_in_rsp.token_expiration is not None:
                 self.token_expiration = logging_in_rsp.token_expiration
-        return login_response_message
 
-    def set_geofence_alarm_switch(self) -> None:
-        return self.set_alarm_switches(
-            [create_alarm_switch(MpAlarmSettingType.REGION)],
-            pin='22222222222222222222222222222222'
-        )
-
-    def set_alarm_switches(self, alarm_switches: list, pin: str = None) -> None:
+    def create_alarm_switch_request(self, token: str, alarm_switches: list, pin: str = None) -> SaicApiRequest:
         alarm_switch_req = AlarmSwitchReq()
         alarm_switch_req.alarm_switch_list = alarm_switches
         alarm_switch_req.pin = hash_md5('123456') if pin is None else pin
@@ -142,97 +275,392 @@ class SaicApi:
         header = Header()
         header.protocol_version = 17
         alarm_switch_req_message = MessageV11(header, MessageBodyV11(), alarm_switch_req)
-        application_id = '521'
-        application_data_protocol_version = 513
         self.message_v1_1_coder.initialize_message(
             self.uid,
-            self.get_token(),
-            application_id,
-            application_data_protocol_version,
+            token,
+            '521',
+            513,
             1,
             alarm_switch_req_message)
-        self.publish_json_request(application_id, application_data_protocol_version,
-                                  alarm_switch_req_message.get_data())
-        alarm_switch_request_hex = self.message_v1_1_coder.encode_request(alarm_switch_req_message)
-        self.publish_raw_request(application_id, application_data_protocol_version, alarm_switch_request_hex)
-        alarm_switch_response_hex = self.send_request(alarm_switch_request_hex,
-                                                      urllib.parse.urljoin(self.saic_uri, '/TAP.Web/ota.mp'))
-        self.publish_raw_response(application_id, application_data_protocol_version, alarm_switch_response_hex)
         alarm_switch_response_message = MessageV11(header, MessageBodyV11())
-        self.message_v1_1_coder.decode_response(alarm_switch_response_hex, alarm_switch_response_message)
-        self.publish_json_response(application_id, application_data_protocol_version,
-                                   alarm_switch_response_message.get_data())
+        return self.create_api_request(self.message_v1_1_coder, alarm_switch_req_message,
+                                       alarm_switch_response_message, '/TAP.Web/ota.mp')
 
-        if alarm_switch_response_message.body.error_message is not None:
-            raise SaicApiException(alarm_switch_response_message.body.error_message,
-                                   alarm_switch_response_message.body.result)
+    def create_vehicle_status_request(self, token: str, vin_info: VinInfo, event_id: str = None) -> SaicApiRequest:
+        application_id = '511'
+        application_data_protocol_version = 25857
+        vehicle_status_req_template = self.request_template_cache.get_template(
+            vin_info.vin, application_id, 1,
+            lambda: self.__create_vehicle_status_req_template(token, vin_info, application_id,
+                                                              application_data_protocol_version))
+        vehicle_status_req_data, vehicle_status_req_hex = vehicle_status_req_template.create_request(token, event_id)
+        self.publish_json_request(application_id, application_data_protocol_version, vehicle_status_req_data)
+        vehicle_status_rsp_msg = MessageV2(MessageBodyV2(), OtaRvmVehicleStatusResp25857())
+        return SaicApiRequest(self.message_V2_1_coder, application_id, application_data_protocol_version,
+                              '/TAP.Web/ota.mpv21', vehicle_status_req_hex, vehicle_status_rsp_msg, lazy=True,
+                              vin=vin_info.vin)
 
-    def get_vehicle_status(self, vin_info: VinInfo, event_id: str = None) -> MessageV2:
+    def __create_vehicle_status_req_template(self, token: str, vin_info: VinInfo, application_id: str,
+                                             application_data_protocol_version: int) -> RequestTemplate:
         vehicle_status_req = OtaRvmVehicleStatusReq()
         vehicle_status_req.veh_status_req_type = 2
         vehicle_status_req_msg = MessageV2(MessageBodyV2(), vehicle_status_req)
-        application_id = '511'
-        application_data_protocol_version = 25857
-        self.message_V2_1_coder.initialize_message(self.uid, self.get_token(), vin_info.vin, application_id,
+        self.message_V2_1_coder.initialize_message(self.uid, token, vin_info.vin, application_id,
                                                    application_data_protocol_version, 1, vehicle_status_req_msg)
         vehicle_status_req_msg.body.ack_required = False
+        return RequestTemplate(self.message_V2_1_coder, vehicle_status_req_msg)
+
+    def create_rvc_command(self, rvc_req_type: bytes, rvc_params: list, has_app_data: bool) -> RvcCommand:
+        return self.rvc_command_catalog.create_command(
+            rvc_req_type,
+            tuple((cast(RvcReqParam, p).param_id, cast(RvcReqParam, p).param_value) for p in rvc_params),
+            has_app_data
+        )
+
+    def create_vehicle_control_request(self, token: str, rvc_command: RvcCommand, vin_info: VinInfo,
+                                       event_id: str = None) -> SaicApiRequest:
+        vehicle_control_cmd_req_msg = MessageV2(MessageBodyV2())
+        self.message_V2_1_coder.initialize_message(self.uid, token, vin_info.vin, '510', 25857, 1,
+                                                   vehicle_control_cmd_req_msg)
+        vehicle_control_cmd_req_msg.body.ack_required = False
         if event_id is not None:
-            vehicle_status_req_msg.body.event_id = event_id
-        self.publish_json_request(application_id, application_data_protocol_version, vehicle_status_req_msg.get_data())
-        vehicle_status_req_hex = self.message_V2_1_coder.encode_request(vehicle_status_req_msg)
-        self.publish_raw_request(application_id, application_data_protocol_version, vehicle_status_req_hex)
-        vehicle_status_rsp_hex = self.send_request(vehicle_status_req_hex,
-                                                   urllib.parse.urljoin(self.saic_uri, '/TAP.Web/ota.mpv21'))
-        self.publish_raw_response(application_id, application_data_protocol_version, vehicle_status_rsp_hex)
-        vehicle_status_rsp_msg = MessageV2(MessageBodyV2(), OtaRvmVehicleStatusResp25857())
-        self.message_V2_1_coder.decode_response(vehicle_status_rsp_hex, vehicle_status_rsp_msg)
-        self.publish_json_response(application_id, application_data_protocol_version, vehicle_status_rsp_msg.get_data())
-        return vehicle_status_rsp_msg
+            vehicle_control_cmd_req_msg.body.event_id = event_id
+        vehicle_control_cmd_rsp_msg = MessageV2(MessageBodyV2(), OtaRvcStatus25857())
+        # the application data of the command is encoded once by the catalog
+        return self.create_api_request(self.message_V2_1_coder, vehicle_control_cmd_req_msg,
+                                       vehicle_control_cmd_rsp_msg, '/TAP.Web/ota.mpv21',
+                                       application_data_bytes=rvc_command.application_data_bytes,
+                                       request_data=lambda: {**vehicle_control_cmd_req_msg.get_data(),
+                                                             'applicationData': rvc_command.get_data()})
 
-    def get_vehicle_status_with_retry(self, vin_info: VinInfo) -> MessageV2:
-        return self.handle_retry(self.get_vehicle_status, vin_info)
+    # CHARGING MANAGEMENT
 
-    def unknown_engine_control(self, vin_info: VinInfo) -> MessageV2:
-        rvc_params = []
-        param1 = RvcReqParam()
-        param1.param_id = 16
-        param1.param_value = b'\x01'
-        rvc_params.append(param1)
+    def create_charging_status_request(self, token: str, vin_info: VinInfo, event_id: str = None) -> SaicApiRequest:
+        application_id = '516'
+        application_data_protocol_version = 768
+        chrg_mgmt_data_req_template = self.request_template_cache.get_template(
+            vin_info.vin, application_id, 5,
+            lambda: self.__create_chrg_mgmt_data_req_template(token, vin_info, application_id,
+                                                              application_data_protocol_version))
+        chrg_mgmt_data_req_data, chrg_mgmt_data_req_hex = chrg_mgmt_data_req_template.create_request(token, event_id)
+        self.publish_json_request(application_id, application_data_protocol_version, chrg_mgmt_data_req_data)
+        chrg_mgmt_data_rsp_msg = MessageV30(MessageBodyV30(), OtaChrgMangDataResp())
+        return SaicApiRequest(self.message_V3_0_coder, application_id, application_data_protocol_version,
+                              '/TAP.Web/ota.mpv30', chrg_mgmt_data_req_hex, chrg_mgmt_data_rsp_msg, lazy=True,
+                              vin=vin_info.vin)
+
+    def __create_chrg_mgmt_data_req_template(self, token: str, vin_info: VinInfo, application_id: str,
+                                             application_data_protocol_version: int) -> RequestTemplate:
+        chrg_mgmt_data_req_msg = MessageV30(MessageBodyV30())
+        self.message_V3_0_coder.initialize_message(self.uid, token, vin_info.vin, application_id,
+                                                   application_data_protocol_version, 5, chrg_mgmt_data_req_msg)
+        chrg_mgmt_data_req_msg.body.ack_required = False
+        return RequestTemplate(self.message_V3_0_coder, chrg_mgmt_data_req_msg)
+
+    def create_battery_heating_request(self, token: str, enable: bool, vin_info: VinInfo,
+                                       event_id: str = None) -> SaicApiRequest:
+        chrg_heat_req = OtaChrgHeatReq()
+        chrg_heat_req.ptcHeatReq = bool_to_int(enable)
+        return self.__create_charging_management_request(token, chrg_heat_req, 9, OtaChrgHeatResp(), vin_info,
+                                                         event_id)
 
-        return self.send_vehicle_ctrl_cmd_with_retry(vin_info, b'\x11', rvc_params, True)
+    def create_charging_port_lock_request(self, token: str, unlock: bool, vin_info: VinInfo,
+                                          event_id: str = None) -> SaicApiRequest:
+        chrg_ctrl_req = OtaChrgCtrlReq()
+        chrg_ctrl_req.chrgCtrlReq = 0
+        chrg_ctrl_req.tboxV2XReq = 0
+        chrg_ctrl_req.tboxEleccLckCtrlReq = 2 if unlock else 1
+        return self.__create_charging_management_request(token, chrg_ctrl_req, 7, OtaChrgCtrlStsResp(), vin_info,
+                                                         event_id)
+
+    def create_charging_control_request(self, token: str, stop_charging: bool, vin_info: VinInfo,
+                                        event_id: str = None) -> SaicApiRequest:
+        chrg_ctrl_req = OtaChrgCtrlReq()
+        chrg_ctrl_req.chrgCtrlReq = 2 if stop_charging else 1
+        chrg_ctrl_req.tboxV2XReq = 0
+        chrg_ctrl_req.tboxEleccLckCtrlReq = 0
+        return self.__create_charging_management_request(token, chrg_ctrl_req, 7, OtaChrgCtrlStsResp(), vin_info,
+                                                         event_id)
+
+    def create_target_battery_soc_request(
+            self,
+            token: str,
+            target_soc: TargetBatteryCode,
+            vin_info: VinInfo,
+            charge_current_limit: ChargeCurrentLimitCode = ChargeCurrentLimitCode.C_IGNORE,
+            event_id: str = None
+    ) -> SaicApiRequest:
+        chrg_setng_req = OtaChrgSetngReq()
+        chrg_setng_req.onBdChrgTrgtSOCReq = target_soc.value
+        chrg_setng_req.altngChrgCrntReq = charge_current_limit.value
+        chrg_setng_req.tboxV2XSpSOCReq = 0
+        return self.__create_charging_management_request(token, chrg_setng_req, 3, OtaChrgSetngResp(), vin_info,
+                                                         event_id)
+
+    def create_schedule_charging_request(self, token: str, start_time: datetime.time, end_time: datetime.time,
+                                         mode: ScheduledChargingMode, vin_info: VinInfo,
+                                         event_id: str = None) -> SaicApiRequest:
+        chrg_rsvan_req = OtaChrgRsvanReq()
+        chrg_rsvan_req.rsvanStHour = start_time.hour
+        chrg_rsvan_req.rsvanStMintu = start_time.minute
+        chrg_rsvan_req.rsvanSpHour = end_time.hour
+        chrg_rsvan_req.rsvanSpMintu = end_time.minute
+        chrg_rsvan_req.tboxAdpPubChrgSttnReq = 1
+        chrg_rsvan_req.tboxReserCtrlReq = mode.value
+        return self.__create_charging_management_request(token, chrg_rsvan_req, 1, OtaChrgRsvanResp(), vin_info,
+                                                         event_id)
+
+    def __create_charging_management_request(self, token: str, application_data: ApplicationData, message_id: int,
+                                             response_application_data: ApplicationData, vin_info: VinInfo,
+                                             event_id: str = None) -> SaicApiRequest:
+        request_message = MessageV30(MessageBodyV30(), application_data)
+        self.message_V3_0_coder.initialize_message(self.uid, token, vin_info.vin, '516', 768, message_id,
+                                                   request_message)
+        if event_id is not None:
+            request_message.body.event_id = event_id
+        response_message = MessageV30(MessageBodyV30(), response_application_data)
+        return self.create_api_request(self.message_V3_0_coder, request_message, response_message,
+                                       '/TAP.Web/ota.mpv30')
+
+    # Messages
+
+    def create_message_list_request(self, token: str, start: int, end: int, message_group: str,
+                                    event_id: str = None) -> SaicApiRequest:
+        message_list_request = MessageListReq()
+        message_list_request.start_end_number = StartEndNumber()
+        message_list_request.start_end_number.start_number = start
+        message_list_request.start_end_number.end_number = end
+        message_list_request.message_group = message_group
+
+        header = Header()
+        header.protocol_version = 18
+        message_body = MessageBodyV11()
+        message_list_req_msg = MessageV11(header, message_body, message_list_request)
+        self.message_v1_1_coder.initialize_message(self.uid, token, '531', 513, 1, message_list_req_msg)
+        if event_id is not None:
+            message_body.event_id = event_id
+        message_list_rsp_msg = MessageV11(header, MessageBodyV11(), MessageListResp())
+        return self.create_api_request(self.message_v1_1_coder, message_list_req_msg, message_list_rsp_msg,
+                                       '/TAP.Web/ota.mp')
+
+    def create_message_status_request(self, token: str, message_id: int | None, action_type: str,
+                                      event_id: str = None) -> SaicApiRequest:
+        abort_send_msg_req = AbortSendMessageReq()
+        abort_send_msg_req.action_type = action_type
+        if message_id is not None:
+            abort_send_msg_req.message_id = message_id
+
+        header = Header()
+        header.protocol_version = 17
+        message_body = MessageBodyV11()
+        message_delete_req_msg = MessageV11(header, message_body, abort_send_msg_req)
+        self.message_v1_1_coder.initialize_message(self.uid, token, '615', 513, 1, message_delete_req_msg)
+        if event_id is not None:
+            message_body.event_id = event_id
+        message_delete_rsp_msg = MessageV11(header, MessageBodyV11())
+        return self.create_api_request(self.message_v1_1_coder, message_delete_req_msg, message_delete_rsp_msg,
+                                       '/TAP.Web/ota.mp', request_data=abort_send_msg_req.get_data)
+
+    def get_error_handling(self, message_body: AbstractMessageBody, iteration: int,
+                           elapsed: float = None) -> tuple[float, bool]:
+        # returns the time to wait before the next attempt and whether a new login is required
+        if iteration > 0:
+            waiting_time = AVG_SMS_DELIVERY_TIME * iteration
+        else:
+            waiting_time = AVG_SMS_DELIVERY_TIME
+        message = f'application ID: {message_body.application_id},' \
+                  + f' protocol version: {message_body.application_data_protocol_version},' \
+                  + f' message: {message_body.error_message}' \
+                  + f' result code: {message_body.result}'
+
+        if message_body.result == 2:
+            # re-login
+            LOG.debug(message)
+            if self.relogin_delay > 0:
+                LOG.warning(f'The SAIC user has been logged out. '
+                            + f'Waiting {self.relogin_delay} seconds before attempting another login')
+            return float(self.relogin_delay), True
+        elif message_body.result == 4:
+            # The remote control instruction failed, please try again later.
+            LOG.debug(message)
+            return self.get_retry_delay(message_body, elapsed, float(waiting_time)), False
+        elif message_body.result == 6:
+            # The service is not available,please try again later
+            LOG.debug(message)
+            return self.get_retry_delay(message_body, elapsed, float(waiting_time)), False
+        elif message_body.result == -1:
+            LOG.warning(message)
+            return 0.0, False
+        else:
+            LOG.error(message)
+            raise SaicApiException(message_body.error_message, message_body.result)
+
+    def get_retry_delay(self, message_body: AbstractMessageBody, elapsed: float | None,
+                        fixed_delay: float = float(AVG_SMS_DELIVERY_TIME)) -> float:
+        # elapsed is the time since the first request of the retry loop
+        if self.retry_policy is not None and elapsed is not None:
+            delay = self.retry_policy.get_delay(message_body.vin, message_body.application_id, elapsed)
+            if delay is not None:
+                return delay
+        return fixed_delay
+
+    def record_app_data_latency(self, message_body: AbstractMessageBody, elapsed: float) -> None:
+        if self.retry_policy is not None:
+            self.retry_policy.record(message_body.vin, message_body.application_id, elapsed)
+
+    def publish_raw_value(self, key: str, raw: str):
+        if self.on_publish_raw_value is not None:
+            self.on_publish_raw_value(key, raw)
+        else:
+            LOG.debug('%s: %s', key, raw)
+
+    def publish_raw_request(self, application_id: str, application_data_protocol_version: int, raw: str):
+        key = f'{application_id}_{application_data_protocol_version}/raw/request'
+        self.publish_raw_value(key, raw)
+
+    def publish_raw_response(self, application_id: str, application_data_protocol_version: int, raw: str):
+        key = f'{application_id}_{application_data_protocol_version}/raw/response'
+        self.publish_raw_value(key, raw)
+
+    def publish_json_request(self, application_id: str, application_data_protocol_version: int,
+                             data: dict | Callable[[], dict]):
+        key = f'{application_id}_{application_data_protocol_version}/json/request'
+        self.publish_json(key, data)
+
+    def publish_json_response(self, application_id: str, application_data_protocol_version: int,
+                              data: dict | Callable[[], dict]):
+        key = f'{application_id}_{application_data_protocol_version}/json/response'
+        self.publish_json(key, data)
+
+    def is_publishing_json(self) -> bool:
+        return self.on_publish_json_value is not None or LOG.isEnabledFor(logging.DEBUG)
+
+    def publish_json(self, key: str, data: dict | Callable[[], dict]):
+        # the payload can be passed as a factory, it is only built when a subscriber or the debug log consumes it
+        if not self.is_publishing_json():
+            return
+        if callable(data):
+            data = data()
+        if self.on_publish_json_value is not None:
+            self.on_publish_json_value(key, data)
+        else:
+            LOG.debug('%s: %s', key, data)
+
+
+class SaicApi(AbstractSaicApi):
+    def __init__(
+            self,
+            saic_uri: str,
+            saic_rest_uri: str,
+            saic_user: str,
+            saic_password: str,
+            relogin_delay: int = None,
+            http_session_config: HttpSessionConfig = None,
+            status_cache: StatusCache = None,
+            retry_policy: AdaptiveRetryPolicy = None,
+            command_scheduler: CommandScheduler = None,
+            circuit_breakers: CircuitBreakerRegistry = None,
+            rate_limiter: RateLimiter = None
+    ):
+        super().__init__(saic_uri, saic_user, saic_password, relogin_delay, retry_policy, circuit_breakers,
+                         rate_limiter)
+        if http_session_config is None:
+            http_session_config = HttpSessionConfig()
+        self.http_session_config = http_session_config
+        # the session keeps the TLS connections to the TAP endpoints alive between requests
+        self.session = http_session_config.create_session(TAP_HEADERS)
+        self.rest_v2_api = SaicRestV2Api(saic_rest_uri, http_session_config)
+        self.cookies = None
+        self.__login_lock = threading.Lock()
+        self.single_flight = SingleFlight()
+        # without a status cache every status read is sent to the TAP endpoint
+        self.status_cache = status_cache
+        # several instances can share one scheduler for their submitted commands
+        self.__owns_command_scheduler = command_scheduler is None
+        if command_scheduler is None:
+            command_scheduler = CommandScheduler()
+        self.command_scheduler = command_scheduler
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self) -> None:
+        self.session.close()
+        self.rest_v2_api.close()
+        if self.status_cache is not None:
+            self.status_cache.close()
+        if self.__owns_command_scheduler:
+            self.command_scheduler.close()
+
+    def send_api_request(self, api_request: SaicApiRequest) -> AbstractMessage:
+        self.wait(self.get_rate_limit_delay(get_endpoint_family(api_request.endpoint), api_request.vin))
+        circuit_breaker = self.acquire_circuit_breaker(api_request)
+        try:
+            self.publish_raw_request(api_request.application_id, api_request.application_data_protocol_version,
+                                     api_request.request_hex)
+            response_hex = self.send_request(api_request.request_hex,
+                                             urllib.parse.urljoin(self.saic_uri, api_request.endpoint))
+            response_message = self.handle_api_response(api_request, response_hex)
+        except BaseException as e:
+            self.record_circuit_breaker_result(circuit_breaker, None, e)
+            raise
+        self.record_circuit_breaker_result(circuit_breaker, response_message)
+        return response_message
+
+    def login(self) -> MessageV11:
+        login_response_message = cast(MessageV11, self.send_api_request(self.create_login_request()))
+        self.handle_login_response(login_response_message)
+        return login_response_message
+
+    def set_geofence_alarm_switch(self) -> None:
+        return self.set_alarm_switches(
+            [create_alarm_switch(MpAlarmSettingType.REGION)],
+            pin='22222222222222222222222222222222'
+        )
+
+    def set_alarm_switches(self, alarm_switches: list, pin: str = None) -> None:
+        alarm_switch_response_message = self.send_api_request(
+            self.create_alarm_switch_request(self.get_token(), alarm_switches, pin))
+
+        if alarm_switch_response_message.body.error_message is not None:
+            raise SaicApiException(alarm_switch_response_message.body.error_message,
+                                   alarm_switch_response_message.body.result)
+
+    def get_vehicle_status(self, vin_info: VinInfo, event_id: str = None) -> MessageV2:
+        return cast(MessageV2, self.send_api_request(
+            self.create_vehicle_status_request(self.get_token(), vin_info, event_id)))
+
+    def get_vehicle_status_with_retry(self, vin_info: VinInfo, deadline: Deadline = None) -> MessageV2:
+        # concurrent callers for the same vehicle share one request and its retries
+        return self.get_cached_status((vin_info.vin, '511', 25857),
+                                      lambda d: self.handle_retry(self.get_vehicle_status, vin_info, deadline=d),
+                                      deadline)
+
+    def get_cached_status(self, key: tuple, load: Callable[[Deadline | None], AbstractMessage],
+                          deadline: Deadline = None):
+        # load is called with the deadline of the caller, background refreshes run without one
+        if deadline is None:
+            deadline = get_current_deadline()
+        if self.status_cache is None:
+            return self.single_flight.do(key, lambda: load(deadline), deadline)
+        return self.status_cache.get(key, lambda: self.single_flight.do(key, lambda: load(deadline), deadline),
+                                     lambda: self.single_flight.do(key, lambda: load(None)))
+
+    def invalidate_status_cache(self, vin_info: VinInfo) -> None:
+        if self.status_cache is not None:
+            self.status_cache.invalidate(vin_info.vin)
+
+    def unknown_engine_control(self, vin_info: VinInfo) -> MessageV2:
+        return self.send_rvc_command_with_retry(vin_info, self.rvc_command_catalog.unknown_engine_control())
 
     def lock_vehicle(self, vin_info: VinInfo) -> MessageV2:
-        rvc_params = []
-        return self.send_vehicle_ctrl_cmd_with_retry(vin_info, b'\x01', rvc_params, False)
+        return self.send_rvc_command_with_retry(vin_info, self.rvc_command_catalog.lock_vehicle())
 
     def unlock_vehicle(self, vin_info: VinInfo) -> MessageV2:
-        rvc_params = []
-        param1 = RvcReqParam()
-        param1.param_id = 4
-        param1.param_value = b'\x00'
-        rvc_params.append(param1)
-
-        param2 = RvcReqParam()
-        param2.param_id = 5
-        param2.param_value = b'\x00'
-        rvc_params.append(param2)
-
-        param3 = RvcReqParam()
-        param3.param_id = 6
-        param3.param_value = b'\x00'
-        rvc_params.append(param3)
-
-        param4 = RvcReqParam()
-        param4.param_id = 7
-        param4.param_value = b'\x03'
-        rvc_params.append(param4)
-
-        param5 = RvcReqParam()
-        param5.param_id = 255
-        param5.param_value = b'\x00'
-        rvc_params.append(param5)
-
-        return self.send_vehicle_ctrl_cmd_with_retry(vin_info, b'\x02', rvc_params, False)
+        return self.send_rvc_command_with_retry(vin_info, self.rvc_command_catalog.unlock_vehicle())
 
     def start_rear_window_heat(self, vin_info: VinInfo) -> MessageV2:
         return self.__control_rear_window_heat(vin_info, True)
@@ -241,36 +669,12 @@ class SaicApi:
         return self.__control_rear_window_heat(vin_info, False)
 
     def __control_rear_window_heat(self, vin_info: VinInfo, enable: bool) -> MessageV2:
-        rvc_params = []
-        param1 = RvcReqParam()
-        param1.param_id = 23
-        param1.param_value = bool_to_bit(enable)
-        rvc_params.append(param1)
-
-        param2 = RvcReqParam()
-        param2.param_id = 255
-        param2.param_value = b'\x00'
-        rvc_params.append(param2)
-
-        return self.send_vehicle_ctrl_cmd_with_retry(vin_info, b'\x20', rvc_params, False)
+        return self.send_rvc_command_with_retry(vin_info, self.rvc_command_catalog.control_rear_window_heat(enable))
 
     def control_heated_seats(self, vin_info: VinInfo, driver_side=True, passenger_side=True):
-        rcv_params = []
-        param1 = RvcReqParam()
-        param1.param_id = 17
-        param1.param_value = bool_to_bit(driver_side)
-        rcv_params.append(param1)
-
-        param2 = RvcReqParam()
-        param2.param_id = 18
-        param2.param_value = bool_to_bit(passenger_side)
-        rcv_params.append(param2)
-
-        param3 = RvcReqParam()
-        param3.param_id = 255
-        param3.param_value = b'\x00'
-        rcv_params.append(param3)
-        return self.send_vehicle_ctrl_cmd_with_retry(vin_info, b'\x05', rcv_params, True)
+        return self.send_rvc_command_with_retry(vin_info,
+                                                self.rvc_command_catalog.control_heated_seats(driver_side,
+                                                                                              passenger_side))
 
     def start_ac(self, vin_info: VinInfo, temperature_idx=8) -> MessageV2:
         return self.control_climate(vin_info, fan_speed=2, ac_on=None, temperature_idx=temperature_idx)
@@ -285,28 +689,7 @@ class SaicApi:
         return self.control_climate(vin_info, fan_speed=5, ac_on=True, temperature_idx=8)
 
     def stop_front_defrost(self, vin_info: VinInfo) -> MessageV2:
-        rcv_params = []
-        param1 = RvcReqParam()
-        param1.param_id = 19
-        param1.param_value = b'\x00'
-        rcv_params.append(param1)
-
-        param2 = RvcReqParam()
-        param2.param_id = 20
-        param2.param_value = b'\x08'
-        rcv_params.append(param2)
-
-        param3 = RvcReqParam()
-        param3.param_id = 22
-        param3.param_value = b'\x00'
-        rcv_params.append(param3)
-
-        param4 = RvcReqParam()
-        param4.param_id = 255
-        param4.param_value = b'\x00'
-        rcv_params.append(param4)
-
-        return self.send_vehicle_ctrl_cmd_with_retry(vin_info, b'\x06', rcv_params, True)
+        return self.send_rvc_command_with_retry(vin_info, self.rvc_command_catalog.stop_front_defrost())
 
     def control_climate(
             self,
@@ -315,75 +698,15 @@ class SaicApi:
             ac_on: bool | None = True,
             temperature_idx: int = 8
     ) -> MessageV2:
-
-        if fan_speed < 0 or fan_speed > 5:
-            raise Exception('fan_speed must be between 0 and 5')
-
-        if temperature_idx < 0 or temperature_idx > 14:
-            raise Exception('temperature_idx must be between 0 and 14')
-
-        if fan_speed == 0:
-            ac_on = False
-            temperature_idx = 8
-
-        rcv_params = []
-        param1 = RvcReqParam()
-        param1.param_id = 19
-        param1.param_value = fan_speed.to_bytes(1, 'big')
-        rcv_params.append(param1)
-
-        if fan_speed > 0 or temperature_idx == 0:
-            param2 = RvcReqParam()
-            param2.param_id = 20
-            param2.param_value = temperature_idx.to_bytes(1, 'big')
-            rcv_params.append(param2)
-
-        if ac_on is not None:
-            param3 = RvcReqParam()
-            param3.param_id = 22
-            param3.param_value = bool_to_bit(ac_on)
-            rcv_params.append(param3)
-
-        param4 = RvcReqParam()
-        param4.param_id = 255
-        param4.param_value = b'\x00'
-        rcv_params.append(param4)
-        return self.send_vehicle_ctrl_cmd_with_retry(vin_info, b'\x06', rcv_params, True)
+        return self.send_rvc_command_with_retry(vin_info,
+                                                self.rvc_command_catalog.control_climate(fan_speed, ac_on,
+                                                                                         temperature_idx))
 
     def close_driver_window(self, vin_info: VinInfo) -> MessageV2:
-        rcv_params = []
-        param1 = RvcReqParam()
-        param1.param_id = 9
-        param1.param_value = b'\x01'
-        rcv_params.append(param1)
-
-        for i in [10, 11, 12, 13, 255]:
-            param = RvcReqParam()
-            param.param_id = i
-            param.param_value = b'\x00'
-            rcv_params.append(param)
-
-        return self.send_vehicle_ctrl_cmd_with_retry(vin_info, b'\x03', rcv_params, False)
+        return self.send_rvc_command_with_retry(vin_info, self.rvc_command_catalog.close_driver_window())
 
     def control_sunroof(self, should_open: bool, vin_info: VinInfo) -> MessageV2:
-        rcv_params = []
-        param1 = RvcReqParam()
-        param1.param_id = 8
-        param1.param_value = b'\x01'
-        rcv_params.append(param1)
-
-        for i in [9, 10, 11, 12, 255]:
-            param = RvcReqParam()
-            param.param_id = i
-            param.param_value = b'\x00'
-            rcv_params.append(param)
-
-        param = RvcReqParam()
-        param.param_id = 13
-        param.param_value = b'\x03' if should_open else b'\x00'
-        rcv_params.append(param)
-
-        return self.send_vehicle_ctrl_cmd_with_retry(vin_info, b'\x03', rcv_params, True)
+        return self.send_rvc_command_with_retry(vin_info, self.rvc_command_catalog.control_sunroof(should_open))
 
     def open_door_locks(self, vin_info: VinInfo) -> MessageV2:
         return self.__open_vehicle_lock(vin_info, 3)
@@ -392,67 +715,59 @@ class SaicApi:
         return self.__open_vehicle_lock(vin_info, 2)
 
     def __open_vehicle_lock(self, vin_info: VinInfo, lock_id: int) -> MessageV2:
-        rcv_params = []
-
-        for i in [4, 5, 6, 255]:
-            param = RvcReqParam()
-            param.param_id = i
-            param.param_value = b'\x00'
-            rcv_params.append(param)
-
-        param1 = RvcReqParam()
-        param1.param_id = 7
-        param1.param_value = lock_id.to_bytes(1, 'big')
-        rcv_params.append(param1)
-
-        return self.send_vehicle_ctrl_cmd_with_retry(vin_info, b'\x02', rcv_params, False)
+        return self.send_rvc_command_with_retry(vin_info, self.rvc_command_catalog.open_vehicle_lock(lock_id))
 
     def find_my_car(self, vin_info: VinInfo, with_horn: bool = True, with_lights: bool = True) -> MessageV2:
-        rcv_params = []
-
-        param = RvcReqParam()
-        param.param_id = 1
-        param.param_value = b'\x01'
-        rcv_params.append(param)
-
-        param = RvcReqParam()
-        param.param_id = 2
-        param.param_value = bool_to_bit(with_horn)
-        rcv_params.append(param)
-
-        param = RvcReqParam()
-        param.param_id = 3
-        param.param_value = bool_to_bit(with_lights)
-        rcv_params.append(param)
-
-        param = RvcReqParam()
-        param.param_id = 255
-        param.param_value = b'\x00'
-        rcv_params.append(param)
-
-        return self.send_vehicle_ctrl_cmd_with_retry(vin_info, b'\x00', rcv_params, True)
+        return self.send_rvc_command_with_retry(vin_info, self.rvc_command_catalog.find_my_car(with_horn, with_lights))
 
     def send_vehicle_ctrl_cmd_with_retry(self, vin_info: VinInfo, rvc_req_type: bytes, rvc_params: list,
-                                         has_app_data: bool, max_retries=3) -> MessageV2:
+                                         has_app_data: bool, max_retries=3, deadline: Deadline = None) -> MessageV2:
+        rvc_command = self.create_rvc_command(rvc_req_type, rvc_params, has_app_data)
+        return self.send_rvc_command_with_retry(vin_info, rvc_command, max_retries, deadline)
 
-        return self.handle_retry(
-            functools.partial(self.__send_vehicle_control_command, rvc_req_type, rvc_params),
-            vin_info=vin_info,
-            has_app_data=has_app_data,
-            max_retries=max_retries
-        )
-
-    def get_message_list_with_retry(self) -> list:
-        message_list_rsp_msg = self.handle_retry(self.get_message_list)
-
-        result = []
-        if message_list_rsp_msg.application_data is not None:
-            message_list_rsp = cast(MessageListResp, message_list_rsp_msg.application_data)
-            for message in message_list_rsp.messages:
-                result.append(convert(message))
-        return result
-
-    def handle_retry(self, func, vin_info: VinInfo = None, has_app_data: bool = True, max_retries: int = 3):
+    def send_rvc_command_with_retry(self, vin_info: VinInfo, rvc_command: RvcCommand, max_retries=3,
+                                    deadline: Deadline = None) -> MessageV2:
+        try:
+            return self.handle_retry(
+                functools.partial(self.__send_vehicle_control_command, rvc_command),
+                vin_info=vin_info,
+                has_app_data=rvc_command.has_app_data,
+                max_retries=max_retries,
+                deadline=deadline
+            )
+        finally:
+            # the command may have changed the vehicle status even if it failed
+            self.invalidate_status_cache(vin_info)
+
+    def __send_vehicle_control_command(self, rvc_command: RvcCommand, vin_info: VinInfo,
+                                       event_id: str = None) -> MessageV2:
+        return cast(MessageV2, self.send_api_request(
+            self.create_vehicle_control_request(self.get_token(), rvc_command, vin_info, event_id)))
+
+    def get_message_list_with_retry(self, deadline: Deadline = None) -> list:
+        message_list_rsp_msg = self.handle_retry(self.get_message_list, deadline=deadline)
+        return convert_message_list(message_list_rsp_msg)
+
+    def submit(self, func, vin_info: VinInfo = None, has_app_data: bool = True, max_retries: int = 3) -> PendingResult:
+        # sends the first request and leaves the follow-up requests to the command scheduler
+        pending_result = PendingResult(self, self.command_scheduler, func, vin_info, has_app_data, max_retries)
+        # a failing first request fails the pending result like a failing follow-up request
+        pending_result.poll()
+        return pending_result
+
+    def submit_rvc_command(self, vin_info: VinInfo, rvc_command: RvcCommand, max_retries=3) -> PendingResult:
+        pending_result = self.submit(functools.partial(self.__send_vehicle_control_command, rvc_command),
+                                     vin_info=vin_info, has_app_data=rvc_command.has_app_data,
+                                     max_retries=max_retries)
+        pending_result.add_done_callback(lambda _: self.invalidate_status_cache(vin_info))
+        return pending_result
+
+    def handle_retry(self, func, vin_info: VinInfo = None, has_app_data: bool = True, max_retries: int = 3,
+                     deadline: Deadline = None):
+        if deadline is not None:
+            # the deadline bounds the requests and the sleeps of all attempts
+            with deadline:
+                return self.handle_retry(func, vin_info, has_app_data, max_retries)
         if has_app_data:
             return self.__handle_retry_with_app_data(func, vin_info=vin_info, max_retries=max_retries)
         else:
@@ -484,13 +799,14 @@ class SaicApi:
         return rsp_msg
 
     def __handle_retry_with_app_data(self, func, vin_info: VinInfo, max_retries: int):
+        start = time.monotonic()
         if vin_info:
             rsp = func(vin_info)
         else:
             rsp = func()
         rsp_msg = cast(AbstractMessage, rsp)
         iteration = 1
-        while rsp_msg.application_data is None:
+        while not rsp_msg.has_application_data():
             error_message = rsp_msg.body.error_message
             if iteration > max_retries:
                 additional_info = '.'
@@ -498,10 +814,10 @@ class SaicApi:
                     additional_info = f', error message: {error_message}'
                 raise SaicApiException(f'API request failed after {iteration} retries{additional_info}')
             elif error_message is not None:
-                self.handle_error(rsp_msg.body, iteration)
+                self.handle_error(rsp_msg.body, iteration, time.monotonic() - start)
             else:
                 LOG.debug('API request returned no application data and no error message.')
-                time.sleep(float(AVG_SMS_DELIVERY_TIME))
+                self.sleep(self.get_retry_delay(rsp_msg.body, time.monotonic() - start, float(AVG_SMS_DELIVERY_TIME)))
 
             iteration += 1
 
@@ -509,134 +825,43 @@ class SaicApi:
                 rsp_msg = func(vin_info, rsp_msg.body.event_id)
             else:
                 rsp_msg = func(rsp_msg.body.event_id)
+        if iteration > 1:
+            # only requests that had to wait for the vehicle to wake up are learned
+            self.record_app_data_latency(rsp_msg.body, time.monotonic() - start)
         return rsp_msg
 
-    def __send_vehicle_control_command(self, rvc_req_type: bytes, rvc_params: list,
-                                       vin_info: VinInfo, event_id: str = None) -> MessageV2:
-        vehicle_control_req = OtaRvcReq()
-        vehicle_control_req.rvc_req_type = rvc_req_type
-        for p in rvc_params:
-            param = cast(RvcReqParam, p)
-            vehicle_control_req.rvc_params.append(param)
-
-        vehicle_control_cmd_req_msg = MessageV2(MessageBodyV2(), vehicle_control_req)
-        application_id = '510'
-        application_data_protocol_version = 25857
-        self.message_V2_1_coder.initialize_message(self.uid, self.get_token(), vin_info.vin, application_id,
-                                                   application_data_protocol_version, 1, vehicle_control_cmd_req_msg)
-        vehicle_control_cmd_req_msg.body.ack_required = False
-        if event_id is not None:
-            vehicle_control_cmd_req_msg.body.event_id = event_id
-        self.publish_json_request(application_id, application_data_protocol_version,
-                                  vehicle_control_cmd_req_msg.get_data())
-        vehicle_control_cmd_req_msg_hex = self.message_V2_1_coder.encode_request(vehicle_control_cmd_req_msg)
-        self.publish_raw_request(application_id, application_data_protocol_version, vehicle_control_cmd_req_msg_hex)
-        vehicle_control_cmd_rsp_msg_hex = self.send_request(vehicle_control_cmd_req_msg_hex,
-                                                            urllib.parse.urljoin(self.saic_uri, '/TAP.Web/ota.mpv21'))
-        self.publish_raw_response(application_id, application_data_protocol_version, vehicle_control_cmd_rsp_msg_hex)
-        vehicle_control_cmd_rsp_msg = MessageV2(MessageBodyV2(), OtaRvcStatus25857())
-        self.message_V2_1_coder.decode_response(vehicle_control_cmd_rsp_msg_hex, vehicle_control_cmd_rsp_msg)
-        self.publish_json_response(application_id, application_data_protocol_version,
-                                   vehicle_control_cmd_rsp_msg.get_data())
-        return vehicle_control_cmd_rsp_msg
-
     # CHARGING MANAGEMENT
 
     def get_charging_status(self, vin_info: VinInfo, event_id: str = None) -> MessageV30:
-        chrg_mgmt_data_req_msg = MessageV30(MessageBodyV30())
-        application_id = '516'
-        application_data_protocol_version = 768
-        self.message_V3_0_coder.initialize_message(self.uid, self.get_token(), vin_info.vin, application_id,
-                                                   application_data_protocol_version, 5, chrg_mgmt_data_req_msg)
-        chrg_mgmt_data_req_msg.body.ack_required = False
-        if event_id is not None:
-            chrg_mgmt_data_req_msg.body.event_id = event_id
-        self.publish_json_request(application_id, application_data_protocol_version, chrg_mgmt_data_req_msg.get_data())
-        chrg_mgmt_data_req_hex = self.message_V3_0_coder.encode_request(chrg_mgmt_data_req_msg)
-        self.publish_raw_request(application_id, application_data_protocol_version, chrg_mgmt_data_req_hex)
-        chrg_mgmt_data_rsp_hex = self.send_request(chrg_mgmt_data_req_hex,
-                                                   urllib.parse.urljoin(self.saic_uri, '/TAP.Web/ota.mpv30'))
-        self.publish_raw_response(application_id, application_data_protocol_version, chrg_mgmt_data_rsp_hex)
-        chrg_mgmt_data_rsp_msg = MessageV30(MessageBodyV30(), OtaChrgMangDataResp())
-        self.message_V3_0_coder.decode_response(chrg_mgmt_data_rsp_hex, chrg_mgmt_data_rsp_msg)
-        self.publish_json_response(application_id, application_data_protocol_version, chrg_mgmt_data_rsp_msg.get_data())
-        return chrg_mgmt_data_rsp_msg
+        return cast(MessageV30, self.send_api_request(
+            self.create_charging_status_request(self.get_token(), vin_info, event_id)))
 
-    def get_charging_status_with_retry(self, vin_info: VinInfo) -> MessageV30:
-        return self.handle_retry(self.get_charging_status, vin_info)
+    def get_charging_status_with_retry(self, vin_info: VinInfo, deadline: Deadline = None) -> MessageV30:
+        return self.get_cached_status((vin_info.vin, '516', 768),
+                                      lambda d: self.handle_retry(self.get_charging_status, vin_info, deadline=d),
+                                      deadline)
 
     def control_battery_heating(self, enable: bool, vin_info: VinInfo, event_id: str = None) -> MessageV30:
-        chrg_heat_req = OtaChrgHeatReq()
-        chrg_heat_req.ptcHeatReq = bool_to_int(enable)
-        chrg_heat_req_msg = MessageV30(MessageBodyV30(), chrg_heat_req)
-        application_id = '516'
-        application_data_protocol_version = 768
-        self.message_V3_0_coder.initialize_message(self.uid, self.get_token(), vin_info.vin, application_id,
-                                                   application_data_protocol_version, 9, chrg_heat_req_msg)
-        if event_id is not None:
-            chrg_heat_req_msg.body.event_id = event_id
-        self.publish_json_request(application_id, application_data_protocol_version, chrg_heat_req_msg.get_data())
-        chrg_heat_req_msg_hex = self.message_V3_0_coder.encode_request(chrg_heat_req_msg)
-        self.publish_raw_request(application_id, application_data_protocol_version, chrg_heat_req_msg_hex)
-        chrg_heat_rsp_msg_hex = self.send_request(chrg_heat_req_msg_hex,
-                                                  urllib.parse.urljoin(self.saic_uri, '/TAP.Web/ota.mpv30'))
-        self.publish_raw_response(application_id, application_data_protocol_version, chrg_heat_rsp_msg_hex)
-        chrg_heat_rsp_msg = MessageV30(MessageBodyV30(), OtaChrgHeatResp())
-        self.message_V3_0_coder.decode_response(chrg_heat_rsp_msg_hex, chrg_heat_rsp_msg)
-        self.publish_json_response(application_id, application_data_protocol_version, chrg_heat_rsp_msg.get_data())
-        return chrg_heat_rsp_msg
+        return cast(MessageV30, self.__send_control_request(
+            vin_info, self.create_battery_heating_request(self.get_token(), enable, vin_info, event_id)))
 
     def control_charging_port_lock(self, unlock: bool, vin_info: VinInfo, event_id: str = None):
-        chrg_ctrl_req = OtaChrgCtrlReq()
-        chrg_ctrl_req.chrgCtrlReq = 0
-        chrg_ctrl_req.tboxV2XReq = 0
-        chrg_ctrl_req.tboxEleccLckCtrlReq = 2 if unlock else 1
-        chrg_ctrl_req_msg = MessageV30(MessageBodyV30(), chrg_ctrl_req)
-        application_id = '516'
-        application_data_protocol_version = 768
-        self.message_V3_0_coder.initialize_message(self.uid, self.get_token(), vin_info.vin, application_id,
-                                                   application_data_protocol_version, 7, chrg_ctrl_req_msg)
-        if event_id is not None:
-            chrg_ctrl_req_msg.body.event_id = event_id
-        self.publish_json_request(application_id, application_data_protocol_version, chrg_ctrl_req_msg.get_data())
-        chrg_ctrl_req_msg_hex = self.message_V3_0_coder.encode_request(chrg_ctrl_req_msg)
-        self.publish_raw_request(application_id, application_data_protocol_version, chrg_ctrl_req_msg_hex)
-        chrg_ctrl_rsp_msg_hex = self.send_request(chrg_ctrl_req_msg_hex,
-                                                  urllib.parse.urljoin(self.saic_uri, '/TAP.Web/ota.mpv30'))
-        self.publish_raw_response(application_id, application_data_protocol_version, chrg_ctrl_rsp_msg_hex)
-        chrg_ctrl_rsp_msg = MessageV30(MessageBodyV30(), OtaChrgCtrlStsResp())
-        self.message_V3_0_coder.decode_response(chrg_ctrl_rsp_msg_hex, chrg_ctrl_rsp_msg)
-        self.publish_json_response(application_id, application_data_protocol_version, chrg_ctrl_rsp_msg.get_data())
-        return chrg_ctrl_rsp_msg
+        return cast(MessageV30, self.__send_control_request(
+            vin_info, self.create_charging_port_lock_request(self.get_token(), unlock, vin_info, event_id)))
 
     def control_charging(self, stop_charging: bool, vin_info: VinInfo, event_id: str = None) -> MessageV30:
-        chrg_ctrl_req = OtaChrgCtrlReq()
-        chrg_ctrl_req.chrgCtrlReq = 2 if stop_charging else 1
-        chrg_ctrl_req.tboxV2XReq = 0
-        chrg_ctrl_req.tboxEleccLckCtrlReq = 0
-        chrg_ctrl_req_msg = MessageV30(MessageBodyV30(), chrg_ctrl_req)
-        application_id = '516'
-        application_data_protocol_version = 768
-        self.message_V3_0_coder.initialize_message(self.uid, self.get_token(), vin_info.vin, application_id,
-                                                   application_data_protocol_version, 7, chrg_ctrl_req_msg)
-        if event_id is not None:
-            chrg_ctrl_req_msg.body.event_id = event_id
-        self.publish_json_request(application_id, application_data_protocol_version, chrg_ctrl_req_msg.get_data())
-        chrg_ctrl_req_msg_hex = self.message_V3_0_coder.encode_request(chrg_ctrl_req_msg)
-        self.publish_raw_request(application_id, application_data_protocol_version, chrg_ctrl_req_msg_hex)
-        chrg_ctrl_rsp_msg_hex = self.send_request(chrg_ctrl_req_msg_hex,
-                                                  urllib.parse.urljoin(self.saic_uri, '/TAP.Web/ota.mpv30'))
-        self.publish_raw_response(application_id, application_data_protocol_version, chrg_ctrl_rsp_msg_hex)
-        chrg_ctrl_rsp_msg = MessageV30(MessageBodyV30(), OtaChrgCtrlStsResp())
-        self.message_V3_0_coder.decode_response(chrg_ctrl_rsp_msg_hex, chrg_ctrl_rsp_msg)
-        self.publish_json_response(application_id, application_data_protocol_version, chrg_ctrl_rsp_msg.get_data())
-        return chrg_ctrl_rsp_msg
+        return cast(MessageV30, self.__send_control_request(
+            vin_info, self.create_charging_control_request(self.get_token(), stop_charging, vin_info, event_id)))
 
     def start_charging(self, vin_info: VinInfo, event_id: str = None) -> MessageV30:
         return self.control_charging(False, vin_info, event_id)
 
-    def start_charging_with_retry(self, vin_info: VinInfo) -> MessageV30:
-        return self.handle_retry(self.start_charging, vin_info)
+    def start_charging_with_retry(self, vin_info: VinInfo, deadline: Deadline = None) -> MessageV30:
+        return self.handle_retry(self.start_charging, vin_info, deadline=deadline)
+
+    def submit_charging_control(self, stop_charging: bool, vin_info: VinInfo, max_retries=3) -> PendingResult:
+        return self.submit(functools.partial(self.control_charging, stop_charging), vin_info,
+                           max_retries=max_retries)
 
     def set_target_battery_soc(
             self,
@@ -645,61 +870,23 @@ class SaicApi:
             charge_current_limit: ChargeCurrentLimitCode = ChargeCurrentLimitCode.C_IGNORE,
             event_id: str = None
     ):
-        chrg_setng_req = OtaChrgSetngReq()
-        chrg_setng_req.onBdChrgTrgtSOCReq = target_soc.value
-        chrg_setng_req.altngChrgCrntReq = charge_current_limit.value
-        chrg_setng_req.tboxV2XSpSOCReq = 0
-        chrg_setng_req_msg = MessageV30(MessageBodyV30(), chrg_setng_req)
-        application_id = '516'
-        application_data_protocol_version = 768
-        self.message_V3_0_coder.initialize_message(self.uid, self.get_token(), vin_info.vin, application_id,
-                                                   application_data_protocol_version, 3, chrg_setng_req_msg)
-        if event_id is not None:
-            chrg_setng_req_msg.body.event_id = event_id
-        self.publish_json_request(application_id, application_data_protocol_version, chrg_setng_req_msg.get_data())
-        chrg_setng_req_msg_hex = self.message_V3_0_coder.encode_request(chrg_setng_req_msg)
-        self.publish_raw_request(application_id, application_data_protocol_version, chrg_setng_req_msg_hex)
-        chrg_setng_rsp_msg_hex = self.send_request(chrg_setng_req_msg_hex,
-                                                   urllib.parse.urljoin(self.saic_uri, '/TAP.Web/ota.mpv30'))
-        self.publish_raw_response(application_id, application_data_protocol_version, chrg_setng_rsp_msg_hex)
-        chrg_setng_rsp_msg = MessageV30(MessageBodyV30(), OtaChrgSetngResp())
-        self.message_V3_0_coder.decode_response(chrg_setng_rsp_msg_hex, chrg_setng_rsp_msg)
-        self.publish_json_response(application_id, application_data_protocol_version, chrg_setng_rsp_msg.get_data())
-        return chrg_setng_rsp_msg
+        return cast(MessageV30, self.__send_control_request(
+            vin_info, self.create_target_battery_soc_request(self.get_token(), target_soc, vin_info,
+                                                             charge_current_limit, event_id)))
 
     def set_schedule_charging(self, start_time: datetime.time, end_time: datetime.time,
                               mode: ScheduledChargingMode,
                               vin_info: VinInfo,
                               event_id: str = None):
-        start_hour = start_time.hour
-        start_minute = start_time.minute
-        end_hour = end_time.hour
-        end_minute = end_time.minute
-        mode_value = mode.value
-        chrg_rsvan_req = OtaChrgRsvanReq()
-        chrg_rsvan_req.rsvanStHour = start_hour
-        chrg_rsvan_req.rsvanStMintu = start_minute
-        chrg_rsvan_req.rsvanSpHour = end_hour
-        chrg_rsvan_req.rsvanSpMintu = end_minute
-        chrg_rsvan_req.tboxAdpPubChrgSttnReq = 1
-        chrg_rsvan_req.tboxReserCtrlReq = mode_value
-        chrg_rsvan_msg = MessageV30(MessageBodyV30(), chrg_rsvan_req)
-        application_id = '516'
-        application_data_protocol_version = 768
-        self.message_V3_0_coder.initialize_message(self.uid, self.get_token(), vin_info.vin, application_id,
-                                                   application_data_protocol_version, 1, chrg_rsvan_msg)
-        if event_id is not None:
-            chrg_rsvan_msg.body.event_id = event_id
-        self.publish_json_request(application_id, application_data_protocol_version, chrg_rsvan_msg.get_data())
-        chrg_rsvan_req_msg_hex = self.message_V3_0_coder.encode_request(chrg_rsvan_msg)
-        self.publish_raw_request(application_id, application_data_protocol_version, chrg_rsvan_req_msg_hex)
-        chrg_rsvan_rsp_msg_hex = self.send_request(chrg_rsvan_req_msg_hex,
-                                                   urllib.parse.urljoin(self.saic_uri, '/TAP.Web/ota.mpv30'))
-        self.publish_raw_response(application_id, application_data_protocol_version, chrg_rsvan_rsp_msg_hex)
-        chrg_rsvan_rsp_msg = MessageV30(MessageBodyV30(), OtaChrgRsvanResp())
-        self.message_V3_0_coder.decode_response(chrg_rsvan_rsp_msg_hex, chrg_rsvan_rsp_msg)
-        self.publish_json_response(application_id, application_data_protocol_version, chrg_rsvan_rsp_msg.get_data())
-        return chrg_rsvan_rsp_msg
+        return cast(MessageV30, self.__send_control_request(
+            vin_info, self.create_schedule_charging_request(self.get_token(), start_time, end_time, mode, vin_info,
+                                                            event_id)))
+
+    def __send_control_request(self, vin_info: VinInfo, api_request: SaicApiRequest) -> AbstractMessage:
+        try:
+            return self.send_api_request(api_request)
+        finally:
+            self.invalidate_status_cache(vin_info)
 
     # Messages
     def get_message_list(self, event_id: str = None) -> MessageV11:
@@ -715,32 +902,8 @@ class SaicApi:
         return self.__get_message_list_of_group(start, end, 'NEWS', event_id)
 
     def __get_message_list_of_group(self, start: int, end: int, message_group: str, event_id: str = None) -> MessageV11:
-        message_list_request = MessageListReq()
-        message_list_request.start_end_number = StartEndNumber()
-        message_list_request.start_end_number.start_number = start
-        message_list_request.start_end_number.end_number = end
-        message_list_request.message_group = message_group
-
-        header = Header()
-        header.protocol_version = 18
-        message_body = MessageBodyV11()
-        message_list_req_msg = MessageV11(header, message_body, message_list_request)
-        application_id = '531'
-        application_data_protocol_version = 513
-        self.message_v1_1_coder.initialize_message(self.uid, self.get_token(), application_id,
-                                                   application_data_protocol_version, 1, message_list_req_msg)
-        if event_id is not None:
-            message_body.event_id = event_id
-        self.publish_json_request(application_id, application_data_protocol_version, message_list_req_msg.get_data())
-        message_list_req_hex = self.message_v1_1_coder.encode_request(message_list_req_msg)
-        self.publish_raw_request(application_id, application_data_protocol_version, message_list_req_hex)
-        message_list_rsp_hex = self.send_request(message_list_req_hex,
-                                                 urllib.parse.urljoin(self.saic_uri, '/TAP.Web/ota.mp'))
-        self.publish_raw_response(application_id, application_data_protocol_version, message_list_rsp_hex)
-        message_list_rsp_msg = MessageV11(header, MessageBodyV11(), MessageListResp())
-        self.message_v1_1_coder.decode_response(message_list_rsp_hex, message_list_rsp_msg)
-        self.publish_json_response(application_id, application_data_protocol_version, message_list_rsp_msg.get_data())
-        return message_list_rsp_msg
+        return cast(MessageV11, self.send_api_request(
+            self.create_message_list_request(self.get_token(), start, end, message_group, event_id)))
 
     def delete_all_alarms(self, event_id: str = None):
         self.__change_message_status(None, 'DELETE_ALARM', event_id)
@@ -758,78 +921,27 @@ class SaicApi:
         self.__change_message_status(message_id, 'DELETE', event_id)
 
     def __change_message_status(self, message_id: int | None, action_type: str, event_id: str = None):
-        abort_send_msg_req = AbortSendMessageReq()
-        abort_send_msg_req.action_type = action_type
-        if message_id is not None:
-            abort_send_msg_req.message_id = message_id
-
-        header = Header()
-        header.protocol_version = 17
-        message_body = MessageBodyV11()
-        message_delete_req_msg = MessageV11(header, message_body, abort_send_msg_req)
-        application_id = '615'
-        application_protocol_version = 513
-        self.message_v1_1_coder.initialize_message(self.uid, self.get_token(), application_id,
-                                                   application_protocol_version, 1, message_delete_req_msg)
-        if event_id is not None:
-            message_body.event_id = event_id
-        self.publish_json_request(application_id, application_protocol_version, abort_send_msg_req.get_data())
-        message_delete_req_hex = self.message_v1_1_coder.encode_request(message_delete_req_msg)
-        self.publish_raw_request(application_id, application_protocol_version, message_delete_req_hex)
-        message_delete_rsp_hex = self.send_request(message_delete_req_hex,
-                                                   urllib.parse.urljoin(self.saic_uri, '/TAP.Web/ota.mp'))
-        self.publish_raw_response(application_id, application_protocol_version, message_delete_rsp_hex)
-        message_delete_rsp_msg = MessageV11(header, MessageBodyV11())
-        self.message_v1_1_coder.decode_response(message_delete_rsp_hex, message_delete_rsp_msg)
-        self.publish_json_response(application_id, application_protocol_version, message_delete_rsp_msg.get_data())
+        message_delete_rsp_msg = self.send_api_request(
+            self.create_message_status_request(self.get_token(), message_id, action_type, event_id))
         if message_delete_rsp_msg.body.error_message is not None:
             raise SaicApiException(message_delete_rsp_msg.body.error_message,
                                    message_delete_rsp_msg.body.result)
 
-    def publish_raw_value(self, key: str, raw: str):
-        if self.on_publish_raw_value is not None:
-            self.on_publish_raw_value(key, raw)
-        else:
-            LOG.debug(f'{key}: {raw}')
-
-    def publish_raw_request(self, application_id: str, application_data_protocol_version: int, raw: str):
-        key = f'{application_id}_{application_data_protocol_version}/raw/request'
-        self.publish_raw_value(key, raw)
-
-    def publish_raw_response(self, application_id: str, application_data_protocol_version: int, raw: str):
-        key = f'{application_id}_{application_data_protocol_version}/raw/response'
-        self.publish_raw_value(key, raw)
-
-    def publish_json_request(self, application_id: str, application_data_protocol_version: int, data: dict):
-        key = f'{application_id}_{application_data_protocol_version}/json/request'
-        self.publish_json(key, data)
-
-    def publish_json_response(self, application_id: str, application_data_protocol_version: int, data: dict):
-        key = f'{application_id}_{application_data_protocol_version}/json/response'
-        self.publish_json(key, data)
-
-    def publish_json(self, key: str, data: dict):
-        if self.on_publish_json_value is not None:
-            self.on_publish_json_value(key, data)
-        else:
-            LOG.debug(f'{key}: {data}')
-
     def send_request(self, hex_message: str, endpoint) -> str:
-        headers = {
-            'Accept': '*/*',
-            'Content-Type': 'text/html',
-            'Accept-Encoding': 'gzip, deflate, br',
-            'User-Agent': 'MG iSMART/1.1.1 (iPhone; iOS 16.3; Scale/3.00)',
-            'Accept-Language': 'de-DE;q=1, en-DE;q=0.9, lu-DE;q=0.8, fr-DE;q=0.7',
-            'Content-Length': str(len(hex_message))
-        }
+        timeout = self.http_session_config.timeout
+        deadline = get_current_deadline()
+        if deadline is not None:
+            deadline.check()
+            timeout = tuple(deadline.get_timeout(t) for t in timeout)
         try:
-            response = requests.post(url=endpoint, data=hex_message, headers=headers, cookies=self.cookies)
+            response = self.session.post(url=endpoint, data=hex_message, cookies=self.cookies, timeout=timeout)
             self.cookies = response.cookies
             return response.content.decode()
         except requests.exceptions.ConnectionError as ece:
             raise SaicApiException(f'Connection error: {ece}')
         except requests.exceptions.Timeout as et:
+            if deadline is not None:
+                deadline.check()
             raise SaicApiException(f'Timeout error: {et}')
         except requests.exceptions.HTTPError as ehttp:
             status_code = ehttp.response.status_code
@@ -838,50 +950,56 @@ class SaicApi:
             raise SaicApiException(f'{e}')
 
     def get_token(self):
-        if self.token_expiration is not None:
-            token_expiration = cast(Timestamp, self.token_expiration)
-            if token_expiration.get_timestamp() < datetime.datetime.now():
-                self.login()
+        if self.is_token_expired():
+            # threads polling several vehicles of the account share a single new login
+            with self.__login_lock:
+                if self.is_token_expired():
+                    self.login()
         return self.token
 
+    def relogin_if_needed(self, rejected_token: str) -> None:
+        # pending results rejected with the same token share a single new login
+        with self.__login_lock:
+            if self.token == rejected_token or self.is_token_expired():
+                self.login()
+
     def get_user_timezone(self):
-        return self.rest_v2_api.get_user_timezone(self.get_token(), self.uid)
+        token = self.get_token()
+        self.wait(self.get_rate_limit_delay(ENDPOINT_FAMILY_REST_V2))
+        return self.rest_v2_api.get_user_timezone(token, self.uid)
+
+    def handle_error(self, message_body: AbstractMessageBody, iteration: int, elapsed: float = None):
+        waiting_time, relogin = self.get_error_handling(message_body, iteration, elapsed)
+        if waiting_time > 0:
+            self.sleep(waiting_time)
+        if relogin:
+            self.login()
 
-    def handle_error(self, message_body: AbstractMessageBody, iteration: int):
-        if iteration > 0:
-            waiting_time = AVG_SMS_DELIVERY_TIME * iteration
+    def sleep(self, waiting_time: float) -> None:
+        deadline = get_current_deadline()
+        if deadline is None:
+            time.sleep(waiting_time)
         else:
-            waiting_time = AVG_SMS_DELIVERY_TIME
-        message = f'application ID: {message_body.application_id},' \
-                  + f' protocol version: {message_body.application_data_protocol_version},' \
-                  + f' message: {message_body.error_message}' \
-                  + f' result code: {message_body.result}'
-
-        if message_body.result == 2:
-            # re-login
-            LOG.debug(message)
-            if self.relogin_delay > 0:
-                LOG.warning(f'The SAIC user has been logged out. '
-                            + f'Waiting {self.relogin_delay} seconds before attempting another login')
-                time.sleep(float(self.relogin_delay))
-            self.login()
-        elif message_body.result == 4:
-            # The remote control instruction failed, please try again later.
-            LOG.debug(message)
-            time.sleep(float(waiting_time))
-        elif message_body.result == 6:
-            # The service is not available,please try again later
-            LOG.debug(message)
-            time.sleep(float(waiting_time))
-        elif message_body.result == -1:
-            LOG.warning(message)
+            deadline.sleep(waiting_time)
+
+    def wait(self, waiting_time: float) -> None:
+        # unlike sleep, the waiting time is not shortened to fit the deadline
+        if waiting_time <= 0:
+            return
+        deadline = get_current_deadline()
+        if deadline is None:
+            time.sleep(waiting_time)
         else:
-            LOG.error(message)
-            raise SaicApiException(message_body.error_message, message_body.result)
+            deadline.wait(waiting_time)
 
 
-def bool_to_bit(flag):
-    return b'\x01' if flag else b'\x00'
+def convert_message_list(message_list_rsp_msg: MessageV11) -> list:
+    result = []
+    if message_list_rsp_msg.application_data is not None:
+        message_list_rsp = cast(MessageListResp, message_list_rsp_msg.application_data)
+        for message in message_list_rsp.messages:
+            result.append(convert(message))
+    return result
 
 
 def bool_to_int(flag):
@@ -0,0 +1,102 @@
+import asyncio
+import threading
+from concurrent.futures import Future, wait
+from typing import Awaitable, Callable, Hashable, TypeVar
+
+from saic_ismart_client.deadline import Deadline, get_current_deadline
+from saic_ismart_client.exceptions import SaicApiCancelled, SaicApiDeadlineExceeded
+
+T = TypeVar('T')
+
+# the deadline and the cancellation of the leading caller are not shared, waiting callers retry the call instead
+LEADER_ONLY_EXCEPTIONS = (SaicApiDeadlineExceeded, SaicApiCancelled)
+CANCELLATION_POLL_INTERVAL = 0.05
+RETRY_CALL = object()
+
+
+def get_wait_timeout(deadline: Deadline | None) -> float | None:
+    if deadline is None:
+        return None
+    timeout = deadline.remaining()
+    if deadline.cancellation_token is not None:
+        # the cancellation token cannot be waited for together with the call
+        timeout = CANCELLATION_POLL_INTERVAL if timeout is None else min(timeout, CANCELLATION_POLL_INTERVAL)
+    return timeout
+
+
+class SingleFlight:
+    # concurrent calls with the same key share the call of the first caller and its result or exception
+    def __init__(self):
+        self.__lock = threading.Lock()
+        self.__calls = {}
+
+    def do(self, key: Hashable, func: Callable[[], T], deadline: Deadline = None) -> T:
+        if deadline is None:
+            deadline = get_current_deadline()
+        while True:
+            with self.__lock:
+                future = self.__calls.get(key)
+                is_leader = future is None
+                if is_leader:
+                    future = Future()
+                    self.__calls[key] = future
+            if is_leader:
+                return self.__lead(key, future, func)
+            result = self.__follow(future, deadline)
+            if result is not RETRY_CALL:
+                return result
+
+    def is_in_flight(self, key: Hashable) -> bool:
+        with self.__lock:
+            return key in self.__calls
+
+    def __lead(self, key: Hashable, future: Future, func: Callable[[], T]) -> T:
+        try:
+            result = func()
+        except LEADER_ONLY_EXCEPTIONS:
+            future.set_result(RETRY_CALL)
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self.__lock:
+                del self.__calls[key]
+
+    @staticmethod
+    def __follow(future: Future, deadline: Deadline | None):
+        while not future.done():
+            if deadline is not None:
+                deadline.check()
+            wait([future], get_wait_timeout(deadline))
+        return future.result()
+
+
+class AsyncSingleFlight:
+    def __init__(self):
+        self.__calls = {}
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[T]], deadline: Deadline = None) -> T:
+        if deadline is None:
+            deadline = get_current_deadline()
+        while True:
+            task = self.__calls.get(key)
+            if task is None or task.done():
+                task = asyncio.ensure_future(func())
+                self.__calls[key] = task
+                task.add_done_callback(lambda _: self.__calls.pop(key, None))
+                # a cancelled caller must not cancel the call shared with the other callers
+                return await asyncio.shield(task)
+            while not task.done():
+                if deadline is not None:
+                    deadline.check()
+                await asyncio.wait([task], timeout=get_wait_timeout(deadline))
+            if task.cancelled() or isinstance(task.exception(), LEADER_ONLY_EXCEPTIONS):
+                continue
+            return task.result()
+
+    def is_in_flight(self, key: Hashable) -> bool:
+        return key in self.__calls
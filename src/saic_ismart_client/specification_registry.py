@@ -0,0 +1,165 @@
+import hashlib
+import logging
+import os
+import pathlib
+import pickle
+import stat
+import sys
+import tempfile
+import threading
+from typing import Callable
+
+import asn1tools
+from asn1tools.compiler import Specification
+
+LOG = logging.getLogger(__name__)
+LOG.setLevel(level=os.getenv('LOG_LEVEL', 'INFO').upper())
+
+ENV_CACHE_DIR = 'SAIC_ASN1_CACHE_DIR'
+
+
+class SpecificationDiskCache:
+    def __init__(self, cache_dir: str | pathlib.Path):
+        self.cache_dir = pathlib.Path(cache_dir)
+
+    @staticmethod
+    def get_key(asn_files: list, codec: str) -> str:
+        digest = hashlib.sha256()
+        digest.update(f'asn1tools={asn1tools.__version__};'.encode())
+        digest.update(f'python={sys.version_info.major}.{sys.version_info.minor};'.encode())
+        digest.update(f'codec={codec};'.encode())
+        for asn_file in sorted(asn_files, key=lambda f: pathlib.Path(f).name):
+            digest.update(pathlib.Path(asn_file).name.encode())
+            digest.update(pathlib.Path(asn_file).read_bytes())
+        return digest.hexdigest()
+
+    def get_path(self, key: str) -> pathlib.Path:
+        return self.cache_dir / f'{key}.pickle'
+
+    def is_secure(self, path: pathlib.Path) -> bool:
+        # unpickling runs code, so only files that nobody else can have written are loaded
+        if not self.__is_private(self.cache_dir, 0o077):
+            LOG.warning(f'Ignoring the compiled specifications in {self.cache_dir}, '
+                        f'the directory must be owned by the current user with mode 0700')
+            return False
+        if not self.__is_private(path, 0o022):
+            LOG.warning(f'Ignoring compiled specification {path}, it must be owned by the current user '
+                        f'and not be writable by others')
+            return False
+        return True
+
+    @staticmethod
+    def __is_private(path: pathlib.Path, forbidden_mode: int) -> bool:
+        path_stat = os.stat(path, follow_symlinks=False)
+        if stat.S_ISLNK(path_stat.st_mode):
+            return False
+        if hasattr(os, 'getuid') and path_stat.st_uid != os.getuid():
+            return False
+        return path_stat.st_mode & forbidden_mode == 0
+
+    def load(self, key: str) -> Specification | None:
+        path = self.get_path(key)
+        try:
+            if not self.is_secure(path):
+                return None
+            with open(path, 'rb') as f:
+                return pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            LOG.debug(f'Ignoring unreadable compiled specification {path}: {e}')
+            return None
+
+    def store(self, key: str, specification: Specification) -> None:
+        try:
+            self.cache_dir.mkdir(mode=0o700, parents=True, exist_ok=True)
+            if not self.__is_private(self.cache_dir, 0o077):
+                LOG.warning(f'Not storing compiled specifications in {self.cache_dir}, '
+                            f'the directory must be owned by the current user with mode 0700')
+                return
+            # write to a temporary file first, so that concurrent readers never see a partial file
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    pickle.dump(specification, f, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(tmp_path, self.get_path(key))
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+        except Exception as e:
+            LOG.debug(f'Unable to store compiled specification in {self.cache_dir}: {e}')
+
+
+def get_default_disk_cache() -> SpecificationDiskCache | None:
+    # the disk cache is only used when a directory has been configured
+    cache_dir = os.getenv(ENV_CACHE_DIR)
+    if not cache_dir:
+        return None
+    return SpecificationDiskCache(cache_dir)
+
+
+class SpecificationRegistry:
+    def __init__(self, disk_cache: SpecificationDiskCache | None = None):
+        self.disk_cache = disk_cache
+        self.__lock = threading.Lock()
+        self.__specifications = {}
+        self.__hits = 0
+        self.__misses = 0
+
+    @property
+    def hits(self) -> int:
+        return self.__hits
+
+    @property
+    def misses(self) -> int:
+        return self.__misses
+
+    def get_specification(self, asn_files_dir: pathlib.Path, asn_files: list, codec: str,
+                          compiler: Callable[[list], object] = None) -> Specification:
+        # a custom compiler is used for codecs that asn1tools does not provide, the codec name must be unique
+        key = (str(pathlib.Path(asn_files_dir).resolve()), codec)
+        with self.__lock:
+            specification = self.__specifications.get(key)
+            if specification is not None:
+                self.__hits += 1
+                return specification
+            self.__misses += 1
+            # compiling while holding the lock ensures that every schema directory is compiled only once
+            specification = self.__load_or_compile(asn_files, codec, compiler)
+            self.__specifications[key] = specification
+            return specification
+
+    def __load_or_compile(self, asn_files: list, codec: str, compiler: Callable[[list], object] | None) \
+            -> Specification:
+        if self.disk_cache is None:
+            return self.__compile(asn_files, codec, compiler)
+
+        cache_key = SpecificationDiskCache.get_key(asn_files, codec)
+        specification = self.disk_cache.load(cache_key)
+        if specification is None:
+            specification = self.__compile(asn_files, codec, compiler)
+            self.disk_cache.store(cache_key, specification)
+        return specification
+
+    @staticmethod
+    def __compile(asn_files: list, codec: str, compiler: Callable[[list], object] | None) -> Specification:
+        if compiler is None:
+            return asn1tools.compile_files(asn_files, codec)
+        return compiler(asn_files)
+
+    def get_stats(self) -> dict:
+        with self.__lock:
+            return {
+                'hits': self.__hits,
+                'misses': self.__misses,
+                'size': len(self.__specifications)
+            }
+
+    def clear(self) -> None:
+        with self.__lock:
+            self.__specifications.clear()
+            self.__hits = 0
+            self.__misses = 0
+
+
+SPECIFICATION_REGISTRY = SpecificationRegistry(get_default_disk_cache())
@@ -0,0 +1,106 @@
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, TypeVar
+
+logging.basicConfig(format='%(asctime)s %(message)s')
+LOG = logging.getLogger(__name__)
+LOG.setLevel(level=os.getenv('LOG_LEVEL', 'INFO').upper())
+
+T = TypeVar('T')
+
+
+class StatusCacheEntry:
+    def __init__(self, value, loaded_at: float):
+        self.value = value
+        self.loaded_at = loaded_at
+        self.refreshing = False
+
+
+class StatusCache:
+    # keys are (vin, application_id, application_data_protocol_version) tuples, ttls maps application IDs to TTLs
+    def __init__(self, ttl: float = 30.0, max_stale: float = 300.0, ttls: dict = None, max_workers: int = 2,
+                 clock: Callable[[], float] = time.monotonic):
+        if ttl < 0 or max_stale < 0:
+            raise ValueError('ttl and max_stale must not be negative')
+        self.ttl = ttl
+        self.max_stale = max_stale
+        self.ttls = ttls if ttls is not None else {}
+        self.max_workers = max_workers
+        self.clock = clock
+        self.__lock = threading.Lock()
+        self.__entries = {}
+        self.__generation = 0
+        self.__executor = None
+        self.__closed = False
+
+    def close(self, wait: bool = False) -> None:
+        # stale entries are not refreshed any more after closing, they are served until they expire
+        with self.__lock:
+            self.__closed = True
+            executor = self.__executor
+            self.__executor = None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=not wait)
+
+    def get_ttl(self, key: tuple) -> float:
+        return self.ttls.get(key[1], self.ttl)
+
+    def get(self, key: tuple, load: Callable[[], T], refresh: Callable[[], T] = None) -> T:
+        # refresh loads stale entries in the background, it defaults to load
+        ttl = self.get_ttl(key)
+        with self.__lock:
+            generation = self.__generation
+            entry = self.__entries.get(key)
+            if entry is not None:
+                age = self.clock() - entry.loaded_at
+                if age < ttl:
+                    return entry.value
+                if age < ttl + self.max_stale:
+                    # stale while revalidate, only one refresh per entry at a time
+                    if not entry.refreshing and not self.__closed:
+                        entry.refreshing = True
+                        self.__get_executor().submit(self.__refresh, key, refresh if refresh is not None else load,
+                                                     generation)
+                    return entry.value
+        value = load()
+        self.__store(key, value, generation)
+        return value
+
+    def invalidate(self, vin: str = None) -> None:
+        with self.__lock:
+            if vin is None:
+                self.__entries.clear()
+            else:
+                for key in [key for key in self.__entries if key[0] == vin]:
+                    del self.__entries[key]
+            # values loaded before the invalidation are not stored
+            self.__generation += 1
+
+    def __len__(self) -> int:
+        with self.__lock:
+            return len(self.__entries)
+
+    def __get_executor(self) -> ThreadPoolExecutor:
+        if self.__executor is None:
+            self.__executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='status-cache')
+        return self.__executor
+
+    def __refresh(self, key: tuple, load: Callable[[], T], generation: int) -> None:
+        try:
+            value = load()
+        except Exception as e:
+            LOG.warning(f'Refreshing the cached status {key} failed: {e}')
+            with self.__lock:
+                entry = self.__entries.get(key)
+                if entry is not None:
+                    entry.refreshing = False
+            return
+        self.__store(key, value, generation)
+
+    def __store(self, key: tuple, value, generation: int) -> None:
+        with self.__lock:
+            if generation == self.__generation:
+                self.__entries[key] = StatusCacheEntry(value, self.clock())
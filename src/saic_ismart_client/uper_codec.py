@@ -0,0 +1,243 @@
+import asn1tools
+
+# codec name used for the specification cache, increase the version whenever the compiled classes change
+UPER_CODEC = 'saic-uper-1'
+NUMERIC_STRING_ALPHABET = ' 0123456789'
+
+
+class UnsupportedSchemaError(Exception):
+    # the ASN.1 schema uses types or constraints that the UPER codec cannot compile
+    pass
+
+
+class UperBitReader:
+    def __init__(self, data: bytes | memoryview):
+        self.value = int.from_bytes(data, 'big')
+        self.remaining_bits = len(data) * 8
+
+    def read(self, bits: int) -> int:
+        if bits > self.remaining_bits:
+            raise ValueError(f'Out of data, {bits} bits requested but only {self.remaining_bits} bits left')
+        self.remaining_bits -= bits
+        return (self.value >> self.remaining_bits) & ((1 << bits) - 1)
+
+    def read_bytes(self, length: int) -> bytes:
+        return self.read(length * 8).to_bytes(length, 'big')
+
+
+class UperBitWriter:
+    def __init__(self):
+        self.value = 0
+        self.bits = 0
+
+    def write(self, value: int, bits: int) -> None:
+        self.value = (self.value << bits) | value
+        self.bits += bits
+
+    def write_bytes(self, value: bytes) -> None:
+        self.write(int.from_bytes(value, 'big'), len(value) * 8)
+
+    def to_bytes(self) -> bytes:
+        padding_bits = -self.bits % 8
+        return (self.value << padding_bits).to_bytes((self.bits + padding_bits) // 8, 'big')
+
+
+class UperType:
+    def __init__(self, name: str):
+        self.name = name
+
+    def encode(self, writer: UperBitWriter, value) -> None:
+        pass
+
+    def decode(self, reader: UperBitReader):
+        pass
+
+
+class UperInteger(UperType):
+    def __init__(self, name: str, minimum: int, maximum: int):
+        super().__init__(name)
+        self.minimum = minimum
+        self.maximum = maximum
+        self.bits = (maximum - minimum).bit_length()
+
+    def encode(self, writer: UperBitWriter, value: int) -> None:
+        if not self.minimum <= value <= self.maximum:
+            raise ValueError(f'{self.name}: expected an integer between {self.minimum} and {self.maximum}, '
+                             + f'but got {value}')
+        writer.write(value - self.minimum, self.bits)
+
+    def decode(self, reader: UperBitReader) -> int:
+        return reader.read(self.bits) + self.minimum
+
+
+class UperBoolean(UperType):
+    def encode(self, writer: UperBitWriter, value: bool) -> None:
+        writer.write(1 if value else 0, 1)
+
+    def decode(self, reader: UperBitReader) -> bool:
+        return reader.read(1) == 1
+
+
+class UperEnumerated(UperType):
+    def __init__(self, name: str, values: list):
+        super().__init__(name)
+        # the root index follows the order of the enumeration values
+        self.names = [value_name for value_name, _ in sorted(values, key=lambda v: v[1])]
+        self.indices = {value_name: index for index, value_name in enumerate(self.names)}
+        self.bits = (len(self.names) - 1).bit_length()
+
+    def encode(self, writer: UperBitWriter, value: str) -> None:
+        if value not in self.indices:
+            raise ValueError(f'{self.name}: expected one of {self.names}, but got {value}')
+        writer.write(self.indices[value], self.bits)
+
+    def decode(self, reader: UperBitReader) -> str:
+        index = reader.read(self.bits)
+        if index >= len(self.names):
+            raise ValueError(f'{self.name}: invalid enumeration index {index}')
+        return self.names[index]
+
+
+class UperFixedSizeIA5String(UperType):
+    def __init__(self, name: str, size: int):
+        super().__init__(name)
+        self.size = size
+
+    def encode(self, writer: UperBitWriter, value: str) -> None:
+        # like asn1tools, the size is not validated when encoding
+        for c in value.encode('ascii'):
+            writer.write(c, 7)
+
+    def decode(self, reader: UperBitReader) -> str:
+        value = reader.read(self.size * 7)
+        return bytes((value >> (7 * i)) & 0x7f for i in range(self.size - 1, -1, -1)).decode('ascii')
+
+
+class UperFixedSizeNumericString(UperType):
+    def __init__(self, name: str, size: int):
+        super().__init__(name)
+        self.size = size
+
+    def encode(self, writer: UperBitWriter, value: str) -> None:
+        # like asn1tools, the size is not validated when encoding
+        for c in value:
+            index = NUMERIC_STRING_ALPHABET.find(c)
+            if index < 0:
+                raise ValueError(f'{self.name}: invalid numeric string character {c!r}')
+            writer.write(index, 4)
+
+    def decode(self, reader: UperBitReader) -> str:
+        value = reader.read(self.size * 4)
+        return ''.join(NUMERIC_STRING_ALPHABET[(value >> (4 * i)) & 0xf] for i in range(self.size - 1, -1, -1))
+
+
+class UperOctetString(UperType):
+    def __init__(self, name: str, minimum: int, maximum: int):
+        super().__init__(name)
+        self.minimum = minimum
+        self.maximum = maximum
+        self.length_bits = (maximum - minimum).bit_length()
+
+    def encode(self, writer: UperBitWriter, value: bytes) -> None:
+        if not self.minimum <= len(value) <= self.maximum:
+            raise ValueError(f'{self.name}: expected between {self.minimum} and {self.maximum} bytes, '
+                             + f'but got {len(value)}')
+        writer.write(len(value) - self.minimum, self.length_bits)
+        writer.write_bytes(value)
+
+    def decode(self, reader: UperBitReader) -> bytes:
+        return reader.read_bytes(reader.read(self.length_bits) + self.minimum)
+
+
+class UperSequence(UperType):
+    def __init__(self, name: str, members: list):
+        super().__init__(name)
+        # list of (member type, optional)
+        self.members = members
+        self.optional_count = sum(1 for _, optional in members if optional)
+
+    def encode(self, writer: UperBitWriter, value: dict) -> None:
+        for member, optional in self.members:
+            if optional:
+                writer.write(1 if value.get(member.name) is not None else 0, 1)
+        for member, optional in self.members:
+            member_value = value.get(member.name)
+            if member_value is not None:
+                member.encode(writer, member_value)
+            elif not optional:
+                raise ValueError(f'{self.name}: mandatory member {member.name} missing')
+
+    def decode(self, reader: UperBitReader) -> dict:
+        presence_bits = reader.read(self.optional_count)
+        presence_mask = 1 << self.optional_count
+        value = {}
+        for member, optional in self.members:
+            if optional:
+                presence_mask >>= 1
+                if not presence_bits & presence_mask:
+                    continue
+            value[member.name] = member.decode(reader)
+        return value
+
+
+class UperCodec:
+    def __init__(self, types: dict):
+        self.types = types
+
+    def encode(self, type_name: str, value: dict) -> bytes:
+        writer = UperBitWriter()
+        self.types[type_name].encode(writer, value)
+        return writer.to_bytes()
+
+    def decode(self, type_name: str, data: bytes | memoryview) -> dict:
+        return self.types[type_name].decode(UperBitReader(data))
+
+
+def compile_uper_codec(asn_files: list) -> UperCodec:
+    # supports the small subset of ASN.1 used by the dispatcher bodies, raises UnsupportedSchemaError for anything else
+    type_definitions = {}
+    for module in asn1tools.parse_files(asn_files).values():
+        type_definitions.update(module['types'])
+    return UperCodec({name: create_uper_type(name, definition, type_definitions)
+                      for name, definition in type_definitions.items()})
+
+
+def create_uper_type(name: str, definition: dict, type_definitions: dict) -> UperType:
+    match definition['type']:
+        case 'INTEGER':
+            restricted_to = definition.get('restricted-to')
+            if restricted_to is None or len(restricted_to) != 1 or not isinstance(restricted_to[0], tuple):
+                raise UnsupportedSchemaError(f'{name}: only single range constrained integers are supported')
+            minimum, maximum = restricted_to[0]
+            return UperInteger(name, minimum, maximum)
+        case 'BOOLEAN':
+            return UperBoolean(name)
+        case 'ENUMERATED':
+            if any(v == '...' for v in definition['values']):
+                raise UnsupportedSchemaError(f'{name}: extensible enumerations are not supported')
+            return UperEnumerated(name, definition['values'])
+        case 'IA5String' | 'NumericString' as string_type:
+            size = definition.get('size')
+            if size is None or len(size) != 1 or not isinstance(size[0], int) or size[0] >= 65536:
+                raise UnsupportedSchemaError(f'{name}: only fixed size strings are supported')
+            if string_type == 'IA5String':
+                return UperFixedSizeIA5String(name, size[0])
+            return UperFixedSizeNumericString(name, size[0])
+        case 'OCTET STRING':
+            size = definition.get('size')
+            if size is None or len(size) != 1 or not isinstance(size[0], tuple) or size[0][1] >= 65536:
+                raise UnsupportedSchemaError(f'{name}: only size constrained octet strings are supported')
+            minimum, maximum = size[0]
+            return UperOctetString(name, minimum, maximum)
+        case 'SEQUENCE':
+            members = []
+            for member in definition['members']:
+                if member is None or member == '...' or 'default' in member:
+                    raise UnsupportedSchemaError(f'{name}: extensions and default values are not supported')
+                members.append((create_uper_type(member['name'], member, type_definitions),
+                                member.get('optional', False)))
+            return UperSequence(name, members)
+        case type_reference if type_reference in type_definitions:
+            return create_uper_type(name, type_definitions[type_reference], type_definitions)
+        case unsupported_type:
+            raise UnsupportedSchemaError(f'{name}: unsupported type {unsupported_type}')
@@ -0,0 +1,6 @@
+import os
+import tempfile
+
+# the tests never use the compiled specifications of the developer, the directory is created with mode 0700
+ASN1_CACHE_DIR = tempfile.TemporaryDirectory(prefix='saic-asn1-')
+os.environ['SAIC_ASN1_CACHE_DIR'] = ASN1_CACHE_DIR.name
@@ -9,18 +9,25 @@ from saic_ismart_client.ota_v1_1.data_model import MpUserLoggingInReq, MessageBo
     StartEndNumber
 
 
+LOGIN_REQUEST_HEX = '01F5111005600882CB162C58B162C58B162C58B162C58B162C58B162C58B162C58B162C58B162C58' \
+    + 'B162C58B162C58B162C58B161AB062C66C8240020200468ACF1343530ECA864468ACF1342468ACF1' \
+    + '342000001440100A08952A54A952A54AABAC30B162C586162C58B161858B162C30B162C587562C58' \
+    + '60C2C58B162FD8B162C58B0C1858B162C58B162C58BF62C586162C58B162C58B0B6C306161858B16' \
+    + '1830B162C30B162C58B162C586162C58B162C58617EFD8B162C586162C58B162C30B162C30B16183' \
+    + '0B162C58B162C58B162C58B162C306161858B162C58B162C58B161858B162C58B162C586162C58B0' \
+    + '8D1A3CBD796FE1971E1E4'
+MESSAGE_LIST_REQUEST_HEX = '011B112007900C82C60C183060C183060C183060C183060C183060C183060C183060C183060C183' \
+    + '072C183060C183060E5CB972E5CB9B0E5CB973616B96162C2D72E6C395AE5CD872B5CD8B0E6C586' \
+    + '161CD87362C587361AB362C6A67E00020200468ACF134468ACF1342468ACF1342468ACF13420000' \
+    + '00240100A080000000000080000000000A120CC834A680'
+
+
 class TestMessageCoderV11(TestCase):
     def setUp(self) -> None:
         self.message_coder = MessageCoderV11()
 
     def test_encode_login_request(self):
-        expected_hex = '01F5111005600882CB162C58B162C58B162C58B162C58B162C58B162C58B162C58B162C58B162C58'\
-                       + 'B162C58B162C58B162C58B161AB062C66C8240020200468ACF1343530ECA864468ACF1342468ACF1'\
-                       + '342000001440100A08952A54A952A54AABAC30B162C586162C58B161858B162C30B162C587562C58'\
-                       + '60C2C58B162FD8B162C58B0C1858B162C58B162C58BF62C586162C58B162C58B0B6C306161858B16'\
-                       + '1830B162C30B162C58B162C586162C58B162C58617EFD8B162C586162C58B162C30B162C30B16183'\
-                       + '0B162C58B162C58B162C58B162C306161858B162C58B162C58B161858B162C58B162C586162C58B0'\
-                       + '8D1A3CBD796FE1971E1E4'
+        expected_hex = LOGIN_REQUEST_HEX
         header = Header()
         header.protocol_version = 17
         expected_message = MessageV11(header, MessageBodyV11(), MpUserLoggingInReq())
@@ -54,10 +61,7 @@ class TestMessageCoderV11(TestCase):
         self.assertEqual(expected_hex, actual_hex)
 
     def test_encode_message_list_request(self):
-        expected_hex = '011B112007900C82C60C183060C183060C183060C183060C183060C183060C183060C183060C183'\
-                       + '072C183060C183060E5CB972E5CB9B0E5CB973616B96162C2D72E6C395AE5CD872B5CD8B0E6C586'\
-                       + '161CD87362C587361AB362C6A67E00020200468ACF134468ACF1342468ACF1342468ACF13420000'\
-                       + '00240100A080000000000080000000000A120CC834A680'
+        expected_hex = MESSAGE_LIST_REQUEST_HEX
         header = Header()
         header.protocol_version = 18
         expected_message = MessageV11(header, MessageBodyV11(), MessageListReq())
@@ -91,6 +95,13 @@ class TestMessageCoderV11(TestCase):
                                    cast(MessageBodyV11, actual_message.body))
         self.assertEqual(expected_hex, actual_hex)
 
+    def test_peek_response(self):
+        message_peek = self.message_coder.peek_response(MESSAGE_LIST_REQUEST_HEX)
+        self.assertEqual(18, message_peek.protocol_version)
+        self.assertEqual('531', message_peek.application_id)
+        self.assertEqual(513, message_peek.application_data_protocol_version)
+        self.assertEqual(18, message_peek.application_data_length)
+
     def validate_message_body(self, expected: MessageBodyV11, actual: MessageBodyV11) -> None:
         self.assertEqual(expected.message_id, actual.message_id)
         self.assertEqual(expected.event_creation_time, actual.event_creation_time)
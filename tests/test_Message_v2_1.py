@@ -8,15 +8,18 @@ from saic_ismart_client.ota_v2_1.Message import MessageCoderV21
 from saic_ismart_client.ota_v2_1.data_model import OtaRvcReq, RvcReqParam
 
 
+OTA_RVC_REQUEST_HEX = '1009E21790000000000000000000000000000000000FFF183060C183060C183060C183060C183060' \
+    + 'C183060C183060C183060C183060C1CB060C183060C183972E5CB97361CB9B0E5CD85B62C39B0B5C' \
+    + 'B9B1616B9B16182D72E5CD8B161CB97362C5872C1CB96AC5858B162C3972C1CB9B16183972E5CB90' \
+    + '1C6F2C94000009C3C00000000000000243280A0801800080008001000080018000807F80000'
+
+
 class TestMessageCoderV21(TestCase):
     def setUp(self) -> None:
         self.message_coder = MessageCoderV21()
 
     def test_encode_ota_rvc_request(self):
-        expected_hex = '1009E21790000000000000000000000000000000000FFF183060C183060C183060C183060C183060'\
-                       + 'C183060C183060C183060C183060C1CB060C183060C183972E5CB97361CB9B0E5CD85B62C39B0B5C'\
-                       + 'B9B1616B9B16182D72E5CD8B161CB97362C5872C1CB96AC5858B162C3972C1CB9B16183972E5CB90'\
-                       + '1C6F2C94000009C3C00000000000000243280A0801800080008001000080018000807F80000'
+        expected_hex = OTA_RVC_REQUEST_HEX
         expected_message = MessageV2(MessageBodyV2(), OtaRvcReq())
         self.message_coder.decode_response(expected_hex, expected_message)
 
@@ -46,6 +49,29 @@ class TestMessageCoderV21(TestCase):
                                    cast(MessageBodyV2, actual_message.body))
         self.assertEqual(expected_hex, actual_hex)
 
+    def test_binary_round_trip(self):
+        frame_hex = OTA_RVC_REQUEST_HEX
+        frame_bytes = MessageCoderV21.from_hex_frame(frame_hex)
+        decoded_message = MessageV2(MessageBodyV2(), OtaRvcReq())
+        self.message_coder.decode_response_bytes(memoryview(frame_bytes), decoded_message)
+        self.assertEqual('510', decoded_message.body.application_id)
+        self.assertEqual(4, len(cast(OtaRvcReq, decoded_message.application_data).rvc_params))
+
+        actual_message = MessageV2(decoded_message.body, get_ota_rvc_req_test_data(), decoded_message.reserved)
+        encoded_bytes = self.message_coder.encode_request_bytes(actual_message)
+        self.assertEqual(frame_bytes, encoded_bytes)
+        self.assertEqual(frame_hex, self.message_coder.to_hex_frame(encoded_bytes))
+
+    def test_peek_response(self):
+        message_peek = self.message_coder.peek_response(OTA_RVC_REQUEST_HEX)
+        self.assertEqual(33, message_peek.protocol_version)
+        self.assertEqual('510', message_peek.application_id)
+        self.assertEqual(25857, message_peek.application_data_protocol_version)
+        self.assertEqual(1, message_peek.message_id)
+        self.assertEqual(18, message_peek.application_data_length)
+        self.assertIsNone(message_peek.result)
+        self.assertTrue(message_peek.has_application_data())
+
     def validate_message_body(self, expected: MessageBodyV2, actual: MessageBodyV2) -> None:
         self.assertEqual(expected.message_id, actual.message_id)
         self.assertEqual(expected.ul_message_counter, actual.ul_message_counter)
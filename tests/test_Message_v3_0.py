@@ -1,24 +1,29 @@
 import calendar
+import threading
 import time
 from typing import cast
 from unittest import TestCase
+from unittest.mock import Mock, patch
 
-from saic_ismart_client.common_model import DataEncodingType
+from saic_ismart_client.common_model import ApplicationData, DataEncodingType
 from saic_ismart_client.ota_v3_0.Message import MessageCoderV30, MessageBodyV30, MessageV30
 from saic_ismart_client.ota_v3_0.data_model import OtaChrgMangDataResp, RvsChargingStatus
 
 
+CHRG_MGMT_DATA_RSP_HEX = '100CF30750000000000000000000000000000000000F0F983060C183060C183060C183060C18306' \
+    + '0C183060C183060C183060C183060C1CB060C183060C183972E5CB97361CB972E5CB95AC2C39B0B' \
+    + '5CB073616B972E5CAD72E6C5872E6C39B0E6C5872E5CB96AC5B58B162C3972C1CB9B16183972E5C' \
+    + 'B906C67BC48000009C3C011C03004000000800000000000000070122000203FF0103FF4E2006420' \
+    + '349000000F30000CFCE0026204BF00633D509CC67AFD5C9C400C8400F0002A00000000000000000' \
+    + '9DC0B5400025BC0000'
+
+
 class TestMessageCoderV30(TestCase):
     def setUp(self):
         self.message_coder = MessageCoderV30()
 
     def test_encode_chrg_mgmt_data(self):
-        expected_hex = '100CF30750000000000000000000000000000000000F0F983060C183060C183060C183060C18306'\
-                       + '0C183060C183060C183060C183060C1CB060C183060C183972E5CB97361CB972E5CB95AC2C39B0B'\
-                       + '5CB073616B972E5CAD72E6C5872E6C39B0E6C5872E5CB96AC5B58B162C3972C1CB9B16183972E5C'\
-                       + 'B906C67BC48000009C3C011C03004000000800000000000000070122000203FF0103FF4E2006420'\
-                       + '349000000F30000CFCE0026204BF00633D509CC67AFD5C9C400C8400F0002A00000000000000000'\
-                       + '9DC0B5400025BC0000'
+        expected_hex = CHRG_MGMT_DATA_RSP_HEX
         expected_message = MessageV30(MessageBodyV30(), OtaChrgMangDataResp())
         self.message_coder.decode_response(expected_hex, expected_message)
 
@@ -102,6 +107,84 @@ class TestMessageCoderV30(TestCase):
         self.assertEqual(expected.working_current, actual.working_current)
         self.assertEqual(expected.working_voltage, actual.working_voltage)
 
+    def test_peek_response(self):
+        with patch.object(self.message_coder.asn1_tool_uper, 'decode') as mocked_application_data_decode, \
+                patch.object(self.message_coder.dispatcher_body_codec, 'decode',
+                             wraps=self.message_coder.dispatcher_body_codec.decode) as mocked_decode:
+            message_peek = self.message_coder.peek_response(CHRG_MGMT_DATA_RSP_HEX)
+            mocked_application_data_decode.assert_not_called()
+            mocked_decode.assert_called_once()
+            self.assertEqual('MPDispatcherBody', mocked_decode.call_args.args[0])
+        self.assertEqual(48, message_peek.protocol_version)
+        self.assertEqual('516', message_peek.application_id)
+        self.assertEqual(768, message_peek.application_data_protocol_version)
+        self.assertEqual(6, message_peek.message_id)
+        self.assertEqual(0, message_peek.result)
+        self.assertEqual(71, message_peek.application_data_length)
+
+    def test_model_uses_slots(self):
+        message = MessageV30(MessageBodyV30(), OtaChrgMangDataResp())
+        self.message_coder.decode_response(CHRG_MGMT_DATA_RSP_HEX, message)
+
+        for model in (message, message.body, message.application_data, message.application_data.chargeStatus):
+            self.assertEqual({}, model.__dict__, type(model).__name__)
+        self.assertEqual('OTAChrgMangDataResp', OtaChrgMangDataResp.asn_type)
+        self.assertEqual('RvsChargingStatus', message.application_data.chargeStatus.asn_type)
+
+    def test_deprecated_asn_type_argument(self):
+        with self.assertWarns(DeprecationWarning):
+            application_data = ApplicationData('OTAChrgMangDataResp')
+        self.assertEqual('OTAChrgMangDataResp', application_data.asn_type)
+        self.assertIsNone(ApplicationData.asn_type)
+
+        application_data.custom_field = 1
+        self.assertEqual(1, application_data.custom_field)
+
+    def test_lazy_decode_response(self):
+        expected_message = MessageV30(MessageBodyV30(), OtaChrgMangDataResp())
+        self.message_coder.decode_response(CHRG_MGMT_DATA_RSP_HEX, expected_message)
+
+        with patch.object(self.message_coder.asn1_tool_uper, 'decode',
+                          wraps=self.message_coder.asn1_tool_uper.decode) as mocked_decode:
+            lazy_message = MessageV30(MessageBodyV30(), OtaChrgMangDataResp())
+            self.message_coder.decode_response(CHRG_MGMT_DATA_RSP_HEX, lazy_message, lazy=True)
+            mocked_decode.assert_not_called()
+            self.assertTrue(lazy_message.has_application_data())
+            self.assertFalse(lazy_message.is_application_data_decoded())
+
+            self.validate_chrg_mgmt_data(cast(OtaChrgMangDataResp, expected_message.application_data),
+                                         cast(OtaChrgMangDataResp, lazy_message.application_data))
+            self.assertTrue(lazy_message.is_application_data_decoded())
+            mocked_decode.assert_called_once()
+
+    def test_lazy_decode_locks_per_message(self):
+        decoding = threading.Event()
+        release = threading.Event()
+
+        def blocking_decode(asn_type: str, data: bytes) -> dict:
+            decoding.set()
+            release.wait(5)
+            return self.message_coder.asn1_tool_uper.decode(asn_type, data)
+
+        blocked_message = MessageV30(MessageBodyV30(), OtaChrgMangDataResp())
+        self.message_coder.decode_response(CHRG_MGMT_DATA_RSP_HEX, blocked_message, lazy=True)
+        _, application_data_bytes, _ = blocked_message._AbstractMessage__pending_application_data
+        blocked_message.set_pending_application_data(Mock(decode=blocking_decode), application_data_bytes)
+        thread = threading.Thread(target=lambda: blocked_message.application_data)
+        thread.start()
+        try:
+            self.assertTrue(decoding.wait(5))
+            lazy_message = MessageV30(MessageBodyV30(), OtaChrgMangDataResp())
+            self.message_coder.decode_response(CHRG_MGMT_DATA_RSP_HEX, lazy_message, lazy=True)
+            start = time.monotonic()
+            self.assertEqual(1023, cast(OtaChrgMangDataResp, lazy_message.application_data).bmsChrgOtptCrntReq)
+            self.assertLess(time.monotonic() - start, 1.0)
+            self.assertFalse(blocked_message.is_application_data_decoded())
+        finally:
+            release.set()
+            thread.join()
+        self.assertTrue(blocked_message.is_application_data_decoded())
+
 
 def get_chrg_mgmt_data_rsp_test_data() -> OtaChrgMangDataResp:
     chrg_mgmt_data = OtaChrgMangDataResp()
@@ -0,0 +1,147 @@
+import asyncio
+from typing import cast
+from unittest import IsolatedAsyncioTestCase
+from unittest.mock import AsyncMock, patch
+
+from saic_ismart_client.async_saic_api import AsyncSaicApi
+from saic_ismart_client.common_model import MessageBodyV2, MessageDirection, MessageV2
+from saic_ismart_client.deadline import CancellationToken, Deadline
+from saic_ismart_client.exceptions import SaicApiCancelled
+from saic_ismart_client.ota_v1_1.Message import MessageCoderV11
+from saic_ismart_client.ota_v1_1.data_model import MpUserLoggingInRsp
+from saic_ismart_client.ota_v2_1.Message import MessageCoderV21
+from saic_ismart_client.ota_v2_1.data_model import OtaRvcStatus25857, OtaRvmVehicleStatusResp25857
+from saic_ismart_client.ota_v3_0.Message import MessageCoderV30
+from saic_ismart_client.ota_v3_0.data_model import OtaChrgMangDataResp
+from saic_ismart_client.rate_limiter import RateLimit, RateLimiter
+from test_saic_api import UID, TOKEN, VIN, create_vin_info, mock_alarm_switch_response_hex, \
+    mock_chrg_mgmt_data_rsp, mock_login_response_hex, mock_start_ac_rsp_msg, mock_vehicle_status_response
+
+
+def mock_vehicle_status_pending_response(message_coder: MessageCoderV21) -> str:
+    vehicle_status_rsp_msg = MessageV2(MessageBodyV2())
+    message_coder.initialize_message(UID, TOKEN, VIN, '511', 25857, 1, vehicle_status_rsp_msg)
+    return message_coder.encode_request(vehicle_status_rsp_msg)
+
+
+class TestAsyncSaicApi(IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.saic_api = AsyncSaicApi('https://tap-eu.soimt.com', 'user@home.de', 'secret')
+        self.message_coder_v1_1 = MessageCoderV11()
+        self.message_coder_v2_1 = MessageCoderV21()
+        self.message_coder_v3_0 = MessageCoderV30()
+
+    async def asyncTearDown(self) -> None:
+        await self.saic_api.close()
+
+    async def test_login(self):
+        with patch.object(self.saic_api, 'send_request',
+                          AsyncMock(return_value=mock_login_response_hex(self.message_coder_v1_1))) as mocked_send:
+            login_response_message = await self.saic_api.login()
+
+        self.assertEqual('user_name', cast(MpUserLoggingInRsp, login_response_message.application_data).user_name)
+        self.assertEqual(UID, self.saic_api.uid)
+        self.assertEqual('https://tap-eu.soimt.com/TAP.Web/ota.mp', mocked_send.call_args.args[1])
+
+    async def test_set_alarm_switches(self):
+        with patch.object(self.saic_api, 'send_request',
+                          AsyncMock(return_value=mock_alarm_switch_response_hex(self.message_coder_v1_1))):
+            await self.saic_api.set_geofence_alarm_switch()
+
+    async def test_get_vehicle_status_with_retry(self):
+        vin_info = create_vin_info(VIN)
+        responses = [
+            mock_vehicle_status_pending_response(self.message_coder_v2_1),
+            mock_vehicle_status_response(self.message_coder_v2_1, UID, TOKEN, vin_info)
+        ]
+        with patch.object(self.saic_api, 'send_request', AsyncMock(side_effect=responses)), \
+                patch.object(asyncio, 'sleep', AsyncMock()) as mocked_sleep:
+            vehicle_status_rsp_msg = await self.saic_api.get_vehicle_status_with_retry(vin_info)
+
+        mocked_sleep.assert_awaited_once()
+        app_data = cast(OtaRvmVehicleStatusResp25857, vehicle_status_rsp_msg.application_data)
+        self.assertEqual(1000000000, app_data.status_time)
+
+    async def test_get_charging_status(self):
+        vin_info = create_vin_info(VIN)
+        with patch.object(self.saic_api, 'send_request',
+                          AsyncMock(return_value=mock_chrg_mgmt_data_rsp(self.message_coder_v3_0, UID, TOKEN,
+                                                                         vin_info))):
+            chrg_mgmt_data_rsp_msg = await self.saic_api.get_charging_status_with_retry(vin_info)
+
+        app_data = cast(OtaChrgMangDataResp, chrg_mgmt_data_rsp_msg.application_data)
+        self.assertEqual(1023, app_data.bmsChrgOtptCrntReq)
+
+    async def test_start_ac(self):
+        vin_info = create_vin_info(VIN)
+        with patch.object(self.saic_api, 'send_request',
+                          AsyncMock(return_value=mock_start_ac_rsp_msg(self.message_coder_v2_1, UID, TOKEN,
+                                                                       vin_info))) as mocked_send:
+            start_ac_rsp_msg = await self.saic_api.start_ac(vin_info)
+
+        app_data = cast(OtaRvcStatus25857, start_ac_rsp_msg.application_data)
+        self.assertEqual(b'\x06', app_data.rvcReqType)
+        self.assertEqual('https://tap-eu.soimt.com/TAP.Web/ota.mpv21', mocked_send.call_args.args[1])
+
+    async def test_concurrent_vehicles(self):
+        self.saic_api.uid = UID
+        self.saic_api.token = TOKEN
+        vin_infos = [create_vin_info(f'vin{i:014d}') for i in range(20)]
+
+        async def send_request(hex_message: str, endpoint: str) -> str:
+            await asyncio.sleep(0)
+            vin = self.message_coder_v2_1.decode_any_response(hex_message, MessageDirection.REQUEST).body.vin
+            return mock_vehicle_status_response(self.message_coder_v2_1, UID, TOKEN, create_vin_info(vin))
+
+        with patch.object(self.saic_api, 'send_request', send_request):
+            results = await asyncio.gather(*[self.saic_api.get_vehicle_status(vin_info) for vin_info in vin_infos])
+
+        self.assertEqual([vin_info.vin for vin_info in vin_infos], [r.body.vin for r in results])
+
+    async def test_concurrent_calls_share_deadline(self):
+        self.saic_api.uid = UID
+        self.saic_api.token = TOKEN
+        deadline = Deadline(10.0)
+        vin_infos = [create_vin_info(f'vin{i:014d}') for i in range(2)]
+
+        async def send_request(hex_message: str, endpoint: str) -> str:
+            vin = self.message_coder_v2_1.decode_any_response(hex_message, MessageDirection.REQUEST).body.vin
+            # the first call leaves the deadline while the second one is still within it
+            await asyncio.sleep(0.01 if vin == vin_infos[1].vin else 0)
+            return mock_vehicle_status_response(self.message_coder_v2_1, UID, TOKEN, create_vin_info(vin))
+
+        with patch.object(self.saic_api, 'send_request', send_request):
+            results = await asyncio.gather(*[self.saic_api.get_vehicle_status_with_retry(vin_info, deadline=deadline)
+                                             for vin_info in vin_infos])
+
+        self.assertEqual([vin_info.vin for vin_info in vin_infos], [r.body.vin for r in results])
+
+    async def test_cancelled_retry(self):
+        vin_info = create_vin_info(VIN)
+        cancellation_token = CancellationToken()
+        cancellation_token.cancel()
+        with patch.object(self.saic_api, 'send_request',
+                          AsyncMock(return_value=mock_vehicle_status_pending_response(self.message_coder_v2_1))), \
+                patch.object(asyncio, 'sleep', AsyncMock()) as mocked_sleep, \
+                self.assertRaises(SaicApiCancelled):
+            await self.saic_api.get_vehicle_status_with_retry(vin_info,
+                                                              deadline=Deadline(cancellation_token=cancellation_token))
+
+        mocked_sleep.assert_not_awaited()
+
+    async def test_rate_limiter(self):
+        vin_info = create_vin_info(VIN)
+        saic_api = AsyncSaicApi('https://tap-eu.soimt.com', 'user@home.de', 'secret',
+                                rate_limiter=RateLimiter(per_account=RateLimit(0.5)))
+        saic_api.uid = UID
+        saic_api.token = TOKEN
+        with patch.object(saic_api, 'send_request',
+                          AsyncMock(return_value=mock_vehicle_status_response(self.message_coder_v2_1, UID, TOKEN,
+                                                                              vin_info))), \
+                patch.object(asyncio, 'sleep', AsyncMock()) as mocked_sleep:
+            await saic_api.get_vehicle_status(vin_info)
+            await saic_api.get_vehicle_status(vin_info)
+
+        mocked_sleep.assert_awaited_once()
+        self.assertAlmostEqual(2.0, mocked_sleep.call_args.args[0], places=1)
+        await saic_api.close()
@@ -0,0 +1,87 @@
+import asyncio
+from unittest import IsolatedAsyncioTestCase
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from saic_ismart_client.async_saic_api import AsyncSaicApi
+from saic_ismart_client.deadline import Deadline
+from saic_ismart_client.exceptions import SaicApiDeadlineExceeded, SaicApiException
+from saic_ismart_client.http_session import HttpSessionConfig
+
+
+class TestAsyncSaicApiHttp(IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        self.requests = []
+        self.delay = 0.0
+        app = web.Application()
+        app.router.add_post('/TAP.Web/ota.mp', self.handle)
+        self.server = TestServer(app)
+        await self.server.start_server()
+        self.endpoint = str(self.server.make_url('/TAP.Web/ota.mp'))
+        self.saic_api = AsyncSaicApi(str(self.server.make_url('/')), 'user@home.de', 'secret',
+                                     http_session_config=HttpSessionConfig(read_timeout=0.2))
+
+    async def asyncTearDown(self) -> None:
+        await self.saic_api.close()
+        await self.server.close()
+
+    async def handle(self, request: web.Request) -> web.Response:
+        self.requests.append((await request.text(), dict(request.cookies), dict(request.headers)))
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        response = web.Response(text=f'response {len(self.requests)}')
+        response.set_cookie('session', f'cookie{len(self.requests)}')
+        return response
+
+    async def test_send_request(self):
+        response = await self.saic_api.send_request('1A2B', self.endpoint)
+
+        self.assertEqual('response 1', response)
+        body, _, headers = self.requests[0]
+        self.assertEqual('1A2B', body)
+        self.assertEqual('text/html', headers['Content-Type'])
+
+    async def test_cookies_are_sent_back(self):
+        await self.saic_api.send_request('1A2B', self.endpoint)
+        await self.saic_api.send_request('1A2B', self.endpoint)
+
+        self.assertEqual({}, self.requests[0][1])
+        self.assertEqual({'session': 'cookie1'}, self.requests[1][1])
+
+    async def test_timeout(self):
+        self.delay = 1.0
+
+        with self.assertRaises(SaicApiException) as cm:
+            await self.saic_api.send_request('1A2B', self.endpoint)
+
+        self.assertNotIsInstance(cm.exception, SaicApiDeadlineExceeded)
+        self.assertIn('Timeout error', cm.exception.message)
+
+    async def test_timeout_at_deadline(self):
+        self.delay = 1.0
+        self.saic_api.http_session_config.read_timeout = None
+
+        with self.assertRaises(SaicApiDeadlineExceeded):
+            with Deadline(0.1):
+                await self.saic_api.send_request('1A2B', self.endpoint)
+
+    async def test_connection_error(self):
+        endpoint = self.endpoint
+        await self.server.close()
+
+        with self.assertRaises(SaicApiException) as cm:
+            await self.saic_api.send_request('1A2B', endpoint)
+
+        self.assertIn('Connection error', cm.exception.message)
+
+    async def test_close(self):
+        await self.saic_api.send_request('1A2B', self.endpoint)
+        session = self.saic_api._AsyncSaicApi__session
+
+        await self.saic_api.close()
+
+        self.assertTrue(session.closed)
+        self.assertIsNone(self.saic_api._AsyncSaicApi__session)
+        # the session is created again on the next request
+        self.assertEqual('response 2', await self.saic_api.send_request('1A2B', self.endpoint))
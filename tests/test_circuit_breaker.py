@@ -0,0 +1,69 @@
+from unittest import TestCase
+
+from saic_ismart_client.circuit_breaker import CircuitBreaker, CircuitBreakerRegistry, CircuitState
+from saic_ismart_client.exceptions import SaicApiCircuitOpen
+from helpers import FakeClock
+
+
+class TestCircuitBreaker(TestCase):
+    def setUp(self) -> None:
+        self.clock = FakeClock()
+        self.circuit_breaker = CircuitBreaker('test', failure_rate_threshold=0.5, minimum_calls=4, window_size=10,
+                                              open_duration=30.0, clock=self.clock)
+
+    def test_opens_at_failure_rate(self):
+        for success in [True, False, True]:
+            self.circuit_breaker.acquire()
+            if success:
+                self.circuit_breaker.record_success()
+            else:
+                self.circuit_breaker.record_failure()
+        self.assertEqual(CircuitState.CLOSED, self.circuit_breaker.state)
+        self.circuit_breaker.record_failure()
+        self.assertEqual(CircuitState.OPEN, self.circuit_breaker.state)
+        with self.assertRaises(SaicApiCircuitOpen) as context:
+            self.circuit_breaker.acquire()
+        self.assertEqual(30.0, context.exception.retry_after)
+
+    def test_half_open_probe_closes(self):
+        self.__open()
+        self.clock.now = 30.0
+        self.assertEqual(CircuitState.HALF_OPEN, self.circuit_breaker.state)
+        self.circuit_breaker.acquire()
+        # only one probe at a time
+        with self.assertRaises(SaicApiCircuitOpen):
+            self.circuit_breaker.acquire()
+        self.circuit_breaker.record_success()
+        self.assertEqual(CircuitState.CLOSED, self.circuit_breaker.state)
+        self.assertEqual(0.0, self.circuit_breaker.failure_rate())
+
+    def test_half_open_probe_failure_opens_again(self):
+        self.__open()
+        self.clock.now = 30.0
+        self.circuit_breaker.acquire()
+        self.circuit_breaker.record_failure()
+        self.assertEqual(CircuitState.OPEN, self.circuit_breaker.state)
+        self.clock.now = 59.0
+        self.assertEqual(CircuitState.OPEN, self.circuit_breaker.state)
+
+    def test_release_frees_probe(self):
+        self.__open()
+        self.clock.now = 30.0
+        self.circuit_breaker.acquire()
+        self.circuit_breaker.release()
+        self.circuit_breaker.acquire()
+
+    def test_registry(self):
+        registry = CircuitBreakerRegistry()
+        circuit_breaker = registry.get('user@home.de', '/TAP.Web/ota.mpv21')
+        self.assertIs(circuit_breaker, registry.get('user@home.de', '/TAP.Web/ota.mpv21'))
+        self.assertIsNot(circuit_breaker, registry.get('user@home.de', '/TAP.Web/ota.mpv30'))
+        self.assertEqual({
+            ('user@home.de', '/TAP.Web/ota.mpv21'): CircuitState.CLOSED,
+            ('user@home.de', '/TAP.Web/ota.mpv30'): CircuitState.CLOSED
+        }, registry.get_states())
+
+    def __open(self):
+        for _ in range(4):
+            self.circuit_breaker.record_failure()
+        self.assertEqual(CircuitState.OPEN, self.circuit_breaker.state)
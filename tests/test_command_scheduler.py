@@ -0,0 +1,148 @@
+import asyncio
+import threading
+import time
+from unittest import TestCase
+
+from saic_ismart_client.command_scheduler import CommandScheduler, PendingResult
+from saic_ismart_client.common_model import MessageBodyV2, MessageV2
+from saic_ismart_client.exceptions import SaicApiException
+from saic_ismart_client.ota_v1_1.data_model import VinInfo
+from test_saic_api import create_vin_info
+
+
+class FakeSaicApi:
+    def __init__(self):
+        self.latencies = []
+        self.token = 'token1'
+        self.rejected_tokens = []
+
+    def get_error_handling(self, message_body, iteration, elapsed=None):
+        return 0.0, message_body.result == 2
+
+    def relogin_if_needed(self, rejected_token):
+        self.rejected_tokens.append(rejected_token)
+
+    def get_retry_delay(self, message_body, elapsed, fixed_delay=15.0):
+        return 0.0
+
+    def record_app_data_latency(self, message_body, elapsed):
+        self.latencies.append(elapsed)
+
+
+def create_response(event_id: str, application_data=None, error_message: str = None) -> MessageV2:
+    message_body = MessageBodyV2()
+    message_body.event_id = event_id
+    message_body.error_message = error_message
+    message_body.result = 0 if error_message is None else 6
+    return MessageV2(message_body, application_data)
+
+
+class TestCommandScheduler(TestCase):
+    def setUp(self) -> None:
+        self.saic_api = FakeSaicApi()
+        self.command_scheduler = CommandScheduler(max_workers=2)
+
+    def tearDown(self) -> None:
+        self.command_scheduler.close()
+
+    def submit(self, func, vin_info: VinInfo, has_app_data: bool = True, max_retries: int = 3) -> PendingResult:
+        pending_result = PendingResult(self.saic_api, self.command_scheduler, func, vin_info, has_app_data,
+                                       max_retries)
+        pending_result.poll()
+        return pending_result
+
+    def test_follow_up_requests_use_event_id(self):
+        event_ids = []
+        responses = [create_response('1'), create_response('1'), create_response('1', 'app data')]
+
+        def get_status(vin_info: VinInfo, event_id: str = None):
+            event_ids.append(event_id)
+            return responses.pop(0)
+
+        pending_result = self.submit(get_status, create_vin_info('vin1'))
+        self.assertEqual('1', pending_result.event_id)
+        self.assertEqual('app data', pending_result.result(5).application_data)
+        self.assertEqual([None, '1', '1'], event_ids)
+        self.assertEqual(1, len(self.saic_api.latencies))
+
+    def test_callbacks_and_await(self):
+        done = threading.Event()
+        responses = [create_response('1'), create_response('1', 'app data')]
+        pending_result = self.submit(lambda vin_info, event_id=None: responses.pop(0), create_vin_info('vin1'))
+        pending_result.add_done_callback(lambda _: done.set())
+
+        async def wait():
+            return await pending_result
+
+        self.assertEqual('app data', asyncio.run(wait()).application_data)
+        self.assertTrue(done.wait(5))
+        self.assertTrue(pending_result.done())
+
+    def test_errors_after_max_retries(self):
+        pending_result = self.submit(lambda vin_info, event_id=None: create_response('1', error_message='busy'),
+                                     create_vin_info('vin1'), has_app_data=False, max_retries=2)
+        with self.assertRaises(SaicApiException):
+            pending_result.result(5)
+
+    def test_relogin(self):
+        responses = [create_response('1', error_message='token expired'), create_response('1', 'app data')]
+        responses[0].body.result = 2
+        pending_result = self.submit(lambda vin_info, event_id=None: responses.pop(0), create_vin_info('vin1'))
+        self.assertEqual('app data', pending_result.result(5).application_data)
+        self.assertEqual(['token1'], self.saic_api.rejected_tokens)
+
+    def test_first_request_fails(self):
+        def get_status(vin_info: VinInfo, event_id: str = None):
+            raise SaicApiException('Connection error')
+
+        pending_result = self.submit(get_status, create_vin_info('vin1'))
+        self.assertIsInstance(pending_result.exception(5), SaicApiException)
+        self.assertEqual(0, len(self.command_scheduler))
+
+    def test_many_pending_results(self):
+        def get_status(vin_info: VinInfo, event_id: str = None):
+            if event_id is None:
+                return create_response(vin_info.vin)
+            return create_response(event_id, event_id)
+
+        pending_results = [self.submit(get_status, create_vin_info(f'vin{i}')) for i in range(2000)]
+        self.assertEqual([f'vin{i}' for i in range(2000)],
+                         [pending_result.result(30).application_data for pending_result in pending_results])
+
+    def test_close_cancels_pending_results(self):
+        self.saic_api.get_retry_delay = lambda message_body, elapsed, fixed_delay=15.0: 60.0
+        pending_result = self.submit(lambda vin_info, event_id=None: create_response('1'), create_vin_info('vin1'))
+        self.assertEqual(1, len(self.command_scheduler))
+        self.command_scheduler.close()
+        self.assertTrue(pending_result.future.cancelled())
+        with self.assertRaises(SaicApiException):
+            self.command_scheduler.schedule(pending_result, 0.0)
+
+    def test_close_cancels_queued_polls(self):
+        command_scheduler = CommandScheduler(max_workers=1)
+        polling = threading.Event()
+        release = threading.Event()
+
+        def blocking_status(vin_info: VinInfo, event_id: str = None):
+            if event_id is not None:
+                polling.set()
+                release.wait(5)
+            return create_response('1')
+
+        pending_results = []
+        for get_status in (blocking_status, lambda vin_info, event_id=None: create_response('1')):
+            pending_result = PendingResult(self.saic_api, command_scheduler, get_status, create_vin_info('vin1'),
+                                           True, 3)
+            pending_result.handle_response(get_status(pending_result.vin_info))
+            pending_results.append(pending_result)
+            if get_status is blocking_status:
+                self.assertTrue(polling.wait(5))
+        # the second poll waits in the pool behind the blocked one
+        while len(command_scheduler):
+            time.sleep(0.01)
+        try:
+            command_scheduler.close()
+            for pending_result in pending_results:
+                self.assertTrue(pending_result.future.cancelled())
+        finally:
+            release.set()
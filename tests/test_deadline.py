@@ -0,0 +1,96 @@
+import asyncio
+import threading
+from unittest import TestCase
+
+from saic_ismart_client.deadline import CancellationToken, Deadline, get_current_deadline
+from saic_ismart_client.exceptions import SaicApiCancelled, SaicApiDeadlineExceeded
+from helpers import FakeClock
+
+
+class TestDeadline(TestCase):
+    def setUp(self) -> None:
+        self.clock = FakeClock()
+
+    def test_remaining_and_expiry(self):
+        deadline = Deadline(10.0, clock=self.clock)
+        self.assertEqual(10.0, deadline.remaining())
+        self.clock.now = 12.0
+        self.assertEqual(0.0, deadline.remaining())
+        self.assertTrue(deadline.is_expired())
+        with self.assertRaises(SaicApiDeadlineExceeded):
+            deadline.check()
+
+    def test_without_timeout(self):
+        deadline = Deadline()
+        self.assertIsNone(deadline.remaining())
+        self.assertEqual(15.0, deadline.compress(15.0))
+        self.assertEqual(10.0, deadline.get_timeout(10.0))
+        deadline.check()
+
+    def test_compress_and_timeouts(self):
+        deadline = Deadline(20.0, clock=self.clock)
+        self.assertEqual(10.0, deadline.compress(15.0))
+        self.assertEqual(5.0, deadline.compress(5.0))
+        self.assertEqual(10.0, deadline.get_timeout(10.0))
+        self.assertEqual(20.0, deadline.get_timeout(None))
+        self.assertEqual(20.0, deadline.get_timeout(30.0))
+
+    def test_cancellation_interrupts_sleep(self):
+        cancellation_token = CancellationToken()
+        deadline = Deadline(cancellation_token=cancellation_token)
+        threading.Timer(0.05, cancellation_token.cancel).start()
+        with self.assertRaises(SaicApiCancelled):
+            deadline.sleep(5.0)
+
+    def test_context(self):
+        deadline = Deadline(10.0)
+        self.assertIsNone(get_current_deadline())
+        with deadline:
+            self.assertIs(deadline, get_current_deadline())
+            with deadline:
+                self.assertIs(deadline, get_current_deadline())
+        self.assertIsNone(get_current_deadline())
+
+    def test_shared_by_threads(self):
+        deadline = Deadline(10.0)
+        entered = threading.Barrier(2)
+        first_left = threading.Event()
+        errors = []
+
+        def call(first: bool):
+            try:
+                with deadline:
+                    entered.wait(5)
+                    if not first:
+                        first_left.wait(5)
+                    self.assertIs(deadline, get_current_deadline())
+                if first:
+                    first_left.set()
+                self.assertIsNone(get_current_deadline())
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=call, args=(first,)) for first in (True, False)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(5)
+        self.assertEqual([], errors)
+
+    def test_shared_by_tasks(self):
+        deadline = Deadline(10.0)
+
+        async def call(delay: float):
+            with deadline:
+                await asyncio.sleep(delay)
+                self.assertIs(deadline, get_current_deadline())
+            return get_current_deadline()
+
+        async def main():
+            return await asyncio.gather(call(0.0), call(0.05))
+
+        self.assertEqual([None, None], asyncio.run(main()))
+
+    def test_negative_timeout(self):
+        with self.assertRaises(ValueError):
+            Deadline(-1.0)
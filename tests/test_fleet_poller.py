@@ -0,0 +1,66 @@
+import threading
+from unittest import TestCase
+from unittest.mock import patch
+
+from saic_ismart_client.common_model import Header
+from saic_ismart_client.exceptions import SaicApiException
+from saic_ismart_client.fleet_poller import FleetPoller
+from saic_ismart_client.ota_v1_1.data_model import MessageBodyV11, MessageV11, MpUserLoggingInRsp
+from saic_ismart_client.saic_api import SaicApi
+from test_saic_api import VIN, create_vin_info
+
+
+def create_saic_api() -> SaicApi:
+    return SaicApi('https://tap-eu.soimt.com', 'https://gateway-eu.soimt.com', 'user@home.de', 'secret')
+
+
+class TestFleetPoller(TestCase):
+    def test_add_account_polls_all_vehicles(self):
+        saic_api = create_saic_api()
+        login_rsp = MpUserLoggingInRsp()
+        login_rsp.vin_list = [create_vin_info(VIN), create_vin_info('vin20000000000000')]
+        login_response_message = MessageV11(Header(), MessageBodyV11(), login_rsp)
+
+        with patch.object(saic_api, 'login', return_value=login_response_message), \
+                patch.object(saic_api, 'get_vehicle_status_with_retry', side_effect=lambda v: f'status {v.vin}'), \
+                patch.object(saic_api, 'get_charging_status_with_retry', side_effect=lambda v: f'charging {v.vin}'):
+            with FleetPoller(max_workers=2) as fleet_poller:
+                fleet_poller.add_account(saic_api)
+                results = sorted(fleet_poller.poll(), key=lambda r: r.vin)
+
+        self.assertEqual([VIN, 'vin20000000000000'], [r.vin for r in results])
+        self.assertTrue(all(r.is_successful() for r in results))
+        self.assertEqual(f'status {VIN}', results[0].vehicle_status)
+        self.assertEqual(f'charging {VIN}', results[0].charging_status)
+        self.assertGreaterEqual(results[0].duration, results[0].vehicle_status_duration)
+
+    def test_results_are_yielded_as_completed(self):
+        saic_api = create_saic_api()
+        slow_vehicle_released = threading.Event()
+
+        def get_vehicle_status_with_retry(vin_info):
+            if vin_info.vin == VIN:
+                slow_vehicle_released.wait(5)
+            elif vin_info.vin == 'vin30000000000000':
+                raise SaicApiException('vehicle not reachable', 4)
+            return vin_info.vin
+
+        with patch.object(saic_api, 'get_vehicle_status_with_retry', side_effect=get_vehicle_status_with_retry):
+            with FleetPoller(max_workers=3, poll_charging_status=False) as fleet_poller:
+                fleet_poller.add_account(saic_api, [create_vin_info(VIN), create_vin_info('vin20000000000000'),
+                                                    create_vin_info('vin30000000000000')])
+                results = []
+                for result in fleet_poller.poll():
+                    results.append(result)
+                    if len(results) == 2:
+                        slow_vehicle_released.set()
+
+        self.assertEqual(VIN, results[2].vin)
+        failed_result = next(r for r in results if r.vin == 'vin30000000000000')
+        self.assertFalse(failed_result.is_successful())
+        self.assertIsInstance(failed_result.error, SaicApiException)
+        self.assertIsNone(failed_result.charging_status)
+
+    def test_invalid_max_workers(self):
+        with self.assertRaises(ValueError):
+            FleetPoller(max_workers=0)
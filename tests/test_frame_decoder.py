@@ -0,0 +1,156 @@
+from unittest import TestCase
+
+from saic_ismart_client.common_model import APPLICATION_DATA_REGISTRY, ApplicationDataRegistry, MessageDirection, \
+    Projection, ProtocolVersion
+from saic_ismart_client.frame_decoder import ParallelFrameDecoder, decode_any, decode_many, decode_parallel
+from saic_ismart_client.ota_v1_1.Message import MessageCoderV11
+from saic_ismart_client.ota_v1_1.data_model import MessageListReq, MessageV11, MpUserLoggingInReq
+from saic_ismart_client.ota_v2_1.Message import MessageCoderV21
+from saic_ismart_client.ota_v2_1.data_model import OtaRvcReq, OtaRvmVehicleStatusResp25857, \
+    VEHICLE_STATUS_SUMMARY_PROJECTION
+from saic_ismart_client.ota_v3_0.Message import MessageCoderV30, MessageV30
+from saic_ismart_client.ota_v3_0.data_model import CHARGING_STATUS_SUMMARY_PROJECTION, OtaChrgMangDataResp, \
+    OtaChrgSetngReq, OtaChrgSetngResp
+from test_Message_v1_1 import LOGIN_REQUEST_HEX, MESSAGE_LIST_REQUEST_HEX
+from test_Message_v2_1 import OTA_RVC_REQUEST_HEX
+from test_Message_v3_0 import CHRG_MGMT_DATA_RSP_HEX
+from test_saic_api import UID, TOKEN, VIN, create_vin_info, mock_alarm_switch_response_hex, \
+    mock_vehicle_status_response
+
+
+class TestApplicationDataRegistry(TestCase):
+    def test_lookup(self):
+        self.assertIs(OtaRvmVehicleStatusResp25857, APPLICATION_DATA_REGISTRY.get_application_data_type(
+            ProtocolVersion.V2_1, '511', 25857, MessageDirection.RESPONSE))
+        self.assertIs(OtaChrgSetngReq, APPLICATION_DATA_REGISTRY.get_application_data_type(
+            ProtocolVersion.V3_0, '516', 768, MessageDirection.REQUEST, 3))
+        self.assertIs(OtaChrgSetngResp, APPLICATION_DATA_REGISTRY.get_application_data_type(
+            ProtocolVersion.V3_0, '516', 768, MessageDirection.RESPONSE, 4))
+        self.assertIsNone(APPLICATION_DATA_REGISTRY.get_application_data_type(
+            ProtocolVersion.V2_1, '999', 25857, MessageDirection.RESPONSE))
+
+    def test_message_id_falls_back_to_application(self):
+        registry = ApplicationDataRegistry()
+        registry.register(ProtocolVersion.V2_1, '511', 25857, OtaRvcReq, OtaRvmVehicleStatusResp25857)
+
+        self.assertTrue(registry.is_registered(ProtocolVersion.V2_1, '511', 25857, MessageDirection.REQUEST, 7))
+        self.assertIs(OtaRvcReq, registry.get_application_data_type(ProtocolVersion.V2_1, '511', 25857,
+                                                                    MessageDirection.REQUEST, 7))
+        self.assertFalse(registry.is_registered(ProtocolVersion.V3_0, '511', 25857, MessageDirection.REQUEST))
+
+
+class TestDecodeAny(TestCase):
+    def test_decode_v1_1(self):
+        login_message = decode_any(LOGIN_REQUEST_HEX, MessageDirection.REQUEST)
+        self.assertIsInstance(login_message, MessageV11)
+        self.assertIsInstance(login_message.application_data, MpUserLoggingInReq)
+        self.assertEqual(17, login_message.header.protocol_version)
+
+        message_list_message = decode_any(MESSAGE_LIST_REQUEST_HEX, MessageDirection.REQUEST)
+        self.assertIsInstance(message_list_message.application_data, MessageListReq)
+        self.assertEqual(18, message_list_message.header.protocol_version)
+
+    def test_decode_v2_1(self):
+        rvc_message = decode_any(OTA_RVC_REQUEST_HEX, MessageDirection.REQUEST)
+        self.assertIsInstance(rvc_message.application_data, OtaRvcReq)
+
+        vehicle_status_hex = mock_vehicle_status_response(MessageCoderV21(), UID, TOKEN, create_vin_info(VIN))
+        vehicle_status_message = decode_any(vehicle_status_hex)
+        self.assertIsInstance(vehicle_status_message.application_data, OtaRvmVehicleStatusResp25857)
+        self.assertEqual(VIN, vehicle_status_message.body.vin)
+
+    def test_decode_v3_0(self):
+        chrg_mgmt_data_message = decode_any(CHRG_MGMT_DATA_RSP_HEX)
+        self.assertIsInstance(chrg_mgmt_data_message, MessageV30)
+        self.assertIsInstance(chrg_mgmt_data_message.application_data, OtaChrgMangDataResp)
+
+    def test_response_without_application_data(self):
+        alarm_switch_message = decode_any(mock_alarm_switch_response_hex(MessageCoderV11()))
+        self.assertIsNone(alarm_switch_message.application_data)
+        self.assertEqual('521', alarm_switch_message.body.application_id)
+
+
+class TestDecodeMany(TestCase):
+    def test_coder_decode_many(self):
+        frames = [CHRG_MGMT_DATA_RSP_HEX, 'broken', bytes.fromhex(CHRG_MGMT_DATA_RSP_HEX[5:])]
+        results = list(MessageCoderV30().decode_many(frames))
+
+        self.assertEqual([0, 1, 2], [r.index for r in results])
+        self.assertTrue(results[0].is_successful())
+        self.assertIsInstance(results[0].message.application_data, OtaChrgMangDataResp)
+        self.assertFalse(results[1].is_successful())
+        self.assertIsNone(results[1].message)
+        self.assertIsNotNone(results[1].error)
+        self.assertIsInstance(results[2].message.application_data, OtaChrgMangDataResp)
+
+    def test_decode_many_mixed_protocols(self):
+        frames = [LOGIN_REQUEST_HEX, OTA_RVC_REQUEST_HEX, '1FFFF30', MESSAGE_LIST_REQUEST_HEX]
+        results = list(decode_many(frames, MessageDirection.REQUEST))
+
+        self.assertIsInstance(results[0].message.application_data, MpUserLoggingInReq)
+        self.assertIsInstance(results[1].message.application_data, OtaRvcReq)
+        self.assertFalse(results[2].is_successful())
+        self.assertIsInstance(results[3].message.application_data, MessageListReq)
+
+
+class TestParallelFrameDecoder(TestCase):
+    def test_results_keep_input_order(self):
+        frames = [CHRG_MGMT_DATA_RSP_HEX, mock_alarm_switch_response_hex(MessageCoderV11()), 'broken',
+                  CHRG_MGMT_DATA_RSP_HEX, mock_alarm_switch_response_hex(MessageCoderV11())]
+        with ParallelFrameDecoder(workers=2, chunk_size=2) as parallel_frame_decoder:
+            results = list(parallel_frame_decoder.decode(iter(frames)))
+            self.assertEqual(2, len(list(parallel_frame_decoder.decode([CHRG_MGMT_DATA_RSP_HEX] * 2))))
+
+        self.assertEqual([0, 1, 2, 3, 4], [r.index for r in results])
+        self.assertIsInstance(results[0].message.application_data, OtaChrgMangDataResp)
+        self.assertEqual('521', results[1].message.body.application_id)
+        self.assertFalse(results[2].is_successful())
+        self.assertIsInstance(results[3].message.application_data, OtaChrgMangDataResp)
+        self.assertEqual('521', results[4].message.body.application_id)
+
+    def test_decode_parallel(self):
+        results = list(decode_parallel([MESSAGE_LIST_REQUEST_HEX] * 5, MessageDirection.REQUEST, workers=1,
+                                       chunk_size=3))
+        self.assertEqual(5, len(results))
+        self.assertTrue(all(isinstance(r.message.application_data, MessageListReq) for r in results))
+
+    def test_invalid_chunk_size(self):
+        with self.assertRaises(ValueError):
+            ParallelFrameDecoder(chunk_size=0)
+
+
+class TestProjection(TestCase):
+    def test_vehicle_status_projection(self):
+        vehicle_status_hex = mock_vehicle_status_response(MessageCoderV21(), UID, TOKEN, create_vin_info(VIN))
+        vehicle_status = decode_any(vehicle_status_hex).application_data
+        record = MessageCoderV21().decode_projection(vehicle_status_hex, VEHICLE_STATUS_SUMMARY_PROJECTION)
+
+        basic_vehicle_status = vehicle_status.get_basic_vehicle_status()
+        position = vehicle_status.get_gps_position().get_way_point().get_position()
+        self.assertEqual({
+            'status_time': vehicle_status.status_time,
+            'soc': basic_vehicle_status.extended_data1,
+            'electric_range': basic_vehicle_status.fuel_range_elec,
+            'mileage': basic_vehicle_status.mileage,
+            'latitude': position.latitude,
+            'longitude': position.longitude,
+            'charging': basic_vehicle_status.extended_data2
+        }, record)
+
+    def test_charging_status_projection(self):
+        chrg_mgmt_data = decode_any(CHRG_MGMT_DATA_RSP_HEX).application_data
+        record = MessageCoderV30().decode_projection(CHRG_MGMT_DATA_RSP_HEX, CHARGING_STATUS_SUMMARY_PROJECTION)
+
+        self.assertEqual({
+            'soc': chrg_mgmt_data.bmsPackSOCDsp,
+            'electric_range': chrg_mgmt_data.bms_estd_elec_rng,
+            'mileage': chrg_mgmt_data.chargeStatus.mileage,
+            'charging_status': chrg_mgmt_data.bmsChrgSts,
+            'charging_gun_state': chrg_mgmt_data.chargeStatus.charging_gun_state
+        }, record)
+
+    def test_missing_fields_and_application_data(self):
+        projection = Projection('OTAChrgMangDataResp', {'missing': 'chargeStatus.unknown.field'})
+        self.assertEqual({'missing': None}, MessageCoderV30().decode_projection(CHRG_MGMT_DATA_RSP_HEX, projection))
+        self.assertIsNone(MessageCoderV11().decode_projection(mock_alarm_switch_response_hex(MessageCoderV11()),
+                                                              projection))
@@ -0,0 +1,63 @@
+from unittest import TestCase
+
+from saic_ismart_client.rate_limiter import ENDPOINT_FAMILY_OTA_MPV21, ENDPOINT_FAMILY_OTA_MPV30, RateLimit, \
+    RateLimiter, get_endpoint_family
+from helpers import FakeClock
+
+ACCOUNT = 'user@home.de'
+
+
+class TestRateLimiter(TestCase):
+    def setUp(self) -> None:
+        self.clock = FakeClock()
+
+    def test_burst_then_rate(self):
+        rate_limiter = RateLimiter(per_account=RateLimit(2.0, burst=3), clock=self.clock)
+        delays = [rate_limiter.reserve(ACCOUNT, None, ENDPOINT_FAMILY_OTA_MPV21) for _ in range(5)]
+        # waiting calls are queued in the order of their reservations
+        self.assertEqual([0.0, 0.0, 0.0, 0.5, 1.0], delays)
+        self.clock.now = 10.0
+        self.assertEqual(0.0, rate_limiter.reserve(ACCOUNT, None, ENDPOINT_FAMILY_OTA_MPV21))
+
+    def test_separate_budgets(self):
+        rate_limiter = RateLimiter(per_vin=RateLimit(0.1), clock=self.clock)
+        self.assertEqual(0.0, rate_limiter.reserve(ACCOUNT, 'vin1', ENDPOINT_FAMILY_OTA_MPV21))
+        self.assertEqual(0.0, rate_limiter.reserve(ACCOUNT, 'vin2', ENDPOINT_FAMILY_OTA_MPV21))
+        self.assertAlmostEqual(10.0, rate_limiter.reserve(ACCOUNT, 'vin1', ENDPOINT_FAMILY_OTA_MPV30))
+        self.assertEqual(0.0, rate_limiter.reserve('other@home.de', 'vin1', ENDPOINT_FAMILY_OTA_MPV21))
+
+    def test_strictest_budget_applies(self):
+        rate_limiter = RateLimiter(per_account=RateLimit(10.0, burst=10), per_vin=RateLimit(1.0),
+                                   per_endpoint_family={ENDPOINT_FAMILY_OTA_MPV30: RateLimit(0.5)}, clock=self.clock)
+        self.assertEqual(0.0, rate_limiter.reserve(ACCOUNT, 'vin1', ENDPOINT_FAMILY_OTA_MPV30))
+        self.assertAlmostEqual(1.0, rate_limiter.reserve(ACCOUNT, 'vin1', ENDPOINT_FAMILY_OTA_MPV21))
+        self.assertAlmostEqual(2.0, rate_limiter.reserve(ACCOUNT, 'vin2', ENDPOINT_FAMILY_OTA_MPV30))
+
+    def test_max_wait_does_not_reserve(self):
+        rate_limiter = RateLimiter(per_account=RateLimit(1.0), clock=self.clock)
+        self.assertEqual(0.0, rate_limiter.reserve(ACCOUNT, None, ENDPOINT_FAMILY_OTA_MPV21))
+        self.assertIsNone(rate_limiter.reserve(ACCOUNT, None, ENDPOINT_FAMILY_OTA_MPV21, max_wait=0.5))
+        # the call that gave up does not hold back the next call
+        self.assertEqual(1.0, rate_limiter.reserve(ACCOUNT, None, ENDPOINT_FAMILY_OTA_MPV21, max_wait=1.0))
+
+    def test_expired_buckets_are_pruned(self):
+        rate_limiter = RateLimiter(per_vin=RateLimit(1.0), clock=self.clock)
+        for i in range(100):
+            rate_limiter.reserve(ACCOUNT, f'vin{i}', ENDPOINT_FAMILY_OTA_MPV21)
+        self.assertEqual(100, len(rate_limiter))
+        self.clock.now = 120.0
+        rate_limiter.reserve(ACCOUNT, 'vin0', ENDPOINT_FAMILY_OTA_MPV21)
+        self.assertEqual(1, len(rate_limiter))
+
+    def test_without_limits(self):
+        self.assertEqual(0.0, RateLimiter().reserve(ACCOUNT, 'vin1', ENDPOINT_FAMILY_OTA_MPV21))
+
+    def test_endpoint_family(self):
+        self.assertEqual('ota.mp', get_endpoint_family('/TAP.Web/ota.mp'))
+        self.assertEqual('ota.mpv30', get_endpoint_family('/TAP.Web/ota.mpv30'))
+
+    def test_invalid_rate_limit(self):
+        with self.assertRaises(ValueError):
+            RateLimit(0.0)
+        with self.assertRaises(ValueError):
+            RateLimit(1.0, burst=0)
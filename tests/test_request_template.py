@@ -0,0 +1,81 @@
+from unittest import TestCase
+from unittest.mock import patch
+
+from saic_ismart_client.common_model import MessageBodyV2, MessageV2
+from saic_ismart_client.ota_v2_1.Message import MessageCoderV21
+from saic_ismart_client.ota_v2_1.data_model import OtaRvmVehicleStatusReq
+from saic_ismart_client.ota_v3_0.Message import MessageBodyV30, MessageCoderV30, MessageV30
+from saic_ismart_client.request_template import RequestTemplate, RequestTemplateCache
+from test_saic_api import UID, TOKEN, VIN
+
+EVENT_CREATION_TIME = 1700000000
+
+
+def create_vehicle_status_req_msg(message_coder: MessageCoderV21, token: str, event_id: str = None) -> MessageV2:
+    vehicle_status_req = OtaRvmVehicleStatusReq()
+    vehicle_status_req.veh_status_req_type = 2
+    vehicle_status_req_msg = MessageV2(MessageBodyV2(), vehicle_status_req)
+    message_coder.initialize_message(UID, token, VIN, '511', 25857, 1, vehicle_status_req_msg)
+    vehicle_status_req_msg.body.ack_required = False
+    if event_id is not None:
+        vehicle_status_req_msg.body.event_id = event_id
+    return vehicle_status_req_msg
+
+
+class TestRequestTemplate(TestCase):
+    def setUp(self) -> None:
+        self.message_coder_v2_1 = MessageCoderV21()
+        self.message_coder_v3_0 = MessageCoderV30()
+
+    def test_request_matches_full_encoding(self):
+        with patch.object(self.message_coder_v2_1, 'get_current_time', return_value=EVENT_CREATION_TIME):
+            template = RequestTemplate(self.message_coder_v2_1,
+                                       create_vehicle_status_req_msg(self.message_coder_v2_1, 'outdated token'))
+            for token, event_id in [(TOKEN, None), (TOKEN, 123456), ('X' * 40, 7)]:
+                expected_msg = create_vehicle_status_req_msg(self.message_coder_v2_1, token, event_id)
+                expected_hex = self.message_coder_v2_1.encode_request(expected_msg)
+
+                request_data, request_hex = template.create_request(token, event_id)
+                self.assertEqual(expected_hex, request_hex)
+                self.assertEqual(expected_msg.get_data(), request_data)
+
+    def test_request_without_application_data(self):
+        chrg_mgmt_data_req_msg = MessageV30(MessageBodyV30())
+        self.message_coder_v3_0.initialize_message(UID, TOKEN, VIN, '516', 768, 5, chrg_mgmt_data_req_msg)
+        template = RequestTemplate(self.message_coder_v3_0, chrg_mgmt_data_req_msg)
+
+        request_data, request_hex = template.create_request(TOKEN)
+        message = self.message_coder_v3_0.create_message()
+        self.message_coder_v3_0.decode_response(request_hex, message)
+        self.assertIsNone(request_data['applicationData'])
+        self.assertEqual(0, message.body.application_data_length)
+        self.assertEqual(5, message.body.message_id)
+        self.assertEqual(TOKEN, message.body.token)
+
+
+class TestRequestTemplateCache(TestCase):
+    def setUp(self) -> None:
+        self.message_coder = MessageCoderV21()
+        self.request_template_cache = RequestTemplateCache()
+
+    def create_template(self) -> RequestTemplate:
+        return RequestTemplate(self.message_coder, create_vehicle_status_req_msg(self.message_coder, TOKEN))
+
+    def test_template_is_reused_until_invalidated(self):
+        template = self.request_template_cache.get_template(VIN, '511', 1, self.create_template)
+        self.assertIs(template, self.request_template_cache.get_template(VIN, '511', 1, self.create_template))
+        self.assertIsNot(template, self.request_template_cache.get_template('vin20000000000000', '511', 1,
+                                                                            self.create_template))
+        self.assertEqual(2, len(self.request_template_cache))
+
+        self.request_template_cache.invalidate()
+        self.assertEqual(0, len(self.request_template_cache))
+        self.assertIsNot(template, self.request_template_cache.get_template(VIN, '511', 1, self.create_template))
+
+    def test_template_created_during_invalidation_is_not_stored(self):
+        def create_template_and_invalidate() -> RequestTemplate:
+            self.request_template_cache.invalidate()
+            return self.create_template()
+
+        self.assertIsNotNone(self.request_template_cache.get_template(VIN, '511', 1, create_template_and_invalidate))
+        self.assertEqual(0, len(self.request_template_cache))
@@ -0,0 +1,52 @@
+from unittest import TestCase
+
+from saic_ismart_client.retry_policy import AdaptiveRetryPolicy, LatencyHistogram
+
+VIN = 'vin10000000000000'
+
+
+class TestLatencyHistogram(TestCase):
+    def test_percentile(self):
+        histogram = LatencyHistogram(bucket_width=0.5, max_latency=60.0)
+        self.assertIsNone(histogram.percentile(0.5))
+        for latency in [4.2, 4.8, 5.1, 5.3, 12.0]:
+            histogram.add(latency)
+        self.assertEqual(5, histogram.count)
+        self.assertEqual(4.5, histogram.percentile(0.2))
+        self.assertEqual(5.5, histogram.percentile(0.8))
+        self.assertEqual(12.0, histogram.percentile(1.0))
+
+    def test_latencies_above_the_maximum(self):
+        histogram = LatencyHistogram(bucket_width=1.0, max_latency=10.0)
+        histogram.add(42.0)
+        self.assertEqual(42.0, histogram.percentile(0.5))
+
+
+class TestAdaptiveRetryPolicy(TestCase):
+    def setUp(self) -> None:
+        self.retry_policy = AdaptiveRetryPolicy(percentile=0.9, min_samples=3, min_delay=1.0, probe_ratio=0.8)
+
+    def test_no_delay_without_enough_samples(self):
+        self.retry_policy.record(VIN, '511', 5.0)
+        self.assertIsNone(self.retry_policy.get_delay(VIN, '511', 1.0))
+
+    def test_delay_near_learned_latency(self):
+        for _ in range(3):
+            self.retry_policy.record(VIN, '511', 5.0)
+        # probe shortly before the learned latency, then at the latency itself
+        self.assertAlmostEqual(3.0, self.retry_policy.get_delay(VIN, '511', 1.0))
+        self.assertAlmostEqual(1.5, self.retry_policy.get_delay(VIN, '511', 3.5))
+        # nothing left to learn from, use the fixed delays
+        self.assertIsNone(self.retry_policy.get_delay(VIN, '511', 4.5))
+        self.assertIsNone(self.retry_policy.get_delay(VIN, '516', 1.0))
+
+    def test_fallback_to_all_vehicles(self):
+        for i in range(3):
+            self.retry_policy.record(f'vin{i}0000000000000', '511', 10.0)
+        self.assertAlmostEqual(7.0, self.retry_policy.get_delay(VIN, '511', 1.0))
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            AdaptiveRetryPolicy(percentile=0.0)
+        with self.assertRaises(ValueError):
+            AdaptiveRetryPolicy(min_samples=0)
@@ -0,0 +1,57 @@
+from unittest import TestCase
+from unittest.mock import patch
+
+from saic_ismart_client.common_model import MessageBodyV2, MessageV2
+from saic_ismart_client.ota_v2_1.Message import MessageCoderV21
+from saic_ismart_client.ota_v2_1.rvc_command import RvcCommandCatalog
+from test_Message_v2_1 import get_ota_rvc_req_test_data
+from test_saic_api import UID, TOKEN, VIN
+
+EVENT_CREATION_TIME = 1700000000
+
+
+class TestRvcCommandCatalog(TestCase):
+    def setUp(self) -> None:
+        self.message_coder = MessageCoderV21()
+        self.rvc_command_catalog = RvcCommandCatalog(self.message_coder)
+
+    def test_command_matches_full_encoding(self):
+        ota_rvc_req = get_ota_rvc_req_test_data()
+        rvc_command = self.rvc_command_catalog.find_my_car(True, True)
+
+        self.assertEqual(self.message_coder.asn1_tool_uper.encode(ota_rvc_req.asn_type, ota_rvc_req.get_data()),
+                         rvc_command.application_data_bytes)
+        self.assertEqual(ota_rvc_req.get_data(), rvc_command.get_data())
+        self.assertTrue(rvc_command.has_app_data)
+
+    def test_request_matches_full_encoding(self):
+        rvc_command = self.rvc_command_catalog.find_my_car(True, True)
+        with patch.object(self.message_coder, 'get_current_time', return_value=EVENT_CREATION_TIME):
+            expected_message = MessageV2(MessageBodyV2(), get_ota_rvc_req_test_data())
+            self.message_coder.initialize_message(UID, TOKEN, VIN, '510', 25857, 1, expected_message)
+            expected_hex = self.message_coder.encode_request(expected_message)
+
+            actual_message = MessageV2(MessageBodyV2())
+            self.message_coder.initialize_message(UID, TOKEN, VIN, '510', 25857, 1, actual_message)
+            actual_hex = self.message_coder.encode_request(actual_message, rvc_command.application_data_bytes)
+
+        self.assertEqual(expected_hex, actual_hex)
+
+    def test_commands_are_encoded_once(self):
+        lock_vehicle = self.rvc_command_catalog.lock_vehicle()
+        start_ac = self.rvc_command_catalog.control_climate(2, None, 8)
+
+        self.assertIs(lock_vehicle, self.rvc_command_catalog.lock_vehicle())
+        self.assertIs(start_ac, self.rvc_command_catalog.control_climate(2, None, 8))
+        self.assertIsNot(start_ac, self.rvc_command_catalog.control_climate(2, None, 9))
+        self.assertEqual(3, len(self.rvc_command_catalog))
+
+    def test_stop_climate_is_normalized(self):
+        self.assertIs(self.rvc_command_catalog.control_climate(0, False, 0),
+                      self.rvc_command_catalog.control_climate(0, True, 14))
+
+    def test_invalid_climate_parameters(self):
+        with self.assertRaises(Exception):
+            self.rvc_command_catalog.control_climate(6, True, 8)
+        with self.assertRaises(Exception):
+            self.rvc_command_catalog.control_climate(2, True, 15)
@@ -1,3 +1,5 @@
+import threading
+import time
 from typing import cast
 from unittest import TestCase
 from unittest.mock import patch, PropertyMock
@@ -6,6 +8,10 @@ import requests
 import saic_ismart_client.saic_api
 
 from saic_ismart_client.common_model import Header, MessageV2, MessageBodyV2
+from saic_ismart_client.deadline import CancellationToken, Deadline
+from saic_ismart_client.circuit_breaker import CircuitBreakerRegistry, CircuitState
+from saic_ismart_client.exceptions import SaicApiCancelled, SaicApiCircuitOpen, SaicApiDeadlineExceeded
+from saic_ismart_client.http_session import HttpSessionConfig
 from saic_ismart_client.ota_v1_1.Message import MessageCoderV11
 from saic_ismart_client.ota_v1_1.data_model import MessageV11, MpUserLoggingInRsp, MessageBodyV11, VinInfo, \
     MpAlarmSettingType
@@ -15,7 +21,11 @@ from saic_ismart_client.ota_v2_1.data_model import OtaRvmVehicleStatusResp25857,
 from saic_ismart_client.ota_v3_0.Message import MessageBodyV30, MessageV30, MessageCoderV30
 from saic_ismart_client.ota_v3_0.data_model import OtaChrgMangDataResp, RvsChargingStatus
 
+from saic_ismart_client.rate_limiter import RateLimit, RateLimiter
+from saic_ismart_client.retry_policy import AdaptiveRetryPolicy
 from saic_ismart_client.saic_api import SaicApi, SaicApiException
+from saic_ismart_client.status_cache import StatusCache
+from helpers import FakeClock
 
 TOKEN = '99X9999X-90XX-99X9-99X9-9XX9XX0X9X9XXX9X'
 UID = '00000000000000000000000000000000000090000000099999'
@@ -267,7 +277,7 @@ class TestSaicApi(TestCase):
         self.message_coder_v2_1 = MessageCoderV21()
         self.message_coder_v3_0 = MessageCoderV30()
 
-    @patch.object(requests, 'post')
+    @patch.object(requests.Session, 'post')
     def test_login(self, mocked_post):
         mock_response(mocked_post, mock_login_response_hex(self.message_coder_v1_1))
 
@@ -276,7 +286,7 @@ class TestSaicApi(TestCase):
         app_data = cast(MpUserLoggingInRsp, login_response_message.application_data)
         self.assertEqual('user_name', app_data.user_name)
 
-    @patch.object(requests, 'post')
+    @patch.object(requests.Session, 'post')
     def test_set_alarm_switches(self, mocked_post):
         mock_response(mocked_post, mock_alarm_switch_response_hex(self.message_coder_v1_1))
 
@@ -288,7 +298,7 @@ class TestSaicApi(TestCase):
         except SaicApiException:
             self.fail()
 
-    @patch.object(requests, 'post')
+    @patch.object(requests.Session, 'post')
     def test_get_vehicle_status(self, mocked_post):
         vin_info = create_vin_info(VIN)
         mock_response(mocked_post, mock_vehicle_status_response(self.message_coder_v2_1, UID, TOKEN, vin_info))
@@ -297,7 +307,37 @@ class TestSaicApi(TestCase):
         app_data = cast(OtaRvmVehicleStatusResp25857, vehicle_status_rsp_msg.application_data)
         self.assertEqual(1000000000, app_data.status_time)
 
-    @patch.object(requests, 'post')
+    @patch.object(requests.Session, 'post')
+    def test_status_requests_use_template_until_login(self, mocked_post):
+        vin_info = create_vin_info(VIN)
+        mock_response(mocked_post, mock_vehicle_status_response(self.message_coder_v2_1, UID, TOKEN, vin_info))
+        self.saic_api.get_vehicle_status(vin_info)
+
+        with patch.object(self.saic_api.message_V2_1_coder, 'get_application_data_bytes') as mocked_encode:
+            self.saic_api.get_vehicle_status(vin_info, 1234)
+            mocked_encode.assert_not_called()
+        self.assertEqual(1, len(self.saic_api.request_template_cache))
+
+        mock_response(mocked_post, mock_login_response_hex(self.message_coder_v1_1))
+        self.saic_api.login()
+        self.assertEqual(0, len(self.saic_api.request_template_cache))
+
+    @patch.object(requests.Session, 'post')
+    def test_json_payload_only_built_for_subscribers(self, mocked_post):
+        vin_info = create_vin_info(VIN)
+        mock_response(mocked_post, mock_vehicle_status_response(self.message_coder_v2_1, UID, TOKEN, vin_info))
+
+        with patch.object(saic_ismart_client.saic_api.LOG, 'isEnabledFor', return_value=False):
+            vehicle_status_rsp_msg = self.saic_api.get_vehicle_status(vin_info)
+            self.assertFalse(vehicle_status_rsp_msg.is_application_data_decoded())
+
+            published = {}
+            self.saic_api.on_publish_json_value = lambda key, data: published.update({key: data})
+            vehicle_status_rsp_msg = self.saic_api.get_vehicle_status(vin_info)
+            self.assertTrue(vehicle_status_rsp_msg.is_application_data_decoded())
+            self.assertEqual(1000000000, published['511_25857/json/response']['applicationData']['statusTime'])
+
+    @patch.object(requests.Session, 'post')
     def test_get_charging_status(self, mocked_post):
         vin_info = create_vin_info(VIN)
         mock_response(mocked_post, mock_chrg_mgmt_data_rsp(self.message_coder_v3_0, UID, TOKEN, vin_info))
@@ -306,7 +346,7 @@ class TestSaicApi(TestCase):
         app_data = cast(OtaChrgMangDataResp, chrg_mgmt_data_rsp_msg.application_data)
         self.assertEqual(1023, app_data.bmsChrgOtptCrntReq)
 
-    @patch.object(requests, 'post')
+    @patch.object(requests.Session, 'post')
     def test_start_ac(self, mocked_post):
         vin_info = create_vin_info(VIN)
         mock_response(mocked_post, mock_start_ac_rsp_msg(self.message_coder_v2_1, UID, TOKEN, vin_info))
@@ -315,3 +355,335 @@ class TestSaicApi(TestCase):
         app_data = cast(OtaRvcStatus25857, start_ac_rsp_msg.application_data)
         self.assertEqual(b'\x06', app_data.rvcReqType)
         self.assertEqual(False, start_ac_rsp_msg.body.ack_required)
+
+    def test_coders_are_created_lazily(self):
+        with patch.object(saic_ismart_client.saic_api, 'MessageCoderV21', wraps=MessageCoderV21) as coder_class:
+            saic_api = SaicApi('https://tap-eu.soimt.com', 'https://gateway-eu.soimt.com', 'user@home.de', 'secret')
+            coder_class.assert_not_called()
+
+            threads = [threading.Thread(target=lambda: saic_api.message_V2_1_coder) for _ in range(8)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+            coder_class.assert_called_once()
+
+    def test_warm_up(self):
+        saic_api = SaicApi('https://tap-eu.soimt.com', 'https://gateway-eu.soimt.com', 'user@home.de', 'secret')
+        saic_api.warm_up()
+        self.assertIs(saic_api.message_v1_1_coder, saic_api.message_v1_1_coder)
+        self.assertIsInstance(saic_api.message_V2_1_coder, MessageCoderV21)
+        self.assertIsInstance(saic_api.message_V3_0_coder, MessageCoderV30)
+
+    @patch.object(requests.Session, 'post')
+    def test_requests_share_session(self, mocked_post):
+        http_session_config = HttpSessionConfig(pool_maxsize=2, connect_timeout=5.0, read_timeout=30.0)
+        with SaicApi('https://tap-eu.soimt.com', 'https://gateway-eu.soimt.com', 'user@home.de', 'secret',
+                     http_session_config=http_session_config) as saic_api:
+            vin_info = create_vin_info(VIN)
+            mock_response(mocked_post, mock_vehicle_status_response(self.message_coder_v2_1, UID, TOKEN, vin_info))
+            saic_api.get_vehicle_status(vin_info)
+            saic_api.get_vehicle_status(vin_info)
+
+            self.assertEqual(2, mocked_post.call_count)
+            self.assertEqual((5.0, 30.0), mocked_post.call_args.kwargs['timeout'])
+            self.assertEqual('text/html', saic_api.session.headers['Content-Type'])
+            self.assertEqual(2, saic_api.session.get_adapter('https://tap-eu.soimt.com')._pool_maxsize)
+            with patch.object(saic_api.session, 'close') as mocked_close:
+                saic_api.close()
+                mocked_close.assert_called_once()
+
+    @patch.object(requests.Session, 'post')
+    def test_concurrent_status_requests_are_coalesced(self, mocked_post):
+        vin_info = create_vin_info(VIN)
+        mock_response(mocked_post, mock_vehicle_status_response(self.message_coder_v2_1, UID, TOKEN, vin_info))
+        self.saic_api.uid = UID
+        self.saic_api.token = TOKEN
+        release = threading.Event()
+        callers = threading.Semaphore(0)
+
+        def delayed_post(*args, **kwargs):
+            release.wait(5)
+            return mocked_post.return_value
+
+        def get_vehicle_status_with_retry():
+            callers.release()
+            results.append(self.saic_api.get_vehicle_status_with_retry(vin_info))
+
+        mocked_post.side_effect = delayed_post
+        results = []
+        threads = [threading.Thread(target=get_vehicle_status_with_retry) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for _ in threads:
+            callers.acquire()
+        time.sleep(0.05)
+        release.set()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(1, mocked_post.call_count)
+        self.assertTrue(all(r is results[0] for r in results))
+        self.assertEqual(1000000000, results[0].application_data.status_time)
+
+    @patch.object(requests.Session, 'post')
+    def test_waiting_caller_keeps_its_deadline(self, mocked_post):
+        vin_info = create_vin_info(VIN)
+        mock_response(mocked_post, mock_vehicle_status_response(self.message_coder_v2_1, UID, TOKEN, vin_info))
+        self.saic_api.uid = UID
+        self.saic_api.token = TOKEN
+        release = threading.Event()
+        posted = threading.Event()
+
+        def delayed_post(*args, **kwargs):
+            posted.set()
+            release.wait(5)
+            return mocked_post.return_value
+
+        mocked_post.side_effect = delayed_post
+        leader = threading.Thread(target=self.saic_api.get_vehicle_status_with_retry, args=(vin_info,))
+        leader.start()
+        self.assertTrue(posted.wait(5))
+        start = time.monotonic()
+        try:
+            with self.assertRaises(SaicApiDeadlineExceeded):
+                self.saic_api.get_vehicle_status_with_retry(vin_info, deadline=Deadline(0.2))
+            self.assertLess(time.monotonic() - start, 2.0)
+            # a deadline entered by the caller applies as well
+            with self.assertRaises(SaicApiDeadlineExceeded), Deadline(0.2):
+                self.saic_api.get_vehicle_status_with_retry(vin_info)
+        finally:
+            release.set()
+            leader.join()
+        self.assertEqual(1, mocked_post.call_count)
+
+    @patch.object(requests.Session, 'post')
+    def test_status_cache_is_invalidated_by_control_commands(self, mocked_post):
+        vin_info = create_vin_info(VIN)
+        saic_api = SaicApi('https://tap-eu.soimt.com', 'https://gateway-eu.soimt.com', 'user@home.de', 'secret',
+                           status_cache=StatusCache(ttl=60.0))
+        mock_response(mocked_post, mock_vehicle_status_response(self.message_coder_v2_1, UID, TOKEN, vin_info))
+        first = saic_api.get_vehicle_status_with_retry(vin_info)
+        second = saic_api.get_vehicle_status_with_retry(vin_info)
+        self.assertIs(first, second)
+        self.assertEqual(1, mocked_post.call_count)
+
+        mock_response(mocked_post, mock_start_ac_rsp_msg(self.message_coder_v2_1, UID, TOKEN, vin_info))
+        saic_api.start_ac(vin_info)
+        self.assertEqual(0, len(saic_api.status_cache))
+        saic_api.close()
+
+    @patch.object(requests.Session, 'post')
+    def test_status_cache_refresh_ignores_caller_deadline(self, mocked_post):
+        vin_info = create_vin_info(VIN)
+        clock = FakeClock()
+        saic_api = SaicApi('https://tap-eu.soimt.com', 'https://gateway-eu.soimt.com', 'user@home.de', 'secret',
+                           status_cache=StatusCache(ttl=30.0, max_stale=60.0, clock=clock))
+        saic_api.uid = UID
+        saic_api.token = TOKEN
+        mock_response(mocked_post, mock_vehicle_status_response(self.message_coder_v2_1, UID, TOKEN, vin_info))
+        first = saic_api.get_vehicle_status_with_retry(vin_info)
+        clock.now = 40.0
+        cancellation_token = CancellationToken()
+        cancellation_token.cancel()
+
+        stale = saic_api.get_vehicle_status_with_retry(vin_info,
+                                                       deadline=Deadline(cancellation_token=cancellation_token))
+        saic_api.status_cache.close(wait=True)
+
+        self.assertIs(first, stale)
+        self.assertEqual(2, mocked_post.call_count)
+        self.assertIsNot(first, saic_api.get_vehicle_status_with_retry(vin_info))
+        saic_api.close()
+
+    @patch.object(requests.Session, 'post')
+    def test_retry_waits_for_learned_latency(self, mocked_post):
+        vin_info = create_vin_info(VIN)
+        retry_policy = AdaptiveRetryPolicy(min_samples=1, probe_ratio=1.0)
+        retry_policy.record(VIN, '511', 5.0)
+        saic_api = SaicApi('https://tap-eu.soimt.com', 'https://gateway-eu.soimt.com', 'user@home.de', 'secret',
+                           retry_policy=retry_policy)
+        saic_api.uid = UID
+        saic_api.token = TOKEN
+        pending_rsp_msg = MessageV2(MessageBodyV2())
+        self.message_coder_v2_1.initialize_message(UID, TOKEN, VIN, '511', 25857, 1, pending_rsp_msg)
+        responses = [self.message_coder_v2_1.encode_request(pending_rsp_msg),
+                     mock_vehicle_status_response(self.message_coder_v2_1, UID, TOKEN, vin_info)]
+
+        def post(*args, **kwargs):
+            mock_response(mocked_post, responses.pop(0))
+            return mocked_post.return_value
+
+        mocked_post.side_effect = post
+        with patch.object(saic_ismart_client.saic_api.time, 'sleep') as mocked_sleep:
+            saic_api.get_vehicle_status_with_retry(vin_info)
+
+        waiting_time = mocked_sleep.call_args.args[0]
+        self.assertLess(waiting_time, 5.0)
+        self.assertGreater(waiting_time, 4.0)
+        saic_api.close()
+
+    @patch.object(requests.Session, 'post')
+    def test_retry_fails_at_deadline(self, mocked_post):
+        vin_info = create_vin_info(VIN)
+        self.saic_api.uid = UID
+        self.saic_api.token = TOKEN
+        pending_rsp_msg = MessageV2(MessageBodyV2())
+        self.message_coder_v2_1.initialize_message(UID, TOKEN, VIN, '511', 25857, 1, pending_rsp_msg)
+        mock_response(mocked_post, self.message_coder_v2_1.encode_request(pending_rsp_msg))
+        now = [0.0]
+        deadline = Deadline(20.0, clock=lambda: now[0])
+        sleeps = []
+
+        def sleep(waiting_time):
+            sleeps.append(waiting_time)
+            # each attempt takes another 3 seconds
+            now[0] += waiting_time + 3.0
+
+        with patch.object(saic_ismart_client.saic_api.time, 'sleep', side_effect=sleep), \
+                self.assertRaises(SaicApiDeadlineExceeded):
+            self.saic_api.get_vehicle_status_with_retry(vin_info, deadline=deadline)
+
+        # the 15 s retry delays are compressed to half of the remaining budget
+        self.assertEqual([10.0, 3.5, 0.25], sleeps)
+        self.assertEqual(3, mocked_post.call_count)
+
+    @patch.object(requests.Session, 'post')
+    def test_cancelled_call_is_not_sent(self, mocked_post):
+        cancellation_token = CancellationToken()
+        cancellation_token.cancel()
+        with self.assertRaises(SaicApiCancelled):
+            self.saic_api.get_vehicle_status_with_retry(create_vin_info(VIN),
+                                                        deadline=Deadline(cancellation_token=cancellation_token))
+        mocked_post.assert_not_called()
+
+    @patch.object(requests.Session, 'post')
+    def test_submit_rvc_command(self, mocked_post):
+        vin_info = create_vin_info(VIN)
+        self.saic_api.uid = UID
+        self.saic_api.token = TOKEN
+        pending_rsp_msg = MessageV2(MessageBodyV2())
+        self.message_coder_v2_1.initialize_message(UID, TOKEN, VIN, '510', 25857, 1, pending_rsp_msg)
+        pending_rsp_msg.body.event_id = 123
+        responses = [self.message_coder_v2_1.encode_request(pending_rsp_msg),
+                     mock_start_ac_rsp_msg(self.message_coder_v2_1, UID, TOKEN, vin_info)]
+
+        def post(*args, **kwargs):
+            mock_response(mocked_post, responses.pop(0))
+            return mocked_post.return_value
+
+        mocked_post.side_effect = post
+        with patch.object(self.saic_api, 'get_retry_delay', return_value=0.0):
+            rvc_command = self.saic_api.rvc_command_catalog.control_climate(5, True, 8)
+            pending_result = self.saic_api.submit_rvc_command(vin_info, rvc_command)
+            self.assertEqual(123, pending_result.event_id)
+            start_ac_rsp_msg = pending_result.result(5)
+
+        self.assertEqual(b'\x06', cast(OtaRvcStatus25857, start_ac_rsp_msg.application_data).rvcReqType)
+        self.assertEqual(2, mocked_post.call_count)
+        self.saic_api.close()
+
+    @patch.object(requests.Session, 'post')
+    def test_submit_fails_on_first_request(self, mocked_post):
+        self.saic_api.uid = UID
+        self.saic_api.token = TOKEN
+        mocked_post.side_effect = requests.exceptions.ConnectionError('connection refused')
+        rvc_command = self.saic_api.rvc_command_catalog.control_climate(5, True, 8)
+
+        pending_result = self.saic_api.submit_rvc_command(create_vin_info(VIN), rvc_command)
+
+        self.assertTrue(pending_result.done())
+        self.assertIsInstance(pending_result.exception(), SaicApiException)
+        self.saic_api.close()
+
+    def test_relogin_is_shared(self):
+        self.saic_api.token = TOKEN
+
+        def login():
+            self.saic_api.token = 'new token'
+
+        with patch.object(self.saic_api, 'login', side_effect=login) as mocked_login:
+            self.saic_api.relogin_if_needed(TOKEN)
+            self.saic_api.relogin_if_needed(TOKEN)
+
+        mocked_login.assert_called_once()
+        self.assertEqual('new token', self.saic_api.token)
+
+    @patch.object(requests.Session, 'post')
+    def test_circuit_breaker_is_shared(self, mocked_post):
+        vin_info = create_vin_info(VIN)
+        circuit_breakers = CircuitBreakerRegistry(minimum_calls=2, window_size=2)
+        saic_apis = [SaicApi('https://tap-eu.soimt.com', 'https://gateway-eu.soimt.com', 'user@home.de', 'secret',
+                             circuit_breakers=circuit_breakers) for _ in range(2)]
+        unavailable_rsp_msg = MessageV2(MessageBodyV2())
+        self.message_coder_v2_1.initialize_message(UID, TOKEN, VIN, '511', 25857, 1, unavailable_rsp_msg)
+        unavailable_rsp_msg.body.result = 6
+        unavailable_rsp_msg.body.error_message = 'The service is not available'.encode()
+        mock_response(mocked_post, self.message_coder_v2_1.encode_request(unavailable_rsp_msg))
+        for saic_api in saic_apis:
+            saic_api.uid = UID
+            saic_api.token = TOKEN
+            saic_api.get_vehicle_status(vin_info)
+
+        for saic_api in saic_apis:
+            with self.assertRaises(SaicApiCircuitOpen):
+                saic_api.get_vehicle_status(vin_info)
+            saic_api.close()
+        self.assertEqual(2, mocked_post.call_count)
+        self.assertEqual(CircuitState.OPEN,
+                         circuit_breakers.get_states()[('user@home.de', '/TAP.Web/ota.mpv21')])
+
+    @patch.object(requests.Session, 'post')
+    def test_rate_limiter_delays_requests(self, mocked_post):
+        vin_info = create_vin_info(VIN)
+        saic_api = SaicApi('https://tap-eu.soimt.com', 'https://gateway-eu.soimt.com', 'user@home.de', 'secret',
+                           rate_limiter=RateLimiter(per_vin=RateLimit(0.5)))
+        saic_api.uid = UID
+        saic_api.token = TOKEN
+        mock_response(mocked_post, mock_vehicle_status_response(self.message_coder_v2_1, UID, TOKEN, vin_info))
+        with patch.object(saic_ismart_client.saic_api.time, 'sleep') as mocked_sleep:
+            saic_api.get_vehicle_status(vin_info)
+            mocked_sleep.assert_not_called()
+            saic_api.get_vehicle_status(vin_info)
+
+        self.assertAlmostEqual(2.0, mocked_sleep.call_args.args[0], places=1)
+        self.assertEqual(2, mocked_post.call_count)
+        saic_api.close()
+
+    @patch.object(requests.Session, 'post')
+    def test_rate_limit_wait_beyond_deadline_is_not_reserved(self, mocked_post):
+        vin_info = create_vin_info(VIN)
+        rate_limiter = RateLimiter(per_vin=RateLimit(0.1))
+        saic_api = SaicApi('https://tap-eu.soimt.com', 'https://gateway-eu.soimt.com', 'user@home.de', 'secret',
+                           rate_limiter=rate_limiter)
+        saic_api.uid = UID
+        saic_api.token = TOKEN
+        mock_response(mocked_post, mock_vehicle_status_response(self.message_coder_v2_1, UID, TOKEN, vin_info))
+        saic_api.get_vehicle_status(vin_info)
+        with self.assertRaises(SaicApiDeadlineExceeded), Deadline(1.0):
+            saic_api.get_vehicle_status(vin_info)
+
+        self.assertEqual(1, mocked_post.call_count)
+        self.assertAlmostEqual(10.0, rate_limiter.reserve('user@home.de', VIN, 'ota.mpv21'), places=0)
+        saic_api.close()
+
+    def test_transport_errors_open_the_circuit(self):
+        vin_info = create_vin_info(VIN)
+        circuit_breakers = CircuitBreakerRegistry(minimum_calls=2, window_size=2)
+        saic_api = SaicApi('https://tap-eu.soimt.com', 'https://gateway-eu.soimt.com', 'user@home.de', 'secret',
+                           circuit_breakers=circuit_breakers)
+        saic_api.uid = UID
+        saic_api.token = TOKEN
+        with patch.object(saic_api, 'send_request', side_effect=SaicApiDeadlineExceeded('deadline exceeded')):
+            with self.assertRaises(SaicApiDeadlineExceeded):
+                saic_api.get_vehicle_status(vin_info)
+        self.assertEqual(0.0, circuit_breakers.get('user@home.de', '/TAP.Web/ota.mpv21').failure_rate())
+
+        with patch.object(saic_api, 'send_request', side_effect=SaicApiException('Timeout error')) as mocked_send:
+            for _ in range(2):
+                with self.assertRaises(SaicApiException):
+                    saic_api.get_vehicle_status(vin_info)
+            with self.assertRaises(SaicApiCircuitOpen):
+                saic_api.get_vehicle_status(vin_info)
+        self.assertEqual(2, mocked_send.call_count)
+        saic_api.close()
@@ -0,0 +1,180 @@
+import asyncio
+import threading
+import time
+from unittest import IsolatedAsyncioTestCase, TestCase
+
+from saic_ismart_client.deadline import CancellationToken, Deadline
+from saic_ismart_client.exceptions import SaicApiCancelled, SaicApiDeadlineExceeded
+from saic_ismart_client.single_flight import AsyncSingleFlight, SingleFlight
+
+
+class TestSingleFlight(TestCase):
+    def test_concurrent_calls_share_result(self):
+        single_flight = SingleFlight()
+        release = threading.Event()
+        calls = []
+
+        def func():
+            calls.append(1)
+            release.wait(5)
+            return object()
+
+        results = []
+        callers = threading.Semaphore(0)
+
+        def call():
+            callers.release()
+            results.append(single_flight.do('key', func))
+
+        threads = [threading.Thread(target=call) for _ in range(5)]
+        for t in threads:
+            t.start()
+        for _ in threads:
+            callers.acquire()
+        # give the last callers time to reach the shared call
+        time.sleep(0.05)
+        release.set()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(1, len(calls))
+        self.assertEqual(5, len(results))
+        self.assertTrue(all(r is results[0] for r in results))
+        self.assertFalse(single_flight.is_in_flight('key'))
+
+    def test_exception_is_shared_and_not_cached(self):
+        single_flight = SingleFlight()
+
+        def fail():
+            raise ValueError('failed')
+
+        with self.assertRaises(ValueError):
+            single_flight.do('key', fail)
+        self.assertEqual(42, single_flight.do('key', lambda: 42))
+
+    def test_waiting_caller_keeps_its_deadline(self):
+        single_flight = SingleFlight()
+        started = threading.Event()
+        release = threading.Event()
+
+        def lead():
+            started.set()
+            release.wait(5)
+            return 42
+
+        leader = threading.Thread(target=single_flight.do, args=('key', lead))
+        leader.start()
+        started.wait(5)
+        start = time.monotonic()
+        with self.assertRaises(SaicApiDeadlineExceeded):
+            single_flight.do('key', lambda: 43, Deadline(0.2))
+        self.assertLess(time.monotonic() - start, 1.0)
+        release.set()
+        leader.join()
+
+    def test_waiting_caller_can_be_cancelled(self):
+        single_flight = SingleFlight()
+        started = threading.Event()
+        release = threading.Event()
+
+        def lead():
+            started.set()
+            release.wait(5)
+            return 42
+
+        leader = threading.Thread(target=single_flight.do, args=('key', lead))
+        leader.start()
+        started.wait(5)
+        cancellation_token = CancellationToken()
+        threading.Timer(0.1, cancellation_token.cancel).start()
+        with self.assertRaises(SaicApiCancelled):
+            single_flight.do('key', lambda: 43, Deadline(cancellation_token=cancellation_token))
+        release.set()
+        leader.join()
+
+    def test_deadline_of_leader_is_not_shared(self):
+        single_flight = SingleFlight()
+        started = threading.Event()
+        release = threading.Event()
+        errors = []
+
+        def lead():
+            started.set()
+            release.wait(5)
+            raise SaicApiDeadlineExceeded('leader deadline exceeded')
+
+        def call_leader():
+            try:
+                single_flight.do('key', lead)
+            except SaicApiDeadlineExceeded as e:
+                errors.append(e)
+
+        leader = threading.Thread(target=call_leader)
+        leader.start()
+        started.wait(5)
+        threading.Timer(0.1, release.set).start()
+        # the waiting caller makes its own call once the leader gave up
+        self.assertEqual(43, single_flight.do('key', lambda: 43))
+        leader.join()
+        self.assertEqual(1, len(errors))
+
+
+class TestAsyncSingleFlight(IsolatedAsyncioTestCase):
+    async def test_concurrent_calls_share_result(self):
+        single_flight = AsyncSingleFlight()
+        calls = []
+
+        async def func():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return object()
+
+        results = await asyncio.gather(*[single_flight.do('key', func) for _ in range(5)])
+        self.assertEqual(1, len(calls))
+        self.assertTrue(all(r is results[0] for r in results))
+        self.assertIsNot(results[0], await single_flight.do('key', func))
+
+    async def test_cancelled_caller_does_not_cancel_shared_call(self):
+        single_flight = AsyncSingleFlight()
+
+        async def func():
+            await asyncio.sleep(0.01)
+            return 42
+
+        first = asyncio.ensure_future(single_flight.do('key', func))
+        second = asyncio.ensure_future(single_flight.do('key', func))
+        await asyncio.sleep(0)
+        first.cancel()
+        self.assertEqual(42, await second)
+
+    async def test_waiting_caller_keeps_its_deadline(self):
+        single_flight = AsyncSingleFlight()
+
+        async def lead():
+            await asyncio.sleep(1)
+            return 42
+
+        async def follow():
+            return 43
+
+        leader = asyncio.ensure_future(single_flight.do('key', lead))
+        await asyncio.sleep(0)
+        with self.assertRaises(SaicApiDeadlineExceeded):
+            await single_flight.do('key', follow, Deadline(0.05))
+        leader.cancel()
+
+    async def test_deadline_of_leader_is_not_shared(self):
+        single_flight = AsyncSingleFlight()
+
+        async def lead():
+            await asyncio.sleep(0.01)
+            raise SaicApiDeadlineExceeded('leader deadline exceeded')
+
+        async def follow():
+            return 43
+
+        leader = asyncio.ensure_future(single_flight.do('key', lead))
+        await asyncio.sleep(0)
+        self.assertEqual(43, await single_flight.do('key', follow))
+        with self.assertRaises(SaicApiDeadlineExceeded):
+            await leader
@@ -0,0 +1,126 @@
+import os
+import pathlib
+import shutil
+import tempfile
+import threading
+from unittest import TestCase
+from unittest.mock import patch
+
+from saic_ismart_client.ota_v1_1.Message import MessageCoderV11
+from saic_ismart_client.ota_v2_1.Message import MessageCoderV21
+from saic_ismart_client.ota_v3_0.Message import MessageCoderV30
+from saic_ismart_client.specification_registry import ENV_CACHE_DIR, SPECIFICATION_REGISTRY, \
+    SpecificationDiskCache, SpecificationRegistry, get_default_disk_cache
+from saic_ismart_client.uper_codec import UperCodec
+
+
+class TestSpecificationRegistry(TestCase):
+    def test_coders_share_specification(self):
+        self.assertIs(MessageCoderV21().asn1_tool_uper, MessageCoderV21().asn1_tool_uper)
+        self.assertIs(MessageCoderV30().asn1_tool_uper, MessageCoderV30().asn1_tool_uper)
+        self.assertIsNot(MessageCoderV11().asn1_tool_uper, MessageCoderV21().asn1_tool_uper)
+
+    def test_hit_and_miss_counters(self):
+        coder = MessageCoderV21()
+        registry = SpecificationRegistry()
+        first = registry.get_specification(coder.asn_files_dir, coder.asn_files, 'uper')
+        second = registry.get_specification(coder.asn_files_dir, coder.asn_files, 'uper')
+
+        self.assertIs(first, second)
+        self.assertEqual(1, registry.misses)
+        self.assertEqual(1, registry.hits)
+        self.assertEqual({'hits': 1, 'misses': 1, 'size': 1}, registry.get_stats())
+
+    def test_concurrent_access_compiles_once(self):
+        coder = MessageCoderV30()
+        registry = SpecificationRegistry()
+        specifications = []
+
+        def compile_specification():
+            specifications.append(registry.get_specification(coder.asn_files_dir, coder.asn_files, 'uper'))
+
+        threads = [threading.Thread(target=compile_specification) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(1, registry.misses)
+        self.assertEqual(7, registry.hits)
+        self.assertTrue(all(s is specifications[0] for s in specifications))
+
+    def test_global_registry_is_used(self):
+        MessageCoderV21()
+        hits = SPECIFICATION_REGISTRY.hits
+        MessageCoderV21()
+        # the application data specification and the dispatcher body codec
+        self.assertEqual(hits + 2, SPECIFICATION_REGISTRY.hits)
+
+    def test_coders_share_dispatcher_body_codec(self):
+        self.assertIsInstance(MessageCoderV11().dispatcher_body_codec, UperCodec)
+        self.assertIs(MessageCoderV30().dispatcher_body_codec, MessageCoderV30().dispatcher_body_codec)
+        self.assertIsNot(MessageCoderV21().dispatcher_body_codec, MessageCoderV30().dispatcher_body_codec)
+
+
+class TestSpecificationDiskCache(TestCase):
+    def setUp(self) -> None:
+        self.cache_dir = tempfile.TemporaryDirectory()
+        self.schema_dir = tempfile.TemporaryDirectory()
+        self.coder = MessageCoderV21()
+        for asn_file in self.coder.asn_files:
+            shutil.copy(asn_file, self.schema_dir.name)
+        self.asn_files = [str(p) for p in pathlib.Path(self.schema_dir.name).glob('*.asn1')]
+
+    def tearDown(self) -> None:
+        self.cache_dir.cleanup()
+        self.schema_dir.cleanup()
+
+    def test_warm_start_loads_compiled_specification(self):
+        cold_registry = SpecificationRegistry(SpecificationDiskCache(self.cache_dir.name))
+        cold_registry.get_specification(self.schema_dir.name, self.asn_files, 'uper')
+        self.assertEqual(1, len(list(pathlib.Path(self.cache_dir.name).glob('*.pickle'))))
+
+        warm_registry = SpecificationRegistry(SpecificationDiskCache(self.cache_dir.name))
+        with patch('saic_ismart_client.specification_registry.asn1tools.compile_files') as mocked_compile:
+            specification = warm_registry.get_specification(self.schema_dir.name, self.asn_files, 'uper')
+            mocked_compile.assert_not_called()
+        self.assertEqual({'vehStatusReqType': 2},
+                         specification.decode('OTARVMVehicleStatusReq',
+                                              specification.encode('OTARVMVehicleStatusReq',
+                                                                   {'vehStatusReqType': 2})))
+
+    def test_schema_change_rebuilds_cache(self):
+        key = SpecificationDiskCache.get_key(self.asn_files, 'uper')
+        application_data_file = pathlib.Path(self.schema_dir.name) / 'ApplicationData.asn1'
+        application_data_file.write_text(application_data_file.read_text() + '\n')
+
+        self.assertNotEqual(key, SpecificationDiskCache.get_key(self.asn_files, 'uper'))
+        self.assertNotEqual(key, SpecificationDiskCache.get_key(self.asn_files, 'per'))
+
+    def test_corrupt_cache_file_is_replaced(self):
+        disk_cache = SpecificationDiskCache(self.cache_dir.name)
+        key = SpecificationDiskCache.get_key(self.asn_files, 'uper')
+        disk_cache.get_path(key).write_bytes(b'garbage')
+
+        registry = SpecificationRegistry(disk_cache)
+        self.assertIsNotNone(registry.get_specification(self.schema_dir.name, self.asn_files, 'uper'))
+        self.assertIsNotNone(disk_cache.load(key))
+
+    def test_insecure_cache_is_ignored(self):
+        disk_cache = SpecificationDiskCache(self.cache_dir.name)
+        SpecificationRegistry(disk_cache).get_specification(self.schema_dir.name, self.asn_files, 'uper')
+        key = SpecificationDiskCache.get_key(self.asn_files, 'uper')
+        self.assertIsNotNone(disk_cache.load(key))
+
+        os.chmod(disk_cache.get_path(key), 0o666)
+        self.assertIsNone(disk_cache.load(key))
+        os.chmod(disk_cache.get_path(key), 0o600)
+        os.chmod(self.cache_dir.name, 0o777)
+        self.assertIsNone(disk_cache.load(key))
+        os.chmod(self.cache_dir.name, 0o700)
+
+    def test_disk_cache_is_opt_in(self):
+        with patch.dict(os.environ, {ENV_CACHE_DIR: ''}):
+            self.assertIsNone(get_default_disk_cache())
+        with patch.dict(os.environ, {ENV_CACHE_DIR: self.cache_dir.name}):
+            self.assertEqual(pathlib.Path(self.cache_dir.name), get_default_disk_cache().cache_dir)
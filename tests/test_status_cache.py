@@ -0,0 +1,85 @@
+import threading
+from unittest import TestCase
+
+from saic_ismart_client.status_cache import StatusCache
+from helpers import FakeClock
+
+KEY = ('vin10000000000000', '511', 25857)
+
+
+class TestStatusCache(TestCase):
+    def setUp(self) -> None:
+        self.clock = FakeClock()
+        self.status_cache = StatusCache(ttl=30.0, max_stale=60.0, ttls={'516': 10.0}, clock=self.clock)
+
+    def tearDown(self) -> None:
+        self.status_cache.close()
+
+    def test_fresh_entries_are_served_from_cache(self):
+        loads = []
+        self.assertEqual('v1', self.status_cache.get(KEY, lambda: loads.append(1) or 'v1'))
+        self.clock.now = 29.0
+        self.assertEqual('v1', self.status_cache.get(KEY, lambda: loads.append(1) or 'v2'))
+        self.assertEqual(1, len(loads))
+
+    def test_ttl_per_application_id(self):
+        self.assertEqual(30.0, self.status_cache.get_ttl(KEY))
+        self.assertEqual(10.0, self.status_cache.get_ttl(('vin10000000000000', '516', 768)))
+
+    def test_stale_entries_are_refreshed_in_background(self):
+        self.status_cache.get(KEY, lambda: 'v1')
+        self.clock.now = 40.0
+        release = threading.Event()
+
+        def refresh():
+            release.wait(5)
+            return 'v2'
+
+        self.assertEqual('v1', self.status_cache.get(KEY, refresh))
+        # only one background refresh is started for a stale entry
+        self.assertEqual('v1', self.status_cache.get(KEY, lambda: self.fail('refresh started twice')))
+        release.set()
+        self.status_cache.close(wait=True)
+        self.assertEqual('v2', self.status_cache.get(KEY, lambda: 'v3'))
+
+    def test_refresh_loader(self):
+        self.status_cache.get(KEY, lambda: 'v1')
+        self.clock.now = 40.0
+        self.assertEqual('v1', self.status_cache.get(KEY, lambda: self.fail('load used to refresh'), lambda: 'v2'))
+        self.status_cache.close(wait=True)
+        self.assertEqual('v2', self.status_cache.get(KEY, lambda: 'v3'))
+
+    def test_expired_entries_are_loaded_synchronously(self):
+        self.status_cache.get(KEY, lambda: 'v1')
+        self.clock.now = 91.0
+        self.assertEqual('v2', self.status_cache.get(KEY, lambda: 'v2'))
+
+    def test_failed_refresh_keeps_stale_entry(self):
+        self.status_cache.get(KEY, lambda: 'v1')
+        self.clock.now = 40.0
+
+        def refresh():
+            raise ValueError('offline')
+
+        self.assertEqual('v1', self.status_cache.get(KEY, refresh))
+        self.status_cache.close(wait=True)
+        self.assertEqual('v1', self.status_cache.get(KEY, lambda: 'v2'))
+
+    def test_closed_cache_does_not_refresh(self):
+        self.status_cache.get(KEY, lambda: 'v1')
+        self.status_cache.close()
+        self.clock.now = 40.0
+        self.assertEqual('v1', self.status_cache.get(KEY, lambda: self.fail('refreshed after close')))
+        self.assertIsNone(self.status_cache._StatusCache__executor)
+        self.clock.now = 91.0
+        self.assertEqual('v2', self.status_cache.get(KEY, lambda: 'v2'))
+
+    def test_invalidate(self):
+        other_key = ('vin20000000000000', '511', 25857)
+        self.status_cache.get(KEY, lambda: 'v1')
+        self.status_cache.get(other_key, lambda: 'v1')
+        self.status_cache.invalidate(KEY[0])
+        self.assertEqual('v2', self.status_cache.get(KEY, lambda: 'v2'))
+        self.assertEqual('v1', self.status_cache.get(other_key, lambda: 'v2'))
+        self.status_cache.invalidate()
+        self.assertEqual(0, len(self.status_cache))
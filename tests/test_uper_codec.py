@@ -0,0 +1,100 @@
+import random
+from unittest import TestCase
+
+import asn1tools
+
+from saic_ismart_client.common_model import AbstractMessageCoder
+from saic_ismart_client.ota_v1_1.Message import MessageCoderV11
+from saic_ismart_client.ota_v2_1.Message import MessageCoderV21
+from saic_ismart_client.ota_v3_0.Message import MessageCoderV30
+from saic_ismart_client.uper_codec import UnsupportedSchemaError, UperBitReader, compile_uper_codec
+from test_Message_v1_1 import LOGIN_REQUEST_HEX, MESSAGE_LIST_REQUEST_HEX
+from test_Message_v2_1 import OTA_RVC_REQUEST_HEX
+from test_Message_v3_0 import CHRG_MGMT_DATA_RSP_HEX
+from test_saic_api import UID, TOKEN, VIN, create_vin_info, mock_alarm_switch_response_hex, mock_login_response_hex, \
+    mock_vehicle_status_response
+
+
+def get_dispatcher_body_bytes(message_coder: AbstractMessageCoder, frame: str) -> bytes:
+    message_bytes = AbstractMessageCoder.from_hex_frame(frame)
+    if isinstance(message_coder, MessageCoderV11):
+        return message_bytes[message_coder.header_length:message_bytes[2]]
+    body_offset = message_coder.header_length + message_coder.reserved_size
+    return message_bytes[body_offset:body_offset + message_bytes[1] - message_coder.header_length]
+
+
+def create_random_value(definition: dict, type_definitions: dict, rnd: random.Random):
+    match definition['type']:
+        case 'INTEGER':
+            minimum, maximum = definition['restricted-to'][0]
+            return rnd.choice([minimum, maximum, rnd.randint(minimum, maximum)])
+        case 'BOOLEAN':
+            return rnd.random() < 0.5
+        case 'ENUMERATED':
+            return rnd.choice(definition['values'])[0]
+        case 'IA5String':
+            return ''.join(chr(rnd.randint(0, 127)) for _ in range(definition['size'][0]))
+        case 'NumericString':
+            return ''.join(rnd.choice(' 0123456789') for _ in range(definition['size'][0]))
+        case 'OCTET STRING':
+            minimum, maximum = definition['size'][0]
+            return rnd.randbytes(rnd.choice([minimum, maximum, rnd.randint(minimum, maximum)]))
+        case 'SEQUENCE':
+            return {
+                member['name']: create_random_value(member, type_definitions, rnd)
+                for member in definition['members']
+                if not member.get('optional', False) or rnd.random() < 0.6
+            }
+        case type_reference:
+            return create_random_value(type_definitions[type_reference], type_definitions, rnd)
+
+
+class TestUperCodec(TestCase):
+    def test_round_trip_test_vectors(self):
+        message_coder_v1_1 = MessageCoderV11()
+        message_coder_v2_1 = MessageCoderV21()
+        test_vectors = [
+            (message_coder_v1_1, LOGIN_REQUEST_HEX),
+            (message_coder_v1_1, MESSAGE_LIST_REQUEST_HEX),
+            (message_coder_v1_1, mock_login_response_hex(message_coder_v1_1)),
+            (message_coder_v1_1, mock_alarm_switch_response_hex(message_coder_v1_1)),
+            (message_coder_v2_1, OTA_RVC_REQUEST_HEX),
+            (message_coder_v2_1, mock_vehicle_status_response(message_coder_v2_1, UID, TOKEN, create_vin_info(VIN))),
+            (MessageCoderV30(), CHRG_MGMT_DATA_RSP_HEX)
+        ]
+        for message_coder, frame in test_vectors:
+            body_bytes = get_dispatcher_body_bytes(message_coder, frame)
+            expected = message_coder.asn1_tool_uper.decode('MPDispatcherBody', body_bytes)
+
+            actual = message_coder.dispatcher_body_codec.decode('MPDispatcherBody', body_bytes)
+            self.assertEqual(expected, actual)
+            self.assertEqual(body_bytes, message_coder.dispatcher_body_codec.encode('MPDispatcherBody', actual))
+
+    def test_bit_exact_with_asn1tools(self):
+        rnd = random.Random(42)
+        for message_coder in [MessageCoderV11(), MessageCoderV21(), MessageCoderV30()]:
+            asn_file = str(message_coder.asn_files_dir / 'MP_DispatcherBody.asn1')
+            type_definitions = list(asn1tools.parse_files(asn_file).values())[0]['types']
+            for _ in range(200):
+                value = create_random_value(type_definitions['MPDispatcherBody'], type_definitions, rnd)
+                expected = message_coder.asn1_tool_uper.encode('MPDispatcherBody', value)
+
+                actual = message_coder.dispatcher_body_codec.encode('MPDispatcherBody', value)
+                self.assertEqual(expected, actual)
+                self.assertEqual(value, message_coder.dispatcher_body_codec.decode('MPDispatcherBody', actual))
+
+    def test_out_of_data(self):
+        message_coder = MessageCoderV30()
+        body_bytes = get_dispatcher_body_bytes(message_coder, CHRG_MGMT_DATA_RSP_HEX)
+        with self.assertRaises(ValueError):
+            message_coder.dispatcher_body_codec.decode('MPDispatcherBody', body_bytes[:10])
+
+    def test_unsupported_type(self):
+        with self.assertRaises(UnsupportedSchemaError):
+            compile_uper_codec([str(MessageCoderV30().asn_files_dir / 'ApplicationData.asn1')])
+
+    def test_bit_reader(self):
+        reader = UperBitReader(bytes.fromhex('A5F0'))
+        self.assertEqual(0b101, reader.read(3))
+        self.assertEqual(0b00101111, reader.read(8))
+        self.assertEqual(5, reader.remaining_bits)